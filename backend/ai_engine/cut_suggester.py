@@ -38,9 +38,14 @@ class VideoAnalyzer:
     processes multiple scenes efficiently with a single VideoCapture.
     """
     
+    # Forward gaps up to this many frames are skipped with grab() instead of a
+    # seek, which would decode again from the previous keyframe
+    MAX_GRAB_SKIP = 90
+
     def __init__(self, video_path: str):
         self.video_path = video_path
         self._cap = None
+        self._next_frame = 0  # index the next read() returns
         self._fps = None
         self._frame_count = None
         self._face_cascade = None
@@ -49,6 +54,7 @@ class VideoAnalyzer:
         self._cap = cv2.VideoCapture(self.video_path)
         self._fps = self._cap.get(cv2.CAP_PROP_FPS)
         self._frame_count = int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self._next_frame = 0
         return self
         
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -66,13 +72,23 @@ class VideoAnalyzer:
                 self._face_cascade = cv2.CascadeClassifier(
                     cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
                 )
-            except:
+            except Exception:
                 self._face_cascade = False
         return self._face_cascade if self._face_cascade else None
     
     def _read_frame_at(self, frame_idx: int) -> Tuple[bool, Any]:
-        """Read a frame at specific index."""
-        self._cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+        """
+        Read a frame at specific index. Scenes are sampled in order, so short
+        forward jumps grab() their way there; only backward or long jumps seek.
+        """
+        skip = frame_idx - self._next_frame
+        if 0 <= skip <= self.MAX_GRAB_SKIP:
+            for _ in range(skip):
+                if not self._cap.grab():
+                    break
+        else:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+        self._next_frame = frame_idx + 1
         return self._cap.read()
     
     def analyze_scene(self, start_time: float, end_time: float) -> Dict[str, Any]:
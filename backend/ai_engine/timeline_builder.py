@@ -4,31 +4,53 @@ Creates non-destructive timeline exports from analysis results.
 Supports JSON and XML formats for editor compatibility.
 """
 
-import json
+import hashlib
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
+import orjson
+
+# Rendered XML exports keyed on a hash of their inputs, so downloading an
+# unchanged timeline again skips building and pretty-printing the tree.
+# JSON isn't cached: hashing the inputs costs about as much as orjson
+# rendering them. Entries keep their generated_at to refresh it on a hit.
+_EXPORT_CACHE_SIZE = 16
+_export_cache: "OrderedDict[bytes, Tuple[str, str]]" = OrderedDict()
+
 
 def format_time_precise(seconds: float) -> str:
     """Convert seconds to HH:MM:SS.mmm format."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    milliseconds = int((seconds % 1) * 1000)
+    # Round to whole milliseconds once, then split with integer divmod so
+    # values like 1.001 don't truncate to 1.000 through float error
+    total_ms = round(seconds * 1000)
+    total_secs, milliseconds = divmod(total_ms, 1000)
+    hours, rem = divmod(total_secs, 3600)
+    minutes, secs = divmod(rem, 60)
     return f"{hours:02d}:{minutes:02d}:{secs:02d}.{milliseconds:03d}"
 
 
 def format_time_frames(seconds: float, fps: float = 30.0) -> str:
-    """Convert seconds to timecode format HH:MM:SS:FF (frames)."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    frames = int((seconds % 1) * fps)
+    """Convert seconds to timecode format HH:MM:SS:FF (frames, non-drop)."""
+    # Snap to the nearest whole frame, then count in frames at the nominal
+    # timebase so the frame field never drifts or reaches fps
+    if fps <= 0:
+        fps = 30.0
+    timebase = round(fps) or 1
+    total_frames = round(seconds * fps)
+    total_secs, frames = divmod(total_frames, timebase)
+    hours, rem = divmod(total_secs, 3600)
+    minutes, secs = divmod(rem, 60)
     return f"{hours:02d}:{minutes:02d}:{secs:02d}:{frames:02d}"
 
 
+def _filter_accepted(suggestions: List[Dict], accepted_ids: List[int]) -> List[Dict]:
+    """Keep suggestions whose scene_id was accepted (set lookup, not a list scan per suggestion)."""
+    accepted = set(accepted_ids)
+    return [s for s in suggestions if s.get('scene_id') in accepted]
+
+
 class TimelineBuilder:
     """Builds and exports non-destructive timeline data."""
     
@@ -54,7 +76,7 @@ class TimelineBuilder:
         if accepted_ids is None:
             self.accepted_suggestions = suggestions
         else:
-            self.accepted_suggestions = [s for s in suggestions if s.get('scene_id') in accepted_ids]
+            self.accepted_suggestions = _filter_accepted(suggestions, accepted_ids)
     
     def set_audio_markers(self, markers: List[Dict]):
         """Set audio importance markers (peaks, silence regions)."""
@@ -65,35 +87,43 @@ class TimelineBuilder:
         Build the complete timeline data structure.
         Returns a structured dict with all timeline information.
         """
-        # Build timeline entries from suggestions
+        # Build timeline entries from suggestions, totalling cut time as we go
         timeline_entries = []
+        total_cut_time = 0
         
         for suggestion in self.accepted_suggestions:
-            entry = {
+            metrics = suggestion.get('metrics', {})
+            start_seconds = suggestion.get('start_seconds', 0)
+            end_seconds = suggestion.get('end_seconds', 0)
+            duration = metrics.get('duration', 0)
+            total_cut_time += duration
+            timeline_entries.append({
                 "id": suggestion.get('scene_id', 0),
-                "start": format_time_precise(suggestion.get('start_seconds', 0)),
-                "end": format_time_precise(suggestion.get('end_seconds', 0)),
-                "start_seconds": suggestion.get('start_seconds', 0),
-                "end_seconds": suggestion.get('end_seconds', 0),
-                "duration_seconds": suggestion.get('metrics', {}).get('duration', 0),
+                "start": format_time_precise(start_seconds),
+                "end": format_time_precise(end_seconds),
+                "start_seconds": start_seconds,
+                "end_seconds": end_seconds,
+                "duration_seconds": duration,
                 "action": suggestion.get('suggestion_type', 'CUT').lower(),
                 "confidence": suggestion.get('confidence', 0),
                 "reason": suggestion.get('reason', ''),
                 "audio_label": suggestion.get('audio_label', 'Unknown'),
-                "metrics": suggestion.get('metrics', {})
-            }
-            timeline_entries.append(entry)
+                "metrics": metrics
+            })
         
         # Sort by start time
         timeline_entries.sort(key=lambda x: x['start_seconds'])
         
+        # Group suggestions by scene once instead of rescanning them per scene
+        suggestions_by_scene: Dict[Any, List[Dict]] = {}
+        for sugg in self.suggestions:
+            suggestions_by_scene.setdefault(sugg.get('scene_id'), []).append(sugg)
+        
         # Build highlight markers (audio peaks, important moments)
         highlight_markers = []
         for scene in self.scenes:
             # Check if this scene has audio peaks
-            scene_suggestions = [s for s in self.suggestions 
-                               if s.get('scene_id') == scene.get('scene_id')]
-            for sugg in scene_suggestions:
+            for sugg in suggestions_by_scene.get(scene.get('scene_id'), ()):
                 if sugg.get('metrics', {}).get('has_audio_peaks'):
                     highlight_markers.append({
                         "timestamp": format_time_precise(sugg.get('start_seconds', 0)),
@@ -118,7 +148,7 @@ class TimelineBuilder:
                 "total_scenes": len(self.scenes),
                 "total_suggestions": len(self.suggestions),
                 "accepted_suggestions": len(self.accepted_suggestions),
-                "total_cut_time": sum(e['duration_seconds'] for e in timeline_entries)
+                "total_cut_time": total_cut_time
             },
             "timeline": timeline_entries,
             "scenes": [
@@ -139,10 +169,10 @@ class TimelineBuilder:
         Export timeline as JSON string.
         """
         if accepted_ids is not None:
-            self.accepted_suggestions = [s for s in self.suggestions if s.get('scene_id') in accepted_ids]
+            self.accepted_suggestions = _filter_accepted(self.suggestions, accepted_ids)
         
         timeline_data = self.build_timeline_data()
-        return json.dumps(timeline_data, indent=2)
+        return orjson.dumps(timeline_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode()
     
     def export_xml(self, accepted_ids: Optional[List[int]] = None) -> str:
         """
@@ -150,7 +180,7 @@ class TimelineBuilder:
         Compatible with basic NLE import structures.
         """
         if accepted_ids is not None:
-            self.accepted_suggestions = [s for s in self.suggestions if s.get('scene_id') in accepted_ids]
+            self.accepted_suggestions = _filter_accepted(self.suggestions, accepted_ids)
         
         timeline_data = self.build_timeline_data()
         fps = self.video_metadata.get('fps', 30)
@@ -212,10 +242,9 @@ class TimelineBuilder:
             ET.SubElement(marker_elem, "timestamp").text = marker['timestamp']
             ET.SubElement(marker_elem, "label").text = marker['label']
         
-        # Pretty print
-        xml_string = ET.tostring(root, encoding='unicode')
-        dom = minidom.parseString(xml_string)
-        return dom.toprettyxml(indent="  ")
+        # Pretty print in place rather than serializing and reparsing through minidom
+        ET.indent(root, space="  ")
+        return '<?xml version="1.0" ?>\n' + ET.tostring(root, encoding='unicode') + '\n'
 
 
 def build_timeline(
@@ -240,11 +269,34 @@ def build_timeline(
     Returns:
         Formatted timeline string
     """
+    export_format = export_format.lower()
     builder = TimelineBuilder(project_id, video_metadata)
     builder.set_scenes(scenes)
     builder.set_suggestions(suggestions, accepted_ids)
-    
-    if export_format.lower() == "xml":
-        return builder.export_xml()
-    else:
+    if export_format != "xml":
         return builder.export_json()
+
+    key = hashlib.blake2b(orjson.dumps([
+        project_id,
+        video_metadata,
+        scenes,
+        suggestions,
+        sorted(set(accepted_ids)) if accepted_ids is not None else None,
+    ], option=orjson.OPT_SORT_KEYS), digest_size=16).digest()
+    cached = _export_cache.get(key)
+    if cached is not None:
+        _export_cache.move_to_end(key)
+        content, generated_at = cached
+        # The first <generated_at> is the metadata one; stamp this download's time
+        return content.replace(
+            f"<generated_at>{generated_at}</generated_at>",
+            f"<generated_at>{datetime.now().isoformat()}</generated_at>",
+            1,
+        )
+
+    content = builder.export_xml()
+    generated_at = content.split("<generated_at>", 1)[1].split("</generated_at>", 1)[0]
+    _export_cache[key] = (content, generated_at)
+    if len(_export_cache) > _EXPORT_CACHE_SIZE:
+        _export_cache.popitem(last=False)
+    return content
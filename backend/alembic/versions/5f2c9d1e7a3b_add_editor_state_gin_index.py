@@ -0,0 +1,28 @@
+"""Add GIN index on projects.editor_state
+
+Revision ID: 5f2c9d1e7a3b
+Revises: ccb0744c706b
+Create Date: 2026-10-15 10:12:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f2c9d1e7a3b'
+down_revision: Union[str, None] = 'ccb0744c706b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_projects_editor_gin', 'projects', ['editor_state'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_projects_editor_gin', table_name='projects', postgresql_using='gin')
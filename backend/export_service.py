@@ -20,6 +20,17 @@ router = APIRouter(prefix="/export", tags=["Export"])
 # In a production app, this would be in Redis or DB
 export_tasks: Dict[str, Dict[str, Any]] = {}
 
+# Finished tasks are only kept for status polling; cap how many we hold on to
+MAX_FINISHED_EXPORT_TASKS = 100
+
+def _prune_export_tasks():
+    """Drop the oldest finished tasks once the cap is exceeded (dicts keep insertion order)."""
+    finished = [tid for tid, task in export_tasks.items() if task["status"] != "processing"]
+    excess = len(finished) - MAX_FINISHED_EXPORT_TASKS
+    if excess > 0:
+        for tid in finished[:excess]:
+            del export_tasks[tid]
+
 # Ensure export directories exist
 OUTPUT_DIR = "../storage/exports"
 REPORTS_DIR = "../storage/reports"
@@ -227,6 +238,7 @@ def run_video_export(export_id: str, video_id: str, editor_state: Dict[str, Any]
 @router.post("/video")
 async def export_video(req: ExportRequest, background_tasks: BackgroundTasks):
     export_id = str(uuid.uuid4())
+    _prune_export_tasks()
     export_tasks[export_id] = {
         "status": "processing",
         "progress": 0,
@@ -1,16 +1,20 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, Query, Request
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 import shutil
 import os
 import sys
-from typing import Optional, List
+from typing import Annotated, Literal, Optional, List, Union
 
 
 
 import sqlite_db as db
+from responses import OrjsonResponse, compressed_response, etag_json_response
 from video_utils import metadata
+from video_utils import schema as project_schema
+from video_utils.storage import find_video_path
 from ai_engine import scene_detection
 from ai_engine import cut_suggester
 from ai_engine import timeline_builder
@@ -19,7 +23,7 @@ from export_service import router as export_router
 from routers import projects, ai_content, fonts
 from database import init_db as init_pg_db
 
-app = FastAPI(title="CUTLAB AI Backend")
+app = FastAPI(title="CUTLAB AI Backend", default_response_class=OrjsonResponse)
 app.include_router(smart_human_router)
 app.include_router(export_router)
 app.include_router(projects.router)
@@ -29,6 +33,14 @@ app.include_router(fonts.router)
 @app.on_event("startup")
 async def on_startup():
     await init_pg_db()
+    projects.start_autosave_flusher()
+    # Build the project schema's validators off the request path
+    project_schema.warm_up_in_background()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await projects.stop_autosave_flusher()
+    timeline_manager.flush_timelines()
 
 # Add CORS middleware for React frontend
 app.add_middleware(
@@ -45,11 +57,7 @@ os.makedirs("../storage/videos", exist_ok=True)
 
 def get_video_path(project_id: str) -> str:
     """Helper to find video file path for a project."""
-    video_dir = "../storage/videos"
-    for f in os.listdir(video_dir):
-        if f.startswith(project_id):
-            return os.path.join(video_dir, f)
-    return None
+    return find_video_path(project_id, "../storage/videos")
 
 @app.get("/projects")
 async def list_projects(db_session: Session = Depends(db.get_db)):
@@ -76,7 +84,7 @@ async def list_projects(db_session: Session = Depends(db.get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/project/{project_id}")
-async def get_project(project_id: str, db_session: Session = Depends(db.get_db)):
+async def get_project(project_id: str, request: Request, db_session: Session = Depends(db.get_db)):
     """Get full project data including scenes and suggestions."""
     try:
         # Get video metadata
@@ -134,7 +142,7 @@ async def get_project(project_id: str, db_session: Session = Depends(db.get_db))
             for s in db_suggestions
         ]
         
-        return {
+        return etag_json_response(request, {
             "status": "success",
             "project_id": project_id,
             "metadata": {
@@ -147,13 +155,48 @@ async def get_project(project_id: str, db_session: Session = Depends(db.get_db))
             },
             "scenes": scenes,
             "suggestions": suggestions
-        }
+        })
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+VIDEO_CHUNK_SIZE = 1024 * 1024
+VIDEO_MEDIA_TYPES = {
+    '.mp4': 'video/mp4',
+    '.mov': 'video/quicktime',
+    '.avi': 'video/x-msvideo',
+    '.webm': 'video/webm',
+    '.mkv': 'video/x-matroska',
+}
+
+def _parse_byte_range(range_header: str, file_size: int):
+    """
+    Parse a single "bytes=start-end" range (including open-ended and suffix
+    forms) into inclusive offsets. Only the first range of a multi-range
+    request is served. Raises 416 when it lies outside the file.
+    """
+    spec = range_header.strip()
+    if spec.startswith("bytes="):
+        spec = spec[len("bytes="):]
+    first, _, last = spec.split(",")[0].strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else file_size - 1
+        else:
+            # Suffix range: the final N bytes
+            start = max(0, file_size - int(last))
+            end = file_size - 1
+    except ValueError:
+        raise HTTPException(status_code=416, detail="Invalid range", headers={"Content-Range": f"bytes */{file_size}"})
+
+    end = min(end, file_size - 1)
+    if start >= file_size or start > end:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{file_size}"})
+    return start, end
+
 @app.get("/video/{project_id}")
 async def stream_video(project_id: str, request: Request):
     """Stream video file for the editor with range request support."""
@@ -166,14 +209,7 @@ async def stream_video(project_id: str, request: Request):
     
     # Determine media type
     ext = os.path.splitext(video_path)[1].lower()
-    media_types = {
-        '.mp4': 'video/mp4',
-        '.mov': 'video/quicktime',
-        '.avi': 'video/x-msvideo',
-        '.webm': 'video/webm',
-        '.mkv': 'video/x-matroska',
-    }
-    media_type = media_types.get(ext, 'video/mp4')
+    media_type = VIDEO_MEDIA_TYPES.get(ext, 'video/mp4')
     
     # Get file size
     file_size = os.path.getsize(video_path)
@@ -182,23 +218,17 @@ async def stream_video(project_id: str, request: Request):
     range_header = request.headers.get("range")
     
     if range_header:
-        # Parse range header
-        range_match = range_header.replace("bytes=", "").split("-")
-        start = int(range_match[0]) if range_match[0] else 0
-        end = int(range_match[1]) if len(range_match) > 1 and range_match[1] else file_size - 1
-        
-        # Ensure valid range
-        start = max(0, start)
-        end = min(end, file_size - 1)
+        start, end = _parse_byte_range(range_header, file_size)
         content_length = end - start + 1
         
-        # Stream the requested range
+        # Stream the requested range. Each chunk from a sync generator costs a
+        # threadpool round trip, so read large chunks rather than 8 KB ones.
         def iterfile():
             with open(video_path, "rb") as f:
                 f.seek(start)
                 remaining = content_length
                 while remaining > 0:
-                    chunk_size = min(8192, remaining)
+                    chunk_size = min(VIDEO_CHUNK_SIZE, remaining)
                     data = f.read(chunk_size)
                     if not data:
                         break
@@ -226,6 +256,11 @@ async def stream_video(project_id: str, request: Request):
             headers={"Accept-Ranges": "bytes"}
         )
 
+def _save_upload(source, file_path: str):
+    """Copy an uploaded file to disk in 1 MiB chunks."""
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(source, buffer, 1024 * 1024)
+
 @app.post("/upload-video")
 async def upload_video(file: UploadFile = File(...), db_session: Session = Depends(db.get_db)):
     try:
@@ -234,17 +269,16 @@ async def upload_video(file: UploadFile = File(...), db_session: Session = Depen
         safe_filename = f"{project_id}{file_extension}"
         file_path = f"../storage/videos/{safe_filename}"
 
-        # Save file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Save file and probe it off the event loop so other requests keep being served
+        await run_in_threadpool(_save_upload, file.file, file_path)
 
         # Extract metadata
         try:
-            meta = metadata.extract_metadata(file_path)
+            meta = await run_in_threadpool(metadata.extract_metadata, file_path)
         except Exception as e:
             try:
                 os.remove(file_path)
-            except:
+            except OSError:
                 pass
             raise HTTPException(status_code=400, detail=f"Failed to process video: {str(e)}")
 
@@ -284,21 +318,19 @@ async def analyze_scenes(project_id: str, db_session: Session = Depends(db.get_d
         if not video_path:
             raise HTTPException(status_code=404, detail="Video file not found on disk")
 
-        # Run scene detection
-        scenes = scene_detection.detect_scenes(video_path)
+        # Run scene detection in the threadpool; decoding takes minutes on long videos
+        scenes = await run_in_threadpool(scene_detection.detect_scenes, video_path, video_record.duration)
         
-        # Clear existing scenes
-        db_session.query(db.VideoScene).filter(db.VideoScene.project_id == project_id).delete()
-        
-        for s in scenes:
-            scene_item = db.VideoScene(
-                project_id=project_id,
-                start_time=s["start_time"],
-                end_time=s["end_time"],
-                start_frame=s["start_frame"],
-                end_frame=s["end_frame"]
-            )
-            db_session.add(scene_item)
+        # Replace existing scenes in one batch
+        db.replace_scenes(db_session, project_id, [
+            {
+                "start_time": s["start_time"],
+                "end_time": s["end_time"],
+                "start_frame": s["start_frame"],
+                "end_frame": s["end_frame"]
+            }
+            for s in scenes
+        ])
         
         db_session.commit()
         
@@ -344,27 +376,24 @@ async def suggest_cuts(project_id: str, db_session: Session = Depends(db.get_db)
         # Run cut suggestion engine
         suggestions = cut_suggester.suggest_cuts(video_path, scenes, video_record.duration)
         
-        # Clear existing suggestions
-        db_session.query(db.CutSuggestion).filter(db.CutSuggestion.project_id == project_id).delete()
-        
-        # Save suggestions to DB
-        for s in suggestions:
-            suggestion_item = db.CutSuggestion(
-                project_id=project_id,
-                scene_id=s["scene_id"],
-                start_time=s["start_seconds"],
-                end_time=s["end_seconds"],
-                confidence=s["confidence"],
-                suggestion_type=s["suggestion_type"],
-                reason=s["reason"],
-                motion_intensity=s["metrics"]["motion_intensity"],
-                silence_level=s["metrics"]["silence_level"],
-                audio_energy=s["metrics"].get("audio_energy", 0.5),
-                audio_label=s.get("audio_label", "Unknown"),
-                has_faces=s["metrics"]["has_faces"],
-                repetitiveness=s["metrics"]["repetitiveness"]
-            )
-            db_session.add(suggestion_item)
+        # Replace existing suggestions in one batch
+        db.replace_cut_suggestions(db_session, project_id, [
+            {
+                "scene_id": s["scene_id"],
+                "start_time": s["start_seconds"],
+                "end_time": s["end_seconds"],
+                "confidence": s["confidence"],
+                "suggestion_type": s["suggestion_type"],
+                "reason": s["reason"],
+                "motion_intensity": s["metrics"]["motion_intensity"],
+                "silence_level": s["metrics"]["silence_level"],
+                "audio_energy": s["metrics"].get("audio_energy", 0.5),
+                "audio_label": s.get("audio_label", "Unknown"),
+                "has_faces": s["metrics"]["has_faces"],
+                "repetitiveness": s["metrics"]["repetitiveness"]
+            }
+            for s in suggestions
+        ])
         
         db_session.commit()
         
@@ -382,6 +411,7 @@ async def suggest_cuts(project_id: str, db_session: Session = Depends(db.get_db)
 @app.get("/export-timeline/{project_id}")
 async def export_timeline(
     project_id: str,
+    request: Request,
     format: str = Query("json", description="Export format: 'json' or 'xml'"),
     accepted_ids: Optional[str] = Query(None, description="Comma-separated list of accepted scene IDs"),
     db_session: Session = Depends(db.get_db)
@@ -393,6 +423,8 @@ async def export_timeline(
     - accepted_ids: Optional comma-separated scene IDs to include (if None, all are included)
     """
     try:
+        export_format = format.lower()
+
         # Get video metadata
         video_record = db_session.query(db.VideoMetadata).filter(
             db.VideoMetadata.project_id == project_id
@@ -418,8 +450,9 @@ async def export_timeline(
         parsed_accepted_ids = None
         if accepted_ids:
             try:
-                parsed_accepted_ids = [int(x.strip()) for x in accepted_ids.split(",")]
-            except:
+                # int() tolerates surrounding whitespace, so no per-item strip
+                parsed_accepted_ids = list(map(int, accepted_ids.split(",")))
+            except ValueError:
                 raise HTTPException(status_code=400, detail="Invalid accepted_ids format")
         
         # Build video metadata dict
@@ -472,19 +505,21 @@ async def export_timeline(
             scenes=scenes,
             suggestions=suggestions,
             accepted_ids=parsed_accepted_ids,
-            export_format=format.lower()
+            export_format=export_format
         )
         
         # Set appropriate content type and filename
-        if format.lower() == "xml":
+        if export_format == "xml":
             content_type = "application/xml"
-            filename = f"cutlab_timeline_{project_id[:8]}.xml"
         else:
             content_type = "application/json"
-            filename = f"cutlab_timeline_{project_id[:8]}.json"
+            export_format = "json"
+        filename = f"cutlab_timeline_{project_id[:8]}.{export_format}"
         
-        return Response(
-            content=export_content,
+        # JSON/XML with repeated keys and tags compresses several times over
+        return compressed_response(
+            request,
+            export_content.encode("utf-8"),
             media_type=content_type,
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
@@ -501,7 +536,7 @@ async def export_timeline(
 # ============================================================
 
 from video_utils import timeline_manager
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class ClipData(BaseModel):
     source_video: str
@@ -518,14 +553,14 @@ class ClipUpdate(BaseModel):
     label: Optional[str] = None
 
 @app.get("/workspace/{project_id}/timeline")
-async def get_workspace_timeline(project_id: str):
+async def get_workspace_timeline(project_id: str, request: Request):
     """Get the workspace timeline for a project."""
     try:
         manager = timeline_manager.get_timeline_manager(project_id)
-        return {
+        return etag_json_response(request, {
             "status": "success",
             "timeline": manager.get_timeline_data()
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -644,19 +679,20 @@ async def populate_timeline_from_suggestions(
         
         # Create timeline with scenes to KEEP
         manager = timeline_manager.get_timeline_manager(project_id)
-        manager.clear_timeline()
-        
-        for i, scene in enumerate(db_scenes):
-            scene_id = i + 1
-            if scene_id not in scenes_to_cut:
-                manager.add_clip({
+        with manager.batch():
+            manager.clear_timeline()
+            manager.add_clips([
+                {
                     "source_video": project_id,
                     "source_filename": video_record.filename,
                     "start_seconds": scene.start_time,
                     "end_seconds": scene.end_time,
                     "speed": 1.0,
                     "label": f"Scene {scene_id}"
-                })
+                }
+                for scene_id, scene in enumerate(db_scenes, start=1)
+                if scene_id not in scenes_to_cut
+            ])
         
         return {
             "status": "success",
@@ -669,6 +705,86 @@ async def populate_timeline_from_suggestions(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# ============================================================
+# SAVED TIMELINE ENDPOINTS
+# ============================================================
+
+@app.post("/workspace/{project_id}/timeline/save")
+async def save_workspace_timeline(project_id: str, db_session: Session = Depends(db.get_db)):
+    """
+    Store the workspace timeline as the project's TimelineProject
+    (video_utils.schema) and return the new saved version.
+    """
+    try:
+        video_record = db_session.query(db.VideoMetadata).filter(
+            db.VideoMetadata.project_id == project_id
+        ).first()
+        
+        if not video_record:
+            raise HTTPException(status_code=404, detail="Project not found")
+        
+        asset = project_schema.AssetMetadata(
+            id=project_id,
+            path=get_video_path(project_id) or "",
+            filename=video_record.filename,
+            duration=video_record.duration,
+            type="video",
+            width=video_record.width,
+            height=video_record.height
+        )
+        manager = timeline_manager.get_timeline_manager(project_id)
+        project = project_schema.project_from_workspace(manager.get_timeline_data(), asset)
+        version = db.save_timeline(db_session, project_id, project)
+        db_session.commit()
+        
+        return {
+            "status": "success",
+            "version": version,
+            "duration": project.get_duration()
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        db_session.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/workspace/{project_id}/timeline/restore")
+async def restore_workspace_timeline(project_id: str, db_session: Session = Depends(db.get_db)):
+    """Replace the workspace timeline with the project's last saved version."""
+    try:
+        saved = db.load_timeline(db_session, project_id)
+        if saved is None:
+            raise HTTPException(status_code=404, detail="No saved timeline for this project")
+        version, data = saved
+        
+        # Rows are only written by save_workspace_timeline, so skip validation
+        project = project_schema.TimelineProject.from_trusted(data)
+        clips, transitions = project_schema.workspace_clips(project)
+        
+        manager = timeline_manager.get_timeline_manager(project_id)
+        with manager.batch():
+            manager.clear_timeline()
+            added = manager.add_clips(clips)
+            for i, transition in transitions:
+                manager.set_transition(
+                    added[i]["clip_id"],
+                    added[i + 1]["clip_id"],
+                    transition.kind,
+                    getattr(transition, "duration", 1.0)
+                )
+        
+        return {
+            "status": "success",
+            "version": version,
+            "timeline": manager.get_timeline_data()
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # ============================================================
 # EDITING TOOLS ENDPOINTS
 # ============================================================
@@ -804,6 +920,92 @@ async def get_clip(project_id: str, clip_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Batched edits, one model per op, so a malformed batch is rejected with
+# 422 before any edit runs.
+class PositionOp(BaseModel):
+    op: Literal["split", "trim-in", "trim-out"]
+    clip_id: str
+    position: float  # split / trim position in source video seconds
+
+class SpeedOp(BaseModel):
+    op: Literal["speed"]
+    clip_id: str
+    speed: float
+
+class UpdateOp(BaseModel):
+    op: Literal["update"]
+    clip_id: str
+    updates: ClipUpdate
+
+class DeleteOp(BaseModel):
+    op: Literal["delete"]
+    clip_id: str
+
+class TransitionOp(BaseModel):
+    op: Literal["transition"]
+    from_clip_id: str
+    to_clip_id: str
+    transition_type: str
+    duration: float = 1.0
+
+class RemoveTransitionOp(BaseModel):
+    op: Literal["remove-transition"]
+    from_clip_id: str
+    to_clip_id: str
+
+TimelineOp = Annotated[
+    Union[PositionOp, SpeedOp, UpdateOp, DeleteOp, TransitionOp, RemoveTransitionOp],
+    Field(discriminator="op"),
+]
+
+class TimelineBatchRequest(BaseModel):
+    ops: List[TimelineOp]
+
+def _apply_timeline_op(manager, op: TimelineOp):
+    """Apply one batched edit. Returns a falsy value if the edit failed."""
+    if op.op == "split":
+        return manager.split_clip(op.clip_id, op.position)
+    if op.op == "trim-in":
+        return manager.trim_in(op.clip_id, op.position)
+    if op.op == "trim-out":
+        return manager.trim_out(op.clip_id, op.position)
+    if op.op == "speed":
+        return manager.set_speed(op.clip_id, op.speed)
+    if op.op == "update":
+        return manager.update_clip(op.clip_id, op.updates.model_dump(exclude_none=True))
+    if op.op == "delete":
+        return manager.remove_clip(op.clip_id)
+    if op.op == "transition":
+        return manager.set_transition(op.from_clip_id, op.to_clip_id, op.transition_type, op.duration)
+    if op.op == "remove-transition":
+        return manager.remove_transition(op.from_clip_id, op.to_clip_id)
+    return None
+
+@app.post("/workspace/{project_id}/timeline/batch")
+async def apply_timeline_batch(project_id: str, request: TimelineBatchRequest):
+    """
+    Apply several edits in order and return the final timeline once.
+    Stops at the first edit that fails; edits before it stay applied.
+    """
+    try:
+        manager = timeline_manager.get_timeline_manager(project_id)
+        with manager.batch():
+            for index, op in enumerate(request.ops):
+                if not _apply_timeline_op(manager, op):
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Edit {index} ({op.op}) failed. Check clip IDs and values."
+                    )
+        return {
+            "status": "success",
+            "message": f"Applied {len(request.ops)} edits",
+            "timeline": manager.get_timeline_data()
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # ============================================================
 # TRANSITION ENDPOINTS
 # ============================================================
@@ -853,7 +1055,7 @@ async def get_transitions(project_id: str):
         return {
             "status": "success",
             "transitions": manager.get_all_transitions(),
-            "transition_types": manager.TRANSITION_TYPES
+            "transition_types": list(manager.TRANSITION_TYPE_NAMES)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
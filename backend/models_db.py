@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
 from sqlalchemy.dialects.postgresql import JSONB
 
 class User(SQLModel, table=True):
@@ -26,6 +26,10 @@ class Video(SQLModel, table=True):
 
 class Project(SQLModel, table=True):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Supports containment/key queries into the editor state
+        Index("ix_projects_editor_gin", "editor_state", postgresql_using="gin"),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: Optional[uuid.UUID] = Field(default=None, foreign_key="users.id")
     video_id: Optional[uuid.UUID] = Field(default=None, foreign_key="videos.id")
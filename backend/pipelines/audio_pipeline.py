@@ -5,6 +5,8 @@ import logging
 import tempfile
 from typing import List, Dict, Any
 
+import numpy as np
+
 # Ensure we can import from backend modules
 current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.abspath(os.path.join(current_dir, "../.."))
@@ -102,26 +104,25 @@ def run_audio_pipeline(video_path: str, output_json_path: str = "backend/outputs
             filtered_step_1.append(c)
             
         # Rule 5: Density Limit (Max 3 per 10s bucket)
-        buckets = {}
-        for c in filtered_step_1:
-            b_idx = int(c['timestamp'] // 10)
-            if b_idx not in buckets: buckets[b_idx] = []
-            buckets[b_idx].append(c)
-            
+        # Candidates are already time-sorted, so each bucket is a contiguous run
         density_filtered = []
-        for b_idx in sorted(buckets.keys()):
-            items = buckets[b_idx]
-            # Prioritize high confidence, then earlier time
-            items.sort(key=lambda x: (-x['confidence'], x['timestamp']))
-            # Keep top 3
-            keep = items[:3]
-            # Re-sort by time for consistency
-            keep.sort(key=lambda x: x['timestamp'])
-            density_filtered.extend(keep)
+        n = len(filtered_step_1)
+        if n:
+            ts = np.fromiter((c['timestamp'] for c in filtered_step_1), dtype=np.float64, count=n)
+            conf = np.fromiter((c['confidence'] for c in filtered_step_1), dtype=np.float64, count=n)
+            bkt = (ts // 10).astype(np.int64)
+            starts = np.flatnonzero(np.diff(bkt, prepend=bkt[0] - 1))
+            ends = np.append(starts[1:], n)
+            
+            for a, b in zip(starts.tolist(), ends.tolist()):
+                # Prioritize high confidence, then earlier time (stable on time order)
+                keep = a + np.argsort(-conf[a:b], kind='stable')[:3]
+                # Re-sort by time for consistency
+                keep = keep[np.argsort(ts[keep], kind='stable')]
+                density_filtered.extend(filtered_step_1[i] for i in keep.tolist())
             
         # Rule 2: Minimum 0.7s gap
-        # We must re-sort fully by time before gap check
-        density_filtered.sort(key=lambda x: x['timestamp'])
+        # Buckets were emitted in time order, so density_filtered is already sorted
         
         final_cuts = []
         last_valid_time = -999.0
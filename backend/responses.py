@@ -0,0 +1,56 @@
+"""
+Response helpers shared by the API routers.
+"""
+
+import gzip
+import hashlib
+from typing import Any, Dict, Optional
+
+import orjson
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+GZIP_MIN_SIZE = 1024  # Smaller bodies aren't worth the compression overhead
+
+
+class OrjsonResponse(JSONResponse):
+    """
+    Default response class for the app: serializes with orjson instead of json.
+    Non-string keys and numpy values are accepted, matching what json/jsonable_encoder allowed.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def etag_json_response(request: Request, content: Any) -> Response:
+    """
+    Serialize content and tag it with a content hash ETag.
+    Answers 304 with no body when the client's If-None-Match already matches.
+    """
+    body = orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    # no-cache: browsers may keep the body but must revalidate each time
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def compressed_response(
+    request: Request,
+    body: bytes,
+    media_type: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Gzip a text body when the client accepts it.
+    Used for exports instead of GZipMiddleware so video and other binary
+    downloads are never recompressed.
+    """
+    headers = dict(headers or {})
+    headers["Vary"] = "Accept-Encoding"
+    if len(body) >= GZIP_MIN_SIZE and "gzip" in request.headers.get("accept-encoding", ""):
+        body = gzip.compress(body, compresslevel=6)
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -3,6 +3,7 @@ from pydantic import BaseModel
 from typing import List, Optional, Dict
 import random
 import asyncio
+import string
 
 # Create router
 router = APIRouter(prefix="/ai/content", tags=["ai_content"])
@@ -44,21 +45,40 @@ FILLER_WORDS = {"um", "uh", "like", "you know", "basically", "actually", "litera
 INTRO_WORDS = {"welcome", "hi guys", "hello everyone", "today we are", "in this video"}
 EXCITEMENT_WORDS = {"wow", "amazing", "incredible", "love", "awesome", "huge", "best", "can't believe", "boom"}
 BORING_WORDS = {"so", "then", "okay", "alright", "next", "sort of", "kind of"}
+LOW_VALUE_CAPTIONS = frozenset({"um", "uh", "hmm"})
+
+def _split_keywords(keywords):
+    """Split a keyword set into single tokens (hash lookup) and multi-word phrases (substring scan)."""
+    tokens = frozenset(k for k in keywords if " " not in k)
+    phrases = tuple(k for k in keywords if " " in k)
+    return tokens, phrases
+
+INTRO_TOKENS, INTRO_PHRASES = _split_keywords(INTRO_WORDS)
+EXCITEMENT_TOKENS, EXCITEMENT_PHRASES = _split_keywords(EXCITEMENT_WORDS)
+BORING_TOKENS, BORING_PHRASES = _split_keywords(BORING_WORDS)
+
+def _has_keyword(text_lower: str, word_set: set, tokens: frozenset, phrases: tuple) -> bool:
+    return bool(tokens & word_set) or any(p in text_lower for p in phrases)
 
 @router.post("/analyze", response_model=ContentAnalysisResponse)
 async def analyze_content(request: AnalysisRequest):
     print(f"Analyzing content... Duration: {request.video_duration}s, Captions: {len(request.captions)}")
     
+    # Lowercase + tokenize each caption once; every pass below reuses it
+    prepared = []
+    for cap in request.captions:
+        text_lower = (cap.text or "").lower().strip()
+        words = text_lower.split()
+        word_set = {w.strip(string.punctuation) for w in words}
+        prepared.append((cap, text_lower, words, word_set))
+    
     # 1. Smart Jump Cuts (Detect fillers or silence)
     # ---------------------------------------------
     jump_cuts = []
     
     # Logic: If text contains filler words OR is very short/empty
-    for cap in request.captions:
-        text_lower = (cap.text or "").lower().strip()
-        
+    for cap, text_lower, words, _ in prepared:
         # Check for filler words density
-        words = text_lower.split()
         if not words:
             continue
             
@@ -68,7 +88,7 @@ async def analyze_content(request: AnalysisRequest):
             continue
             
         # Simulating "Low Value" detection
-        if text_lower in ["um", "uh", "hmm"]:
+        if text_lower in LOW_VALUE_CAPTIONS:
             jump_cuts.append(cap)
 
     # 2. Highlight Moments (Sentiment Analysis)
@@ -76,11 +96,9 @@ async def analyze_content(request: AnalysisRequest):
     highlights = []
     
     # Logic: Detect excitement words or exclamation marks (simulating Sentiment Model)
-    for cap in request.captions:
-        text_lower = (cap.text or "").lower()
-        
+    for cap, text_lower, _, word_set in prepared:
         score = 0.0
-        if any(w in text_lower for w in EXCITEMENT_WORDS):
+        if _has_keyword(text_lower, word_set, EXCITEMENT_TOKENS, EXCITEMENT_PHRASES):
             score = 0.9
         elif "!" in text_lower:
             score = 0.7
@@ -102,9 +120,8 @@ async def analyze_content(request: AnalysisRequest):
     if highlights:
         # Simple logic: If valid gap > 10s between highlights, mark as 'boring'
         # For simplicity, we'll just check specific captions that seem 'boring'
-        for cap in request.captions:
-            text_lower = (cap.text or "").lower()
-            if any(w in text_lower for w in BORING_WORDS) and cap.end - cap.start > 2.0:
+        for cap, text_lower, _, word_set in prepared:
+            if _has_keyword(text_lower, word_set, BORING_TOKENS, BORING_PHRASES) and cap.end - cap.start > 2.0:
                 engagement_segments.append(SentimentSegment(
                     start=cap.start,
                     end=cap.end,
@@ -126,10 +143,9 @@ async def analyze_content(request: AnalysisRequest):
     intro = None
     
     # Logic: Check first 15 seconds for intro words
-    first_captions = [c for c in request.captions if c.start < 15.0]
-    for cap in first_captions:
-        text_lower = (cap.text or "").lower()
-        if any(w in text_lower for w in INTRO_WORDS):
+    first_captions = [p for p in prepared if p[0].start < 15.0]
+    for cap, text_lower, _, word_set in first_captions:
+        if _has_keyword(text_lower, word_set, INTRO_TOKENS, INTRO_PHRASES):
             # Found intro. Trim until end of this caption.
             intro = SegmentMetadata(start=0, end=cap.end, text="Intro detected")
             break
@@ -139,9 +155,8 @@ async def analyze_content(request: AnalysisRequest):
     punched_up = []
     
     # Logic: Add emojis or uppercase to excitement
-    for cap in request.captions:
+    for cap, text_lower, _, _ in prepared:
         text = cap.text or ""
-        text_lower = text.lower()
         
         new_text = text
         changed = False
@@ -1,5 +1,4 @@
 from fastapi import APIRouter
-import matplotlib.font_manager
 import os
 
 router = APIRouter(prefix="/fonts", tags=["fonts"])
@@ -10,6 +9,9 @@ async def get_available_fonts():
     Get a list of available system fonts and common web fonts.
     """
     try:
+        # Imported here: matplotlib is slow to load and only this endpoint needs it
+        import matplotlib.font_manager
+
         # Get list of system font paths
         font_paths = matplotlib.font_manager.findSystemFonts()
         fonts = []
@@ -46,7 +48,7 @@ async def get_available_fonts():
                         "path": path
                     })
                     seen.add(name)
-            except:
+            except Exception:
                 continue
                 
         # Sort by name
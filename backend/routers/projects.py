@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
+from fastapi.exceptions import RequestValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import update, func, literal
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.future import select
 from typing import List, Dict, Any, Optional
+import asyncio
+import contextlib
 import uuid
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
-from database import get_session
+from database import get_session, async_session
 from models_db import Project, Export, Video
 
 router = APIRouter(prefix="/projects", tags=["projects"])
@@ -19,6 +24,147 @@ class ProjectCreate(BaseModel):
 class ProjectUpdate(BaseModel):
     name: Optional[str] = None
     editor_state: Optional[Dict[str, Any]] = None
+    # Top-level keys to merge into the stored state instead of replacing it
+    patch: Optional[Dict[str, Any]] = None
+
+# --- Autosave debouncing ---
+
+AUTOSAVE_FLUSH_INTERVAL = 2.0  # Seconds
+MAX_AUTOSAVE_ATTEMPTS = 5  # Failed writes of one project before its queued changes are dropped
+
+# Latest unsaved changes per project (project_id -> {name, editor_state | patch, updated_at})
+pending_updates: Dict[uuid.UUID, Dict[str, Any]] = {}
+_flush_lock: Optional[asyncio.Lock] = None
+_pending_event: Optional[asyncio.Event] = None
+_flusher_task: Optional[asyncio.Task] = None
+# Consecutive failed writes per project
+_failed_attempts: Dict[uuid.UUID, int] = {}
+
+def _get_flush_lock() -> asyncio.Lock:
+    # Created lazily so it binds to the server's running event loop
+    global _flush_lock
+    if _flush_lock is None:
+        _flush_lock = asyncio.Lock()
+    return _flush_lock
+
+def _get_pending_event() -> asyncio.Event:
+    # Set whenever an autosave is queued; lets the flusher sleep while idle
+    global _pending_event
+    if _pending_event is None:
+        _pending_event = asyncio.Event()
+    return _pending_event
+
+async def _write_pending(session: AsyncSession, project_id: uuid.UUID, changes: Dict[str, Any]) -> None:
+    values: Dict[str, Any] = {"updated_at": changes["updated_at"]}
+    if "name" in changes:
+        values["name"] = changes["name"]
+    if "editor_state" in changes:
+        values["editor_state"] = changes["editor_state"]
+    elif "patch" in changes:
+        # Merge in SQL (editor_state || patch) so only the changed keys are sent
+        values["editor_state"] = func.coalesce(
+            Project.editor_state, literal({}, JSONB)
+        ).op("||")(literal(changes["patch"], JSONB))
+    
+    result = await session.execute(
+        update(Project).where(Project.id == project_id).values(**values)
+    )
+    if result.rowcount == 0:
+        # Create new project if not found (lazy migration)
+        # Note: We might be missing video_id here if it's from legacy.
+        # Ideally we'd look it up, but for now safe defaults.
+        session.add(Project(
+            id=project_id,
+            name=changes.get("name") or "Untitled Project",
+            editor_state=changes.get("editor_state") or changes.get("patch") or {},
+            updated_at=changes["updated_at"]
+        ))
+
+async def flush_pending_updates(project_id: Optional[uuid.UUID] = None) -> None:
+    """Write queued autosaves to the DB (all projects, or just one)."""
+    async with _get_flush_lock():
+        if project_id is not None:
+            batch = {project_id: pending_updates.pop(project_id)} if project_id in pending_updates else {}
+        else:
+            batch = dict(pending_updates)
+            pending_updates.clear()
+        if not batch:
+            return
+        
+        # One transaction per project so a bad row can't hold back everyone else's autosave
+        unwritten = dict(batch)
+        failures = []
+        try:
+            for pid, changes in batch.items():
+                try:
+                    async with async_session() as session:
+                        await _write_pending(session, pid, changes)
+                        await session.commit()
+                except Exception as e:
+                    attempts = _failed_attempts.get(pid, 0) + 1
+                    if attempts < MAX_AUTOSAVE_ATTEMPTS:
+                        _failed_attempts[pid] = attempts
+                        failures.append(f"{pid}: {e}")
+                        continue
+                    print(f"Dropping autosave for project {pid} after {attempts} failed attempts: {e}; changes: {changes}")
+                _failed_attempts.pop(pid, None)
+                del unwritten[pid]
+        finally:
+            # Re-queue failed writes, and on cancellation anything not yet written
+            for pid, changes in unwritten.items():
+                _requeue(pid, changes)
+        if failures:
+            raise RuntimeError("; ".join(failures))
+
+def _requeue(project_id: uuid.UUID, changes: Dict[str, Any]) -> None:
+    """Put an unwritten batch back, letting anything queued since then win."""
+    newer = pending_updates.get(project_id)
+    if newer is None:
+        pending_updates[project_id] = changes
+        return
+    merged = dict(changes)
+    if "editor_state" in newer:
+        merged["editor_state"] = newer["editor_state"]
+        merged.pop("patch", None)
+    elif "patch" in newer:
+        if "editor_state" in merged:
+            merged["editor_state"] = {**merged["editor_state"], **newer["patch"]}
+        else:
+            merged["patch"] = {**merged.get("patch", {}), **newer["patch"]}
+    if "name" in newer:
+        merged["name"] = newer["name"]
+    merged["updated_at"] = newer["updated_at"]
+    pending_updates[project_id] = merged
+
+async def _autosave_flusher() -> None:
+    pending = _get_pending_event()
+    while True:
+        # Block until something is queued instead of waking every interval
+        await pending.wait()
+        await asyncio.sleep(AUTOSAVE_FLUSH_INTERVAL)
+        pending.clear()
+        try:
+            await flush_pending_updates()
+        except Exception as e:
+            print(f"Autosave flush failed: {e}")
+            # Failed projects were re-queued; retry after the next interval
+            pending.set()
+
+def start_autosave_flusher() -> None:
+    global _flusher_task
+    if _flusher_task is None:
+        _flusher_task = asyncio.create_task(_autosave_flusher())
+
+async def stop_autosave_flusher() -> None:
+    """Cancel the background flusher and persist anything still queued."""
+    global _flusher_task
+    if _flusher_task is not None:
+        _flusher_task.cancel()
+        # Let an in-flight flush unwind (and re-queue its batch) before the final flush
+        with contextlib.suppress(asyncio.CancelledError):
+            await _flusher_task
+        _flusher_task = None
+    await flush_pending_updates()
 
 @router.post("/", response_model=Project)
 async def create_project(
@@ -40,48 +186,48 @@ async def get_project(
     project_id: uuid.UUID,
     session: AsyncSession = Depends(get_session)
 ):
+    # Make sure a queued autosave isn't shadowed by the stored row
+    await flush_pending_updates(project_id)
     result = await session.execute(select(Project).where(Project.id == project_id))
     project = result.scalar_one_or_none()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
 
-@router.put("/{project_id}", response_model=Project)
+@router.put("/{project_id}", status_code=202)
 async def update_project_state(
     project_id: uuid.UUID,
-    project_update: ProjectUpdate,
-    session: AsyncSession = Depends(get_session)
+    request: Request
 ):
     """
     Autosave endpoint. Updates editor state.
     Creates the project if it doesn't exist (UPSERT logic for legacy migration).
+
+    Writes are queued and coalesced per project; the autosave flusher
+    persists the latest state within AUTOSAVE_FLUSH_INTERVAL seconds.
+    Send `patch` instead of `editor_state` to update only some top-level keys.
     """
-    result = await session.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
+    # Autosave bodies carry the whole editor state; parse them straight from
+    # bytes with pydantic's JSON parser instead of json.loads + validate.
+    try:
+        project_update = ProjectUpdate.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    changes = pending_updates.setdefault(project_id, {})
+    if project_update.name:
+        changes["name"] = project_update.name
+    if project_update.editor_state:
+        changes["editor_state"] = project_update.editor_state
+        changes.pop("patch", None)
+    if project_update.patch:
+        if "editor_state" in changes:
+            changes["editor_state"] = {**changes["editor_state"], **project_update.patch}
+        else:
+            changes.setdefault("patch", {}).update(project_update.patch)
+    changes["updated_at"] = datetime.utcnow()
+    _get_pending_event().set()
     
-    if not project:
-        # Create new project if not found (lazy migration)
-        # Note: We might be missing video_id here if it's from legacy.
-        # Ideally we'd look it up, but for now safe defaults.
-        project = Project(
-            id=project_id,
-            name=project_update.name or "Untitled Project",
-            editor_state=project_update.editor_state or {}
-        )
-    else:
-        # Update existing
-        if project_update.name:
-            project.name = project_update.name
-        
-        if project_update.editor_state:
-            project.editor_state = project_update.editor_state
-    
-    project.updated_at = datetime.utcnow()
-    
-    session.add(project)
-    await session.commit()
-    await session.refresh(project)
-    return project
+    return {"status": "accepted", "project_id": project_id}
 
 class ExportCreate(BaseModel):
     export_type: str
@@ -93,7 +239,8 @@ async def create_export(
     export_data: ExportCreate,
     session: AsyncSession = Depends(get_session)
 ):
-    # Verify project exists
+    # Verify project exists (it may only be queued for autosave so far)
+    await flush_pending_updates(project_id)
     result = await session.execute(select(Project).where(Project.id == project_id))
     project = result.scalar_one_or_none()
     if not project:
@@ -11,11 +11,21 @@ The service is deliberately lightweight: it only extracts metadata; the frontend
 
 import os
 import json
+import threading
+import uuid
 import cv2
 import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from database import get_session
+from models_db import Video
+from video_utils.storage import find_video_path
 
 # MediaPipe imports – they are optional until the user installs the package.
 try:
@@ -32,6 +42,7 @@ class AnalyzeRequest(BaseModel):
     video_id: str
     frame_interval: int = 5  # process every N frames (default 5)
     segment_duration: float = 1.0  # seconds per output segment
+    enable_pose: bool = False  # pose landmarks aren't part of the output yet
 
 class EffectsPreviewRequest(BaseModel):
     video_id: str
@@ -40,17 +51,17 @@ class EffectsPreviewRequest(BaseModel):
 # ---------------------------------------------------------------------------
 # Helper utilities
 # ---------------------------------------------------------------------------
-def _get_video_path(video_id: str) -> str:
-    """Helper to find video file path for a project."""
-    import os
-    video_dir = "storage/videos"
-    if not os.path.exists(video_dir):
-        return None
-        
-    for f in os.listdir(video_dir):
-        if f.startswith(video_id):
-            return os.path.join(video_dir, f)
-    return None
+VIDEO_DIR = "storage/videos"
+
+async def _resolve_video_path(video_id: str, session: AsyncSession) -> str:
+    """Look the video up by primary key, falling back to the storage directory."""
+    try:
+        video = await session.get(Video, uuid.UUID(video_id))
+    except ValueError:
+        video = None
+    if video and os.path.exists(video.file_path):
+        return video.file_path
+    return find_video_path(video_id, VIDEO_DIR)
 
 def _extract_face_bbox(face_detection_result, image_width: int, image_height: int) -> Dict[str, float]:
     """Convert MediaPipe normalized bounding box to a dict with normalized coordinates.
@@ -74,129 +85,178 @@ def _compute_motion_score(prev_frame: np.ndarray, cur_frame: np.ndarray) -> floa
     """
     if prev_frame is None:
         return 0.0
-    diff = cv2.absdiff(prev_frame, cur_frame)
-    # Normalise by 255 * number of channels * pixels
-    max_diff = 255 * diff.shape[0] * diff.shape[1] * diff.shape[2]
-    score = diff.sum() / max_diff
-    return float(score)
+    # cv2.norm fuses subtract/abs/sum in one SIMD pass without allocating a diff image
+    l1 = cv2.norm(prev_frame, cur_frame, cv2.NORM_L1)
+    # Normalise by 255 * number of elements (pixels * channels)
+    return l1 / (255.0 * prev_frame.size)
 
 # ---------------------------------------------------------------------------
 # Core analysis routine
 # ---------------------------------------------------------------------------
-def analyze_video(video_path: str, frame_interval: int = 5, segment_duration: float = 1.0) -> List[Dict[str, Any]]:
+# MediaPipe releases the GIL during inference, so a few worker threads let
+# decoding and face detection overlap on multi-core machines.
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+# Frames waiting for a worker are capped so long videos don't pile up in memory.
+MAX_PENDING_FRAMES = MAX_WORKERS * 4
+
+_EMPTY_BOX = {"x": 0, "y": 0, "w": 0, "h": 0}
+
+def _summarise_segment(seg_start_time: float, segment_duration: float, seg_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate per-frame records into a single output segment."""
+    face_detected = any(d["face_present"] for d in seg_data)
+    avg_motion = sum(d["motion_score"] for d in seg_data) / len(seg_data)
+    # Use the first face box where a face was detected (fallback to zeros)
+    first_face = next((d["face_box"] for d in seg_data if d["face_present"]), dict(_EMPTY_BOX))
+    return {
+        "start": round(seg_start_time, 3),
+        "end": round(seg_start_time + segment_duration, 3),
+        "face_detected": face_detected,
+        "motion_score": round(avg_motion, 3),
+        "face_box": first_face,
+    }
+
+def analyze_video(video_path: str, frame_interval: int = 5, segment_duration: float = 1.0,
+                  max_workers: int = MAX_WORKERS, enable_pose: bool = False) -> List[Dict[str, Any]]:
     """Process a video with MediaPipe and return a list of segment dictionaries.
     Each segment aggregates per‑frame data (face presence, bbox, motion) over the
     specified segment_duration (seconds). The function is deliberately lightweight –
     it does not write any files, only returns JSON‑compatible data.
+
+    Frames are decoded on the calling thread and handed to a small pool of
+    workers, each owning its own MediaPipe instances (they are not thread-safe).
+    Pose estimation is a full extra inference per frame and only runs when
+    enable_pose is set.
     """
     cap = cv2.VideoCapture(video_path)
     if not cap.isOpened():
         raise RuntimeError(f"Unable to open video file: {video_path}")
 
     fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
     frame_idx = 0
     prev_gray = None
 
-    # MediaPipe solutions – we initialise once and reuse.
-    face_detector = mp.solutions.face_detection.FaceDetection(model_selection=0, min_detection_confidence=0.5)
-    pose_estimator = mp.solutions.pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5)
-    selfie_seg = mp.solutions.selfie_segmentation.SelfieSegmentation(model_selection=1)
+    # Per-worker MediaPipe solutions – built lazily on first use and reused.
+    local = threading.local()
+    models: List[Any] = []
+    models_lock = threading.Lock()
 
-    segments: List[Dict[str, Any]] = []
-    # Temporary accumulators for the current segment
-    seg_start_time = 0.0
-    seg_data: List[Dict[str, Any]] = []
-
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        frame_idx += 1
-        if frame_idx % frame_interval != 0:
-            continue
-        timestamp = frame_idx / fps
+    def _worker_models():
+        if not hasattr(local, "face_detector"):
+            local.face_detector = mp.solutions.face_detection.FaceDetection(model_selection=0, min_detection_confidence=0.5)
+            local.pose_estimator = None
+            if enable_pose:
+                local.pose_estimator = mp.solutions.pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5)
+            with models_lock:
+                models.extend(m for m in (local.face_detector, local.pose_estimator) if m is not None)
+        return local.face_detector, local.pose_estimator
 
+    def _process_frame(timestamp: float, frame: np.ndarray, motion_score: float) -> Dict[str, Any]:
+        face_detector, pose_estimator = _worker_models()
         # Convert to RGB for MediaPipe
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         # Face detection
         face_results = face_detector.process(rgb)
         face_present = bool(face_results.detections)
-        face_box = _extract_face_bbox(face_results.detections, frame.shape[1], frame.shape[0]) if face_present else {"x": 0, "y": 0, "w": 0, "h": 0}
+        face_box = _extract_face_bbox(face_results.detections, frame.shape[1], frame.shape[0]) if face_present else dict(_EMPTY_BOX)
         # Pose (we only need landmarks count for now)
-        pose_results = pose_estimator.process(rgb)
-        # Motion score
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        motion_score = _compute_motion_score(prev_gray, gray)
-        prev_gray = gray
-
-        seg_data.append({
+        if pose_estimator is not None:
+            pose_estimator.process(rgb)
+        return {
             "timestamp": timestamp,
             "face_present": face_present,
             "face_box": face_box,
             "motion_score": motion_score,
-        })
+        }
+
+    # Futures are queued in decode order, so draining from the left keeps
+    # frame records sorted without an extra sort pass.
+    frame_records: List[Dict[str, Any]] = []
+    in_flight: deque = deque()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            while True:
+                # grab() skips the colour conversion for frames we don't analyse
+                if not cap.grab():
+                    break
+                frame_idx += 1
+                if frame_idx % frame_interval != 0:
+                    continue
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                timestamp = frame_idx / fps
+
+                # Motion depends on the previous sampled frame, so it stays on this thread.
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                motion_score = _compute_motion_score(prev_gray, gray)
+                prev_gray = gray
+
+                in_flight.append(pool.submit(_process_frame, timestamp, frame, motion_score))
+                if len(in_flight) >= MAX_PENDING_FRAMES:
+                    frame_records.append(in_flight.popleft().result())
+
+            while in_flight:
+                frame_records.append(in_flight.popleft().result())
+    finally:
+        cap.release()
+        for model in models:
+            model.close()
+
+    segments: List[Dict[str, Any]] = []
+    # Temporary accumulators for the current segment
+    seg_start_time = 0.0
+    seg_data: List[Dict[str, Any]] = []
+
+    for record in frame_records:
+        seg_data.append(record)
 
         # If we have crossed the segment boundary, aggregate.
-        if timestamp - seg_start_time >= segment_duration:
-            # Aggregate booleans and numeric values.
-            face_detected = any(d["face_present"] for d in seg_data)
-            # Average motion score
-            avg_motion = sum(d["motion_score"] for d in seg_data) / len(seg_data)
-            # Use the first face box where a face was detected (fallback to zeros)
-            first_face = next((d["face_box"] for d in seg_data if d["face_present"]), {"x": 0, "y": 0, "w": 0, "h": 0})
-            segments.append({
-                "start": round(seg_start_time, 3),
-                "end": round(seg_start_time + segment_duration, 3),
-                "face_detected": face_detected,
-                "motion_score": round(avg_motion, 3),
-                "face_box": first_face,
-            })
+        if record["timestamp"] - seg_start_time >= segment_duration:
+            segments.append(_summarise_segment(seg_start_time, segment_duration, seg_data))
             # Reset for next segment
             seg_start_time += segment_duration
             seg_data = []
 
     # Flush any remaining data as a final (possibly shorter) segment
     if seg_data:
-        face_detected = any(d["face_present"] for d in seg_data)
-        avg_motion = sum(d["motion_score"] for d in seg_data) / len(seg_data)
-        first_face = next((d["face_box"] for d in seg_data if d["face_present"]), {"x": 0, "y": 0, "w": 0, "h": 0})
-        segments.append({
-            "start": round(seg_start_time, 3),
-            "end": round(seg_start_time + segment_duration, 3),
-            "face_detected": face_detected,
-            "motion_score": round(avg_motion, 3),
-            "face_box": first_face,
-        })
-
-    cap.release()
+        segments.append(_summarise_segment(seg_start_time, segment_duration, seg_data))
+
     return segments
 
 # ---------------------------------------------------------------------------
 # FastAPI routes
 # ---------------------------------------------------------------------------
 @router.post("/analyze")
-async def mediapipe_analyze(req: AnalyzeRequest):
-    video_path = _get_video_path(req.video_id)
+async def mediapipe_analyze(req: AnalyzeRequest, session: AsyncSession = Depends(get_session)):
+    video_path = await _resolve_video_path(req.video_id, session)
+    if not video_path:
+        raise HTTPException(status_code=404, detail="Video file not found")
     try:
-        segments = analyze_video(video_path, req.frame_interval, req.segment_duration)
+        # OpenCV/MediaPipe work is blocking; keep it off the event loop
+        segments = await run_in_threadpool(
+            analyze_video, video_path, req.frame_interval, req.segment_duration,
+            enable_pose=req.enable_pose
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     return {"segments": segments}
 
+SUPPORTED_EFFECTS = [
+    {"name": "Face Focus", "description": "Zoom & brighten when a face is present"},
+    {"name": "Auto Reframe", "description": "Keeps the face centered for vertical shorts"},
+    {"name": "Background Soft Blur", "description": "Blurs background using selfie segmentation"},
+    {"name": "Motion Emphasis", "description": "Boost contrast during high‑motion segments"},
+]
+SUPPORTED_EFFECT_NAMES = frozenset(e["name"] for e in SUPPORTED_EFFECTS)
+
 @router.post("/effects-preview")
 async def mediapipe_effects_preview(req: EffectsPreviewRequest):
     # This endpoint does **not** render anything – it merely validates the request
     # and returns the list of supported effect names with a short description.
-    supported = [
-        {"name": "Face Focus", "description": "Zoom & brighten when a face is present"},
-        {"name": "Auto Reframe", "description": "Keeps the face centered for vertical shorts"},
-        {"name": "Background Soft Blur", "description": "Blurs background using selfie segmentation"},
-        {"name": "Motion Emphasis", "description": "Boost contrast during high‑motion segments"},
-    ]
-    if req.selected_effect not in [e["name"] for e in supported]:
+    if req.selected_effect not in SUPPORTED_EFFECT_NAMES:
         raise HTTPException(status_code=400, detail="Unsupported effect")
-    return {"selected_effect": req.selected_effect, "supported": supported}
+    return {"selected_effect": req.selected_effect, "supported": SUPPORTED_EFFECTS}
 
 # Export the router so the main FastAPI app can include it.
 __all__ = ["router"]
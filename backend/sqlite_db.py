@@ -1,12 +1,68 @@
-from sqlalchemy import create_engine, Column, String, Integer, Float, Boolean, ForeignKey, Text
+from sqlalchemy import create_engine, event, Column, String, Integer, Float, Boolean, ForeignKey, Text, LargeBinary, Index, insert, delete, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import sessionmaker, relationship, scoped_session
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from datetime import datetime
+from contextvars import ContextVar
+import orjson
 import os
+import threading
+
+# Optional: zstd compression for stored timelines
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
 
 DB_PATH = "sqlite:///../storage/metadata.db"
 
-engine = create_engine(DB_PATH, connect_args={"check_same_thread": False})
+# Connection pool sizing (env override)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
+engine = create_engine(
+    DB_PATH,
+    connect_args={"check_same_thread": False},
+    poolclass=QueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_recycle=3600,
+    pool_pre_ping=True,
+)
+
+# WAL lets request handlers read while a write is in progress; the rest trades
+# a little durability on power loss for far fewer fsyncs and more page cache.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",     # 64 MB
+    "PRAGMA mmap_size=268435456",   # 256 MB
+    "PRAGMA foreign_keys=ON",
+)
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Registry key for ScopedSession. get_db() sets it to a per-request token:
+# FastAPI runs the sync dependency on shared pool threads (and may enter and
+# exit it on different ones), so a plain thread-local session could be
+# handed to two concurrent requests. Worker threads and scripts that never
+# set it get one session per thread.
+_session_scope: ContextVar = ContextVar("db_session_scope", default=None)
+
+def _scope_key():
+    scope = _session_scope.get()
+    return threading.get_ident() if scope is None else scope
+
+ScopedSession = scoped_session(SessionLocal, scopefunc=_scope_key)
 Base = declarative_base()
 
 class VideoMetadata(Base):
@@ -26,6 +82,9 @@ class VideoMetadata(Base):
 
 class VideoScene(Base):
     __tablename__ = "video_scenes"
+    __table_args__ = (
+        Index("ix_scene_project_time", "project_id", "start_time"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(String, ForeignKey("video_metadata.project_id"))
@@ -38,6 +97,10 @@ class VideoScene(Base):
 
 class CutSuggestion(Base):
     __tablename__ = "cut_suggestions"
+    __table_args__ = (
+        Index("ix_cut_project_time", "project_id", "start_time"),
+        Index("ix_cut_project_scene", "project_id", "scene_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(String, ForeignKey("video_metadata.project_id"))
@@ -58,23 +121,138 @@ class CutSuggestion(Base):
 
 class ProjectTimeline(Base):
     __tablename__ = "project_timelines"
+    __table_args__ = (
+        # One row per project; save_timeline upserts on it
+        Index("ux_project_timelines_project", "project_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(String, ForeignKey("video_metadata.project_id"), index=True)
+    project_id = Column(String, ForeignKey("video_metadata.project_id"))
     version = Column(Integer, default=1)
-    timeline_json = Column(Text)  # Stores the TimelineProject JSON schema
+    timeline_json = Column(LargeBinary)  # TimelineProject as orjson bytes, zstd-compressed when available
     updated_at = Column(String)   # ISO format timestamp
     
     video = relationship("VideoMetadata", back_populates="timelines")
 
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+ZSTD_LEVEL = 3
+
+def encode_timeline(project) -> bytes:
+    """Serialize a TimelineProject (or its dict) for ProjectTimeline.timeline_json."""
+    if hasattr(project, "model_dump_json"):
+        # Serialize in pydantic-core instead of building a dict for orjson first
+        raw = project.model_dump_json().encode()
+    else:
+        raw = orjson.dumps(project)
+    if ZSTD_AVAILABLE:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return raw
+
+def decode_timeline(blob) -> dict:
+    """
+    Inverse of encode_timeline. Also reads rows written before the column
+    became binary (plain JSON text) and uncompressed blobs.
+    """
+    if isinstance(blob, str):
+        return orjson.loads(blob)
+    if blob[:4] == ZSTD_MAGIC:
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("Timeline is zstd-compressed but zstandard is not installed")
+        blob = zstandard.ZstdDecompressor().decompress(blob)
+    return orjson.loads(blob)
+
+def save_timeline(session, project_id: str, project) -> int:
+    """
+    Insert or update a project's timeline in one statement and return the
+    new version (1 on first save, +1 after). The caller commits.
+    """
+    stmt = sqlite_insert(ProjectTimeline).values(
+        project_id=project_id,
+        version=1,
+        timeline_json=encode_timeline(project),
+        updated_at=datetime.now().isoformat(),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ProjectTimeline.project_id],
+        set_={
+            "version": ProjectTimeline.version + 1,
+            "timeline_json": stmt.excluded.timeline_json,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    ).returning(ProjectTimeline.version)
+    return session.execute(stmt).scalar_one()
+
+def load_timeline(session, project_id: str):
+    """
+    (version, timeline dict) for a project's saved timeline, or None if it
+    has never been saved. Inverse of save_timeline.
+    """
+    row = session.query(ProjectTimeline.version, ProjectTimeline.timeline_json).filter(
+        ProjectTimeline.project_id == project_id
+    ).first()
+    if row is None:
+        return None
+    return row.version, decode_timeline(row.timeline_json)
+
+def replace_scenes(session, project_id: str, rows: list):
+    """
+    Replace a project's scenes with `rows` (dicts keyed by column name).
+    Uses one DELETE and one executemany INSERT instead of per-row ORM adds.
+    The caller owns the transaction (commit/rollback).
+    """
+    session.execute(delete(VideoScene).where(VideoScene.project_id == project_id))
+    if rows:
+        session.execute(insert(VideoScene), [{**r, "project_id": project_id} for r in rows])
+
+def replace_cut_suggestions(session, project_id: str, rows: list):
+    """Replace a project's cut suggestions; same contract as replace_scenes."""
+    session.execute(delete(CutSuggestion).where(CutSuggestion.project_id == project_id))
+    if rows:
+        session.execute(insert(CutSuggestion), [{**r, "project_id": project_id} for r in rows])
+
+def _dedupe_project_timelines(connection):
+    """
+    Keep one project_timelines row per project (highest version, then newest id).
+    Older databases only had a non-unique index on project_id, so they may hold
+    duplicates that would make creating ux_project_timelines_project fail.
+    """
+    result = connection.execute(text(
+        "DELETE FROM project_timelines WHERE id NOT IN ("
+        " SELECT id FROM ("
+        "  SELECT id, ROW_NUMBER() OVER ("
+        "   PARTITION BY project_id ORDER BY version DESC, id DESC"
+        "  ) AS rn FROM project_timelines"
+        " ) WHERE rn = 1"
+        ")"
+    ))
+    if result.rowcount:
+        print(f"Removed {result.rowcount} duplicate project_timelines rows before adding the unique index")
+
 def init_db():
     # Create parent directory if it doesn't exist
     os.makedirs("../storage", exist_ok=True)
     Base.metadata.create_all(bind=engine)
+    if not any(ix["name"] == "ux_project_timelines_project"
+               for ix in inspect(engine).get_indexes("project_timelines")):
+        with engine.begin() as connection:
+            _dedupe_project_timelines(connection)
+    # create_all skips indexes on tables that already exist
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 def get_db():
-    db = SessionLocal()
+    scope = object()
+    db = _with_scope(scope, ScopedSession)
     try:
         yield db
     finally:
-        db.close()
+        # May run on another thread/context than the setup; remove by the same key
+        _with_scope(scope, ScopedSession.remove)
+
+def _with_scope(scope, func):
+    token = _session_scope.set(scope)
+    try:
+        return func()
+    finally:
+        _session_scope.reset(token)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Backend modules use flat imports (run from backend/), so put it on the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
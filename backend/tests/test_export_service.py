@@ -0,0 +1,28 @@
+import pytest
+
+import export_service
+
+
+def _fill(finished: int, processing: int = 0):
+    export_service.export_tasks.clear()
+    for i in range(finished):
+        export_service.export_tasks[f"done-{i}"] = {"status": "completed"}
+    for i in range(processing):
+        export_service.export_tasks[f"busy-{i}"] = {"status": "processing"}
+
+
+@pytest.mark.parametrize("finished", [0, 1, 51, 75, 99, 100])
+def test_prune_keeps_everything_up_to_cap(finished):
+    _fill(finished, processing=3)
+    export_service._prune_export_tasks()
+    assert len(export_service.export_tasks) == finished + 3
+
+
+def test_prune_drops_oldest_finished_above_cap():
+    cap = export_service.MAX_FINISHED_EXPORT_TASKS
+    _fill(cap + 5, processing=2)
+    export_service._prune_export_tasks()
+    kept = [tid for tid in export_service.export_tasks if tid.startswith("done-")]
+    assert len(kept) == cap
+    assert kept[0] == "done-5"
+    assert sum(tid.startswith("busy-") for tid in export_service.export_tasks) == 2
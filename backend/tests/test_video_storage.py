@@ -0,0 +1,23 @@
+from video_utils.storage import find_video_path
+
+
+def test_finds_video_by_id_and_prefix(tmp_path):
+    (tmp_path / "abc123.mp4").write_bytes(b"")
+    video_dir = str(tmp_path)
+    assert find_video_path("abc123", video_dir) == str(tmp_path / "abc123.mp4")
+    assert find_video_path("abc", video_dir) == str(tmp_path / "abc123.mp4")
+    assert find_video_path("zzz", video_dir) is None
+
+
+def test_rescans_when_indexed_file_is_gone(tmp_path):
+    old = tmp_path / "abc.mp4"
+    old.write_bytes(b"")
+    video_dir = str(tmp_path)
+    assert find_video_path("abc", video_dir) == str(old)
+    old.unlink()
+    (tmp_path / "abc.mov").write_bytes(b"")
+    assert find_video_path("abc", video_dir) == str(tmp_path / "abc.mov")
+
+
+def test_missing_directory(tmp_path):
+    assert find_video_path("abc", str(tmp_path / "missing")) is None
@@ -1,5 +1,10 @@
-from backend.timeline.schema import TimelineProject, Sequence, Track, Clip
+from backend.timeline.schema import TimelineProject, Sequence, Track, Clip, _StartTimes
+from bisect import bisect_right
 from copy import deepcopy
+from typing import Callable, List
+
+# Timeline/source gap (seconds) still treated as continuous when merging
+MERGE_EPSILON = 1e-6
 
 class TimelineEngine:
     """
@@ -10,15 +15,56 @@ class TimelineEngine:
     @staticmethod
     def _check_overlaps(track: Track, target_clip_id: str, new_start: float, new_end: float) -> bool:
         """Check if the proposed range overlaps with any OTHER clip on the track."""
-        for clip in track.clips:
-            if clip.clip_id == target_clip_id:
-                continue
-            
-            # Check intersection
-            # Max(start1, start2) < Min(end1, end2)
-            if max(clip.start_time, new_start) < min(clip.end_time, new_end):
-                return True
-        return False
+        return track.find_overlap(target_clip_id, new_start, new_end) is not None
+
+    @staticmethod
+    def _clone_with_track_change(project: TimelineProject, track_id: str, mutator: Callable[[Track], None]) -> TimelineProject:
+        """
+        Copy-on-write: clone only the path down to one track.
+        The mutator gets a track copy with its own clips list; any clip it
+        changes must be taken through _own_clip first. Untouched tracks and
+        clips are shared with the original project.
+        """
+        index = project.sequence.track_index(track_id)
+        if index is None:
+            raise ValueError("Track not found")
+        tracks = list(project.sequence.tracks)
+        old_end = tracks[index].end_time()
+
+        new_track = tracks[index].model_copy(update={"clips": list(tracks[index].clips)})
+        mutator(new_track)
+        new_track.invalidate_intervals()
+        tracks[index] = new_track
+
+        new_sequence = project.sequence.model_copy(update={"tracks": tracks})
+        TimelineEngine._update_duration(new_sequence, old_end, new_track.end_time())
+        return project.model_copy(update={"sequence": new_sequence})
+
+    @staticmethod
+    def _update_duration(sequence: Sequence, old_end: float, new_end: float) -> None:
+        """
+        Keep sequence.duration as a running max of track ends after one track changed.
+        Only a track that held the max and shrank forces a rescan of the other tracks.
+        """
+        if new_end >= sequence.duration:
+            sequence.duration = new_end
+        elif old_end >= sequence.duration:
+            sequence.duration = sequence.calculate_duration()
+
+    @staticmethod
+    def _own_clip(track: Track, clip_id: str) -> Clip:
+        """Replace a clip on a (cloned) track with a private copy and return it."""
+        index = track.clip_index(clip_id)
+        if index is None:
+            raise ValueError("Clip not found")
+        clip = deepcopy(track.clips[index])
+        track.clips[index] = clip
+        return clip
+
+    @staticmethod
+    def _insert_sorted(track: Track, clip: Clip) -> None:
+        """Insert a clip keeping track.clips ordered by start_time (bisect, no full re-sort)."""
+        track.clips.insert(bisect_right(_StartTimes(track.clips), clip.start_time), clip)
 
     @staticmethod
     def move_clip(project: TimelineProject, track_id: str, clip_id: str, new_start: float) -> TimelineProject:
@@ -26,118 +72,128 @@ class TimelineEngine:
         if new_start < 0:
             raise ValueError("Time cannot be negative")
 
-        updated_project = deepcopy(project)
-        track = next((t for t in updated_project.sequence.tracks if t.track_id == track_id), None)
-        if not track:
-            raise ValueError("Track not found")
-            
-        clip = next((c for c in track.clips if c.clip_id == clip_id), None)
-        if not clip:
-            raise ValueError("Clip not found")
-            
-        duration = clip.end_time - clip.start_time
-        new_end = new_start + duration
-        
-        if TimelineEngine._check_overlaps(track, clip_id, new_start, new_end):
-            raise ValueError("Move failed: Overlaps with existing clip")
-            
-        clip.start_time = new_start
-        clip.end_time = new_end
-        
-        # Sort clips by start time to maintain order
-        track.clips.sort(key=lambda c: c.start_time)
-        
-        return updated_project
+        def mutate(track: Track) -> None:
+            clip = TimelineEngine._own_clip(track, clip_id)
+
+            duration = clip.end_time - clip.start_time
+            new_end = new_start + duration
+
+            if TimelineEngine._check_overlaps(track, clip_id, new_start, new_end):
+                raise ValueError("Move failed: Overlaps with existing clip")
+
+            clip.start_time = new_start
+            clip.end_time = new_end
+
+            # Re-insert at its new place to keep clips ordered by start time
+            del track.clips[track.clip_index(clip_id)]
+            TimelineEngine._insert_sorted(track, clip)
+
+        return TimelineEngine._clone_with_track_change(project, track_id, mutate)
 
     @staticmethod
     def trim_clip(project: TimelineProject, track_id: str, clip_id: str, new_in: float, new_out: float) -> TimelineProject:
         """Trim a clip's source In/Out points. Updates Timeline duration. Rejects overlap."""
         if new_in < 0 or new_out <= new_in:
             raise ValueError("Invalid trim points")
-            
-        updated_project = deepcopy(project)
-        track = next((t for t in updated_project.sequence.tracks if t.track_id == track_id), None)
-        if not track:
-            raise ValueError("Track not found")
-            
-        clip = next((c for c in track.clips if c.clip_id == clip_id), None)
-        if not clip:
-            raise ValueError("Clip not found")
-            
-        # Calculate new timeline duration based on speed
-        new_source_dur = new_out - new_in
-        new_timeline_dur = new_source_dur / clip.speed
-        
-        current_start = clip.start_time
-        new_end = current_start + new_timeline_dur
-        
-        if TimelineEngine._check_overlaps(track, clip_id, current_start, new_end):
-            raise ValueError("Trim failed: Resulting clip overlaps")
-            
-        clip.in_point = new_in
-        clip.out_point = new_out
-        clip.end_time = new_end
-        
-        return updated_project
+
+        def mutate(track: Track) -> None:
+            clip = TimelineEngine._own_clip(track, clip_id)
+
+            # Calculate new timeline duration based on speed
+            new_source_dur = new_out - new_in
+            new_timeline_dur = new_source_dur / clip.speed
+
+            current_start = clip.start_time
+            new_end = current_start + new_timeline_dur
+
+            if TimelineEngine._check_overlaps(track, clip_id, current_start, new_end):
+                raise ValueError("Trim failed: Resulting clip overlaps")
+
+            clip.in_point = new_in
+            clip.out_point = new_out
+            clip.end_time = new_end
+
+        return TimelineEngine._clone_with_track_change(project, track_id, mutate)
 
     @staticmethod
     def split_clip(project: TimelineProject, track_id: str, clip_id: str, split_time: float) -> TimelineProject:
         """Split a clip into two at the given Timeline time."""
-        updated_project = deepcopy(project)
-        track = next((t for t in updated_project.sequence.tracks if t.track_id == track_id), None)
-        if not track:
-            raise ValueError("Track not found")
-            
-        clip = next((c for c in track.clips if c.clip_id == clip_id), None)
-        if not clip:
-            raise ValueError("Clip not found")
-            
-        if not (clip.start_time < split_time < clip.end_time):
-            raise ValueError("Split time must be within clip bounds")
-            
-        # Calculate offset
-        timeline_offset = split_time - clip.start_time
-        source_offset = timeline_offset * clip.speed
-        
-        # Define Split Point in Source
-        split_source_point = clip.in_point + source_offset
-        
-        # Create Right Side Clip (New)
-        right_clip = deepcopy(clip)
-        right_clip.clip_id = f"{clip.clip_id}_split" # New ID (or generic)
-        right_clip.label = f"{clip.label} (Part 2)"
-        
-        # Update Left Clip (Original)
-        clip.out_point = split_source_point
-        clip.end_time = split_time
-        
-        # Update Right Clip
-        right_clip.in_point = split_source_point
-        right_clip.start_time = split_time
-        # right_clip.end_time remains original end
-        # right_clip.out_point remains original out
-        
-        # Insert
-        track.clips.append(right_clip)
-        track.clips.sort(key=lambda c: c.start_time)
-        
-        return updated_project
+        def mutate(track: Track) -> None:
+            clip = TimelineEngine._own_clip(track, clip_id)
+
+            if not (clip.start_time < split_time < clip.end_time):
+                raise ValueError("Split time must be within clip bounds")
+
+            # Calculate offset
+            timeline_offset = split_time - clip.start_time
+            source_offset = timeline_offset * clip.speed
+
+            # Define Split Point in Source
+            split_source_point = clip.in_point + source_offset
+
+            # Create Right Side Clip (New)
+            right_clip = deepcopy(clip)
+            right_clip.clip_id = f"{clip.clip_id}_split" # New ID (or generic)
+            right_clip.label = f"{clip.label} (Part 2)"
+
+            # Update Left Clip (Original)
+            clip.out_point = split_source_point
+            clip.end_time = split_time
+
+            # Update Right Clip
+            right_clip.in_point = split_source_point
+            right_clip.start_time = split_time
+            # right_clip.end_time remains original end
+            # right_clip.out_point remains original out
+
+            # Insert, keeping clips ordered by start time
+            TimelineEngine._insert_sorted(track, right_clip)
+
+        return TimelineEngine._clone_with_track_change(project, track_id, mutate)
+
+    @staticmethod
+    def merge_clips(project: TimelineProject, track_id: str, clip_ids: List[str]) -> TimelineProject:
+        """
+        Join neighbouring clips into the first one (the inverse of split_clip).
+        The clips must sit next to each other on the track and continue the same
+        source at the same speed, so the joined clip plays exactly as before.
+        """
+        def mutate(track: Track) -> None:
+            indices = sorted({track.clip_index(cid) for cid in clip_ids} - {None})
+            if len(indices) != len(set(clip_ids)):
+                raise ValueError("Clip not found")
+            if len(indices) < 2:
+                raise ValueError("Merge needs at least two clips")
+            first, last = indices[0], indices[-1]
+            if last - first + 1 != len(indices):
+                raise ValueError("Merge failed: Clips are not adjacent")
+
+            clips = track.clips
+            for left, right in zip(clips[first:last], clips[first + 1:last + 1]):
+                if (right.source_id != left.source_id or right.speed != left.speed
+                        or abs(right.start_time - left.end_time) > MERGE_EPSILON
+                        or abs(right.in_point - left.out_point) > MERGE_EPSILON):
+                    raise ValueError("Merge failed: Clips are not continuous")
+
+            merged = TimelineEngine._own_clip(track, clips[first].clip_id)
+            merged.end_time = clips[last].end_time
+            merged.out_point = clips[last].out_point
+            # One slice delete; the clips after it keep their order
+            del clips[first + 1:last + 1]
+
+        return TimelineEngine._clone_with_track_change(project, track_id, mutate)
 
     @staticmethod
     def delete_clip(project: TimelineProject, track_id: str, clip_id: str) -> TimelineProject:
         """Remove a clip. Leaves gap."""
-        updated_project = deepcopy(project)
-        track = next((t for t in updated_project.sequence.tracks if t.track_id == track_id), None)
-        if not track:
-            raise ValueError("Track not found")
-            
-        original_len = len(track.clips)
-        track.clips = [c for c in track.clips if c.clip_id != clip_id]
-        
-        if len(track.clips) == original_len:
-            raise ValueError("Clip not found")
-            
-        return updated_project
+        def mutate(track: Track) -> None:
+            # The cloned track owns its clips list, so remove in place
+            index = track.clip_index(clip_id)
+            if index is None:
+                raise ValueError("Clip not found")
+            del track.clips[index]
+
+        return TimelineEngine._clone_with_track_change(project, track_id, mutate)
 
 # --- TEST BLOCK ---
 if __name__ == "__main__":
@@ -155,6 +211,7 @@ if __name__ == "__main__":
     
     print("Initial State:")
     print([c.clip_id for c in proj.sequence.tracks[0].clips])
+    assert proj.sequence.duration == 20
     
     # Test 1: Move Logic (Valid)
     print("\nTest 1: Move c2 to 12.0 (No overlap, fits in gap 10-15)")
@@ -178,8 +235,16 @@ if __name__ == "__main__":
     print(f"c1 end: {clips[0].end_time} (Expected 5.0)")
     print(f"c1_split start: {clips[1].start_time} (Expected 5.0)")
     
-    # Test 4: Delete
-    print("\nTest 4: Delete c2")
+    # Test 4: Merge the split halves back
+    print("\nTest 4: Merge c1 + c1_split")
+    merged = TimelineEngine.merge_clips(proj, "t1", ["c1", "c1_split"])
+    clips = merged.sequence.tracks[0].clips
+    print(f"Clip count: {len(clips)} (Expected 2)")
+    print(f"c1 end: {clips[0].end_time} (Expected 10.0)")
+    assert len(clips) == 2 and clips[0].end_time == 10.0 and clips[0].out_point == 10.0
+    
+    # Test 5: Delete
+    print("\nTest 5: Delete c2")
     proj = TimelineEngine.delete_clip(proj, "t1", "c2")
     print(f"Clip count: {len(proj.sequence.tracks[0].clips)} (Expected 2)")
     
@@ -0,0 +1,53 @@
+"""
+Array fast path for overlap and clip-at-time checks on large overlay tracks.
+Overlay tracks may stack clips, so they cannot use the sorted bisect in
+Track.find_overlap and fall back to a full scan; for big imported tracks
+that scan runs here over plain float arrays, JIT-compiled when numba is
+installed (it comes with librosa).
+"""
+
+import numpy as np
+
+# Optional: numba JIT
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Below this many clips the Python scan beats array setup / JIT dispatch
+MIN_ARRAY_CLIPS = 32
+
+
+def _first_overlap(starts, ends, target_idx, new_start, new_end, epsilon):
+    """Index of the first interval (other than target_idx) hitting [new_start, new_end], or -1."""
+    for i in range(starts.shape[0]):
+        if i == target_idx:
+            continue
+        if max(starts[i], new_start) < min(ends[i], new_end) - epsilon:
+            return i
+    return -1
+
+
+def _first_covering(starts, ends, time):
+    """Index of the first interval with start <= time < end, or -1."""
+    for i in range(starts.shape[0]):
+        if starts[i] <= time < ends[i]:
+            return i
+    return -1
+
+
+if NUMBA_AVAILABLE:
+    first_overlap = njit(cache=True)(_first_overlap)
+    first_covering = njit(cache=True)(_first_covering)
+else:
+    first_overlap = _first_overlap
+    first_covering = _first_covering
+
+
+def interval_arrays(clips):
+    """(starts, ends) float64 arrays for a clip list."""
+    n = len(clips)
+    starts = np.fromiter((c.start_time for c in clips), dtype=np.float64, count=n)
+    ends = np.fromiter((c.end_time for c in clips), dtype=np.float64, count=n)
+    return starts, ends
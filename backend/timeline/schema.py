@@ -1,29 +1,70 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
+from dataclasses import dataclass, field, replace
 from typing import List, Optional, Literal, Dict
 from uuid import uuid4
+from bisect import bisect_left, bisect_right
+import sys
+from backend.timeline.overlap import NUMBA_AVAILABLE, MIN_ARRAY_CLIPS, first_covering, first_overlap, interval_arrays
 
 def generate_id() -> str:
     return str(uuid4())
 
+# Slots need Python 3.10+; on 3.9 the component dataclasses keep a __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# --- BASE ---
+
+class TimelineModel(BaseModel):
+    """
+    Base for timeline models with a cheap deepcopy.
+    Fields are plain values, nested models or lists of models/components, so
+    we rebuild the tree directly instead of going through copy.deepcopy's
+    generic walk.
+    """
+
+    def __deepcopy__(self, memo: Optional[Dict[int, object]] = None):
+        values = {}
+        for name, value in self.__dict__.items():
+            if isinstance(value, BaseModel):
+                value = value.__deepcopy__(memo)
+            elif isinstance(value, list):
+                value = [v.__deepcopy__(memo) if isinstance(v, (BaseModel, Clip)) else v for v in value]
+            values[name] = value
+
+        # Skip validation: the source instance was already validated.
+        new = self.__class__.__new__(self.__class__)
+        object.__setattr__(new, "__dict__", values)
+        object.__setattr__(new, "__pydantic_fields_set__", set(self.__pydantic_fields_set__))
+        object.__setattr__(new, "__pydantic_extra__", None)
+        private = self.__pydantic_private__
+        object.__setattr__(new, "__pydantic_private__", None if private is None else dict(private))
+        return new
+
 # --- COMPONENTS ---
+# Transform and Clip are plain dataclasses: there are thousands of them per
+# timeline and they are rebuilt on every edit. Pydantic still validates them
+# when they arrive inside a Track / TimelineProject.
 
-class Transform(BaseModel):
+@dataclass(**_SLOTS)
+class Transform:
     """Spatial composition properties."""
     scale: float = 1.0
     x: float = 0.0  # Normalized coords or pixels? Usually centered 0.0
     y: float = 0.0
     rotation: float = 0.0
     opacity: float = 1.0
+
+    def __deepcopy__(self, memo: Optional[Dict[int, object]] = None) -> "Transform":
+        return Transform(self.scale, self.x, self.y, self.rotation, self.opacity)
     
-class Clip(BaseModel):
+@dataclass(**_SLOTS)
+class Clip:
     """
     A unified clip object for the timeline.
     Spans a time range on the timeline (start_time -> end_time)
     mapping to a time range in the source media (in_point -> out_point).
     """
-    clip_id: str = Field(default_factory=generate_id)
     source_id: str
-    label: str = "Clip"
     
     # Timeline Placement (Seconds)
     start_time: float
@@ -33,9 +74,12 @@ class Clip(BaseModel):
     in_point: float  # Start time in source file
     out_point: float # End time in source file
     
+    clip_id: str = field(default_factory=generate_id)
+    label: str = "Clip"
+    
     # Effects
     speed: float = 1.0
-    transform: Transform = Field(default_factory=Transform)
+    transform: Transform = field(default_factory=Transform)
     
     # Metadata
     z_index: int = 0  # Layering within track? Or implicit list order.
@@ -50,7 +94,10 @@ class Clip(BaseModel):
         """Source content usage duration."""
         return self.out_point - self.in_point
 
-class Track(BaseModel):
+    def __deepcopy__(self, memo: Optional[Dict[int, object]] = None) -> "Clip":
+        return replace(self, transform=self.transform.__deepcopy__(memo))
+
+class Track(TimelineModel):
     """
     A horizontal lane containing clips.
     Supports sparse placement (gaps allowed).
@@ -62,7 +109,131 @@ class Track(BaseModel):
     muted: bool = False
     clips: List[Clip] = []
 
-class Sequence(BaseModel):
+    # clip_id -> position in clips; may be stale, clip_index() checks it
+    _clip_positions: Dict[str, int] = PrivateAttr(default_factory=dict)
+    # (starts, ends) arrays for large overlay tracks; dropped by TimelineEngine after each edit
+    _interval_arrays: Optional[tuple] = PrivateAttr(default=None)
+    # end_time() result; dropped together with the interval arrays
+    _end_time: Optional[float] = PrivateAttr(default=None)
+
+    def clip_index(self, clip_id: str) -> Optional[int]:
+        """Position of a clip in self.clips (O(1) while the cached map is fresh)."""
+        i = self._clip_positions.get(clip_id)
+        if i is None or i >= len(self.clips) or self.clips[i].clip_id != clip_id:
+            self._clip_positions = _positions(self.clips, "clip_id")
+            i = self._clip_positions.get(clip_id)
+        return i
+
+    def find_overlap(self, target_clip_id: str, new_start: float, new_end: float, epsilon: float = 0.0) -> Optional[Clip]:
+        """
+        Return the first OTHER clip intersecting [new_start, new_end], if any.
+        Non-overlay tracks keep clips sorted by start_time without overlaps,
+        so ends are sorted too and only the clips just before new_end need
+        checking (O(log n)). Overlay tracks may stack clips, so they are scanned.
+        """
+        if self.type == 'overlay':
+            if NUMBA_AVAILABLE and len(self.clips) >= MIN_ARRAY_CLIPS:
+                return self._find_overlap_arrays(target_clip_id, new_start, new_end, epsilon)
+            for clip in self.clips:
+                if clip.clip_id != target_clip_id and max(clip.start_time, new_start) < min(clip.end_time, new_end) - epsilon:
+                    return clip
+            return None
+
+        # Clips before this index start early enough to intersect
+        i = bisect_left(_StartTimes(self.clips), new_end - epsilon)
+        while i > 0:
+            i -= 1
+            clip = self.clips[i]
+            if clip.clip_id == target_clip_id:
+                continue
+            if clip.end_time - epsilon <= new_start:
+                # Ends are sorted: nothing earlier reaches new_start either
+                return None
+            if max(clip.start_time, new_start) < min(clip.end_time, new_end) - epsilon:
+                return clip
+        return None
+
+    def clip_at(self, time: float) -> Optional[Clip]:
+        """
+        The clip covering `time` (start_time <= time < end_time), if any.
+        Non-overlay tracks are sorted and non-overlapping, so only the last
+        clip starting at or before `time` can cover it (O(log n)). Overlay
+        tracks may stack clips; the first one in list order wins.
+        """
+        if self.type == 'overlay':
+            if NUMBA_AVAILABLE and len(self.clips) >= MIN_ARRAY_CLIPS:
+                starts, ends = self._get_interval_arrays()
+                i = first_covering(starts, ends, float(time))
+                return None if i < 0 else self.clips[i]
+            for clip in self.clips:
+                if clip.start_time <= time < clip.end_time:
+                    return clip
+            return None
+
+        i = bisect_right(_StartTimes(self.clips), time) - 1
+        if i >= 0 and time < self.clips[i].end_time:
+            return self.clips[i]
+        return None
+
+    def end_time(self) -> float:
+        """
+        Timeline end of the last clip. Ordered tracks end with their last clip
+        (O(1)); overlay tracks take the max once and cache it until the next edit.
+        """
+        if not self.clips:
+            return 0.0
+        if self.type != 'overlay':
+            return self.clips[-1].end_time
+        end = self._end_time
+        if end is None:
+            if len(self.clips) >= MIN_ARRAY_CLIPS:
+                end = float(self._get_interval_arrays()[1].max())
+            else:
+                end = max(clip.end_time for clip in self.clips)
+            self._end_time = end
+        return end
+
+    def _find_overlap_arrays(self, target_clip_id: str, new_start: float, new_end: float, epsilon: float) -> Optional[Clip]:
+        """Overlay scan over cached start/end arrays (numba kernel)."""
+        arrays = self._get_interval_arrays()
+        target = self.clip_index(target_clip_id)
+        i = first_overlap(arrays[0], arrays[1], -1 if target is None else target,
+                          float(new_start), float(new_end), float(epsilon))
+        return None if i < 0 else self.clips[i]
+
+    def _get_interval_arrays(self) -> tuple:
+        """Cached (starts, ends) arrays for the overlay fast paths."""
+        arrays = self._interval_arrays
+        if arrays is None or len(arrays[0]) != len(self.clips):
+            arrays = self._interval_arrays = interval_arrays(self.clips)
+        return arrays
+
+    def invalidate_intervals(self) -> None:
+        """Drop cached interval arrays and end time after mutating clips in place."""
+        self._interval_arrays = None
+        self._end_time = None
+
+def _positions(items: list, key: str) -> Dict[str, int]:
+    """id -> first position map for a list of clips or tracks."""
+    positions: Dict[str, int] = {}
+    for i, item in enumerate(items):
+        positions.setdefault(getattr(item, key), i)
+    return positions
+
+class _StartTimes:
+    """Read-only view of clip start times so bisect works without building a list."""
+    __slots__ = ("clips",)
+
+    def __init__(self, clips: List[Clip]):
+        self.clips = clips
+
+    def __len__(self) -> int:
+        return len(self.clips)
+
+    def __getitem__(self, index: int) -> float:
+        return self.clips[index].start_time
+
+class Sequence(TimelineModel):
     """
     The master container for the edit.
     """
@@ -72,14 +243,35 @@ class Sequence(BaseModel):
     fps: float = 30.0
     aspect_ratio: str = "16:9"
     tracks: List[Track] = []
+
+    # track_id -> position in tracks; may be stale, track_index() checks it
+    _track_positions: Dict[str, int] = PrivateAttr(default_factory=dict)
     
-    # Global Duration is derived, but can be cached
+    # Global Duration is derived, but can be cached (kept current by TimelineEngine)
     duration: float = 0.0
     
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
 
-class TimelineProject(BaseModel):
+    @model_validator(mode="after")
+    def _init_duration(self) -> "Sequence":
+        if self.tracks:
+            self.duration = self.calculate_duration()
+        return self
+
+    def calculate_duration(self) -> float:
+        """Latest clip end across all tracks."""
+        return max((track.end_time() for track in self.tracks), default=0.0)
+
+    def track_index(self, track_id: str) -> Optional[int]:
+        """Position of a track in self.tracks (O(1) while the cached map is fresh)."""
+        i = self._track_positions.get(track_id)
+        if i is None or i >= len(self.tracks) or self.tracks[i].track_id != track_id:
+            self._track_positions = _positions(self.tracks, "track_id")
+            i = self._track_positions.get(track_id)
+        return i
+
+class TimelineProject(TimelineModel):
     """Root serialization object."""
     project_id: str
     version: str = "1.0.0"
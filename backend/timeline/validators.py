@@ -11,19 +11,12 @@ def validate_no_overlap(track: Track, target_clip_id: str, new_start: float, new
     # Precision tolerance to avoid float errors
     EPSILON = 0.001
     
-    for clip in track.clips:
-        if clip.clip_id == target_clip_id:
-            continue
-            
-        # Check intersection: max(start1, start2) < min(end1, end2)
-        intersection_start = max(clip.start_time, new_start)
-        intersection_end = min(clip.end_time, new_end)
-        
-        if intersection_start < intersection_end - EPSILON:
-            raise ValueError(
-                f"Invalid Operation: Overlaps with existing clip '{clip.label}' "
-                f"({clip.start_time:.2f}s - {clip.end_time:.2f}s)"
-            )
+    clip = track.find_overlap(target_clip_id, new_start, new_end, EPSILON)
+    if clip is not None:
+        raise ValueError(
+            f"Invalid Operation: Overlaps with existing clip '{clip.label}' "
+            f"({clip.start_time:.2f}s - {clip.end_time:.2f}s)"
+        )
 
 def validate_min_duration(start: float, end: float) -> None:
     """Ensure the duration meets the minimum requirement."""
@@ -5,7 +5,9 @@ Works with speech, music, sports clips, and handles silent videos gracefully.
 """
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import List, Dict, Tuple, Optional
+from functools import lru_cache
 import os
 
 # Try to import librosa
@@ -21,6 +23,9 @@ DEFAULT_SR = 22050  # Sample rate
 HOP_LENGTH = 512    # Hop length for feature extraction
 SILENCE_THRESHOLD = 0.02  # RMS threshold for silence
 MIN_SILENCE_DURATION = 0.5  # Minimum silence duration in seconds
+AUDIO_CACHE_SIZE = 4  # Decoded waveforms kept in memory
+# Fast resampler: plenty for RMS/onset features (kaiser_fast needs resampy on librosa >= 0.10)
+RESAMPLE_TYPE = "soxr_lq"
 
 
 def check_audio_available() -> bool:
@@ -44,8 +49,9 @@ def extract_audio_from_video(video_path: str, sr: int = DEFAULT_SR) -> Tuple[Opt
         return None, sr
     
     try:
-        y, sr_actual = librosa.load(video_path, sr=sr, mono=True)
-        if len(y) == 0:
+        # mtime in the key so a re-uploaded file is decoded again
+        y, sr_actual = _load_audio_cached(video_path, sr, os.path.getmtime(video_path))
+        if y is None:
             return None, sr
         return y, sr_actual
     except Exception as e:
@@ -53,6 +59,29 @@ def extract_audio_from_video(video_path: str, sr: int = DEFAULT_SR) -> Tuple[Opt
         return None, sr
 
 
+@lru_cache(maxsize=AUDIO_CACHE_SIZE)
+def _load_audio_cached(video_path: str, sr: int, mtime: float) -> Tuple[Optional[np.ndarray], int]:
+    """Decode once per (path, sr, mtime). Returned arrays are shared, so read-only."""
+    y, sr_actual = librosa.load(video_path, sr=sr, mono=True, res_type=RESAMPLE_TYPE)
+    if len(y) == 0:
+        return None, sr
+    y.flags.writeable = False
+    return y, sr_actual
+
+
+def _fast_rms(y: np.ndarray, hop_length: int, frame_length: int = 2048) -> np.ndarray:
+    """
+    Same frames as librosa.feature.rms (centered, zero padded), computed as
+    a row-wise dot product over a strided window view. Skips librosa's
+    intermediate |x|**2 buffer.
+    """
+    pad = frame_length // 2
+    padded = np.zeros(len(y) + 2 * pad, dtype=y.dtype)
+    padded[pad:pad + len(y)] = y
+    frames = sliding_window_view(padded, frame_length)[::hop_length]
+    return np.sqrt(np.einsum('ij,ij->i', frames, frames) / frame_length)
+
+
 def extract_audio_energy(video_path: str, frame_duration: float = 0.1) -> Dict:
     """
     Extract audio energy over time from a video.
@@ -72,13 +101,17 @@ def extract_audio_energy(video_path: str, frame_duration: float = 0.1) -> Dict:
         return {'times': [], 'energy': [], 'rms': [], 'has_audio': False}
     
     y, sr = extract_audio_from_video(video_path)
-    
+    return _energy_from_audio(y, sr, frame_duration)
+
+
+def _energy_from_audio(y: Optional[np.ndarray], sr: int, frame_duration: float = 0.1) -> Dict:
+    """extract_audio_energy on an already decoded waveform."""
     if y is None or len(y) == 0:
         return {'times': [], 'energy': [], 'rms': [], 'has_audio': False}
     
     # Calculate RMS energy
     hop_length = int(sr * frame_duration)
-    rms = librosa.feature.rms(y=y, hop_length=hop_length)[0]
+    rms = _fast_rms(y, hop_length)
     
     # Normalize RMS to 0-1 range
     if rms.max() > 0:
@@ -118,52 +151,50 @@ def detect_silence_segments(video_path: str,
         return []
     
     y, sr = extract_audio_from_video(video_path)
-    
+    return _silence_from_audio(y, sr, threshold, min_duration)
+
+
+def _silence_from_audio(y: Optional[np.ndarray], sr: int,
+                        threshold: float = SILENCE_THRESHOLD,
+                        min_duration: float = MIN_SILENCE_DURATION) -> List[Dict]:
+    """detect_silence_segments on an already decoded waveform."""
     if y is None or len(y) == 0:
         return []
     
     # Calculate RMS with small hop for precision
     hop_length = int(sr * 0.05)  # 50ms frames
-    rms = librosa.feature.rms(y=y, hop_length=hop_length)[0]
+    rms = _fast_rms(y, hop_length)
     times = librosa.frames_to_time(np.arange(len(rms)), sr=sr, hop_length=hop_length)
     
-    # Find silent frames
-    is_silent = rms < threshold
+    # Find silent frames and group them into segments
+    start_times, end_times = segment_silences(rms, threshold, times, min_duration)
     
-    # Group consecutive silent frames into segments
-    silence_segments = []
-    in_silence = False
-    start_time = 0
-    
-    for i, (t, silent) in enumerate(zip(times, is_silent)):
-        if silent and not in_silence:
-            # Start of silence
-            in_silence = True
-            start_time = t
-        elif not silent and in_silence:
-            # End of silence
-            in_silence = False
-            duration = t - start_time
-            if duration >= min_duration:
-                silence_segments.append({
-                    'start_time': float(start_time),
-                    'end_time': float(t),
-                    'duration': float(duration)
-                })
-    
-    # Handle case where audio ends in silence
-    if in_silence:
-        duration = times[-1] - start_time
-        if duration >= min_duration:
-            silence_segments.append({
-                'start_time': float(start_time),
-                'end_time': float(times[-1]),
-                'duration': float(duration)
-            })
+    silence_segments = [
+        {'start_time': float(st), 'end_time': float(et), 'duration': float(et - st)}
+        for st, et in zip(start_times, end_times)
+    ]
     
     return silence_segments
 
 
+def segment_silences(rms: np.ndarray, threshold: float, times: np.ndarray,
+                     min_duration: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (start_times, end_times) of silent runs lasting >= min_duration.
+    Rising/falling edges of the padded mask mark where each run starts and stops.
+    """
+    is_silent = rms < threshold
+    edges = np.diff(np.concatenate(([False], is_silent, [False])).astype(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    # A run ending with the audio closes on the last timestamp
+    ends = np.minimum(np.flatnonzero(edges == -1), len(times) - 1)
+    
+    start_times = times[starts]
+    end_times = times[ends]
+    keep = (end_times - start_times) >= min_duration
+    return start_times[keep], end_times[keep]
+
+
 def detect_audio_peaks(video_path: str, 
                        prominence: float = 0.3,
                        min_distance_sec: float = 0.5) -> List[Dict]:
@@ -183,64 +214,68 @@ def detect_audio_peaks(video_path: str,
         return []
     
     y, sr = extract_audio_from_video(video_path)
-    
+    return _peaks_from_audio(y, sr, prominence, min_distance_sec)
+
+
+def _peaks_from_audio(y: Optional[np.ndarray], sr: int,
+                      prominence: float = 0.3,
+                      min_distance_sec: float = 0.5) -> List[Dict]:
+    """detect_audio_peaks on an already decoded waveform."""
     if y is None or len(y) == 0:
         return []
     
     peaks = []
     
     try:
+        # One mel spectrogram feeds every envelope below; onset_detect and
+        # beat_track would otherwise each recompute it from y.
+        mel_db = librosa.power_to_db(librosa.feature.melspectrogram(y=y, sr=sr, hop_length=HOP_LENGTH))
+        
         # Onset detection (works for both speech and music)
-        onset_env = librosa.onset.onset_strength(y=y, sr=sr)
+        onset_env = librosa.onset.onset_strength(S=mel_db, sr=sr, hop_length=HOP_LENGTH)
         onset_times = librosa.onset.onset_detect(
-            y=y, sr=sr, units='time',
-            backtrack=False
+            onset_envelope=onset_env, sr=sr, hop_length=HOP_LENGTH,
+            units='time', backtrack=False
         )
         
         # Get onset strengths at detected times
-        onset_frames = librosa.time_to_frames(onset_times, sr=sr)
+        onset_frames = librosa.time_to_frames(onset_times, sr=sr, hop_length=HOP_LENGTH)
+        in_range = onset_frames < len(onset_env)
+        onset_times = onset_times[in_range]
         
-        for i, (t, frame) in enumerate(zip(onset_times, onset_frames)):
-            if frame < len(onset_env):
-                strength = float(onset_env[frame])
-                # Normalize strength
-                max_strength = onset_env.max() if onset_env.max() > 0 else 1
-                norm_strength = strength / max_strength
-                
-                if norm_strength >= prominence:
-                    peaks.append({
-                        'timestamp': float(t),
-                        'strength': float(norm_strength),
-                        'type': 'onset'
-                    })
+        # Normalize strength
+        max_strength = onset_env.max() if len(onset_env) and onset_env.max() > 0 else 1
+        onset_strengths = onset_env[onset_frames[in_range]] / max_strength
+        
+        strong = onset_strengths >= prominence
+        onset_times = onset_times[strong]
+        onset_strengths = onset_strengths[strong]
         
         # Also try beat detection for music
+        beat_times = np.empty(0)
         try:
-            tempo, beat_frames = librosa.beat.beat_track(y=y, sr=sr)
-            beat_times = librosa.frames_to_time(beat_frames, sr=sr)
-            
-            for t in beat_times:
-                # Check if this beat is not already covered by an onset
-                is_new = all(abs(t - p['timestamp']) > min_distance_sec for p in peaks)
-                if is_new:
-                    peaks.append({
-                        'timestamp': float(t),
-                        'strength': 0.7,  # Default strength for beats
-                        'type': 'beat'
-                    })
+            # beat_track's own envelope uses median aggregation
+            beat_env = librosa.onset.onset_strength(S=mel_db, sr=sr, hop_length=HOP_LENGTH, aggregate=np.median)
+            tempo, beat_frames = librosa.beat.beat_track(onset_envelope=beat_env, sr=sr, hop_length=HOP_LENGTH)
+            beat_times = _new_beats(librosa.frames_to_time(beat_frames, sr=sr, hop_length=HOP_LENGTH),
+                                    onset_times, min_distance_sec)
         except Exception:
             pass  # Beat detection may fail for non-musical audio
         
-        # Sort by timestamp
-        peaks.sort(key=lambda x: x['timestamp'])
+        # Sort by timestamp (stable: onsets stay ahead of beats on ties)
+        timestamps = np.concatenate((onset_times, beat_times))
+        strengths = np.concatenate((onset_strengths, np.full(len(beat_times), 0.7)))  # Default strength for beats
+        is_onset = np.arange(len(timestamps)) < len(onset_times)
+        order = np.argsort(timestamps, kind='stable')
         
         # Filter peaks that are too close together
-        if peaks and min_distance_sec > 0:
-            filtered_peaks = [peaks[0]]
-            for p in peaks[1:]:
-                if p['timestamp'] - filtered_peaks[-1]['timestamp'] >= min_distance_sec:
-                    filtered_peaks.append(p)
-            peaks = filtered_peaks
+        if len(order) and min_distance_sec > 0:
+            order = order[_thin_sorted(timestamps[order], min_distance_sec)]
+        
+        peaks = [
+            {'timestamp': float(t), 'strength': float(st), 'type': 'onset' if onset else 'beat'}
+            for t, st, onset in zip(timestamps[order], strengths[order], is_onset[order])
+        ]
             
     except Exception as e:
         print(f"Peak detection error: {e}")
@@ -248,6 +283,40 @@ def detect_audio_peaks(video_path: str,
     return peaks
 
 
+def _new_beats(beat_times: np.ndarray, onset_times: np.ndarray, min_distance_sec: float) -> np.ndarray:
+    """Beats not already covered by an onset or an earlier kept beat (inputs sorted)."""
+    if len(beat_times) == 0:
+        return beat_times
+    
+    # Distance from each beat to its nearest onset
+    if len(onset_times):
+        idx = np.searchsorted(onset_times, beat_times)
+        left = onset_times[np.maximum(idx - 1, 0)]
+        right = onset_times[np.minimum(idx, len(onset_times) - 1)]
+        nearest = np.minimum(np.abs(beat_times - left), np.abs(beat_times - right))
+        beat_times = beat_times[nearest > min_distance_sec]
+    
+    # Beats are ascending, so the closest kept beat is always the last one
+    kept = []
+    for t in beat_times.tolist():
+        if not kept or abs(t - kept[-1]) > min_distance_sec:
+            kept.append(t)
+    return np.array(kept)
+
+
+def _thin_sorted(timestamps: np.ndarray, min_distance_sec: float) -> np.ndarray:
+    """Indices of a greedy left-to-right thinning keeping peaks >= min_distance_sec apart."""
+    ts = timestamps.tolist()
+    keep = [0]
+    last = ts[0]
+    for i in range(1, len(ts)):
+        t = ts[i]
+        if t - last >= min_distance_sec:
+            keep.append(i)
+            last = t
+    return np.array(keep, dtype=np.intp)
+
+
 def get_segment_audio_features(video_path: str, 
                                start_time: float, 
                                end_time: float) -> Dict:
@@ -285,7 +354,8 @@ def get_segment_audio_features(video_path: str,
     
     try:
         y, sr = librosa.load(video_path, sr=DEFAULT_SR, 
-                             offset=start_time, duration=duration)
+                             offset=start_time, duration=duration,
+                             res_type=RESAMPLE_TYPE)
         
         if y is None or len(y) == 0:
             return {
@@ -309,7 +379,7 @@ def get_segment_audio_features(video_path: str,
         try:
             onset_env = librosa.onset.onset_strength(y=y, sr=sr)
             peaks_in_segment = np.sum(onset_env > np.mean(onset_env) + np.std(onset_env))
-        except:
+        except Exception:
             peaks_in_segment = 0
         
         # Normalize energy (typical speech RMS is 0.01-0.1)
@@ -369,8 +439,11 @@ def analyze_full_audio(video_path: str) -> Dict:
         result['error'] = 'Librosa not available'
         return result
     
+    # Decode once and share the waveform between all analyzers
+    y, sr = extract_audio_from_video(video_path)
+    
     # Extract energy profile
-    energy_data = extract_audio_energy(video_path)
+    energy_data = _energy_from_audio(y, sr)
     result['energy_profile'] = energy_data
     result['has_audio'] = energy_data.get('has_audio', False)
     
@@ -380,10 +453,10 @@ def analyze_full_audio(video_path: str) -> Dict:
     result['duration'] = energy_data.get('duration', 0)
     
     # Detect silence
-    result['silence_segments'] = detect_silence_segments(video_path)
+    result['silence_segments'] = _silence_from_audio(y, sr)
     
     # Detect peaks
-    result['peaks'] = detect_audio_peaks(video_path)
+    result['peaks'] = _peaks_from_audio(y, sr)
     
     # Summary statistics
     total_silence = sum(s['duration'] for s in result['silence_segments'])
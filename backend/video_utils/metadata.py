@@ -1,7 +1,14 @@
 import cv2
-from moviepy.editor import VideoFileClip
+import json
 import os
+import shutil
+import subprocess
 import uuid
+from fractions import Fraction
+from typing import Optional
+
+FFPROBE_BINARY = shutil.which("ffprobe")
+FFPROBE_TIMEOUT = 30  # seconds
 
 def extract_metadata(file_path: str):
     """
@@ -15,6 +22,60 @@ def extract_metadata(file_path: str):
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
 
+    # One ffprobe call covers everything; OpenCV + MoviePy is the fallback
+    # when ffprobe is not installed or can't read the file.
+    metadata = _probe_with_ffprobe(file_path)
+    if metadata is not None:
+        return metadata
+    return _probe_with_opencv(file_path)
+
+def _parse_rate(rate: Optional[str]) -> float:
+    """ffprobe frame rate ("30000/1001") as float; 0.0 when missing."""
+    try:
+        return float(Fraction(rate))
+    except (TypeError, ValueError, ZeroDivisionError):
+        return 0.0
+
+def _probe_with_ffprobe(file_path: str) -> Optional[dict]:
+    """Read metadata with a single ffprobe process, or None if unavailable / it fails."""
+    if FFPROBE_BINARY is None:
+        return None
+    try:
+        result = subprocess.run(
+            [FFPROBE_BINARY, "-v", "error", "-print_format", "json",
+             "-show_streams", "-show_format", file_path],
+            capture_output=True, check=True, timeout=FFPROBE_TIMEOUT,
+        )
+        info = json.loads(result.stdout)
+    except (OSError, subprocess.SubprocessError, ValueError) as e:
+        print(f"Warning: ffprobe failed, falling back to OpenCV: {e}")
+        return None
+
+    streams = info.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    if video is None:
+        return None
+
+    fps = _parse_rate(video.get("avg_frame_rate")) or _parse_rate(video.get("r_frame_rate"))
+    try:
+        duration = float(info.get("format", {}).get("duration") or video.get("duration") or 0.0)
+    except ValueError:
+        duration = 0.0
+
+    return {
+        "duration": duration,
+        "fps": fps,
+        "width": int(video.get("width", 0)),
+        "height": int(video.get("height", 0)),
+        "has_audio": any(s.get("codec_type") == "audio" for s in streams)
+    }
+
+def _probe_with_opencv(file_path: str) -> dict:
+    """Fallback probe: OpenCV for video properties, MoviePy for audio."""
+    # moviepy.editor pulls in a large import tree; defer it until the first probe
+    # instead of paying for it at server startup.
+    from moviepy.editor import VideoFileClip
+
     # Use OpenCV for video properties
     cap = cv2.VideoCapture(file_path)
     if not cap.isOpened():
@@ -24,26 +85,19 @@ def extract_metadata(file_path: str):
     width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
     height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
     frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    
+    cap.release()
+
     duration = 0.0
     if fps > 0:
         duration = frame_count / fps
-    else:
-        # Fallback to MoviePy for duration if OpenCV fails
-        try:
-            temp_clip = VideoFileClip(file_path)
-            duration = temp_clip.duration
-            temp_clip.close()
-        except:
-            pass
-
-    
-    cap.release()
 
-    # Use MoviePy to check for audio
+    # Use MoviePy to check for audio (and for duration if OpenCV failed),
+    # opening the file once for both
     has_audio = False
     try:
         clip = VideoFileClip(file_path)
+        if fps <= 0:
+            duration = clip.duration
         if clip.audio is not None:
             has_audio = True
         clip.close()
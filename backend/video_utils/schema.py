@@ -1,9 +1,24 @@
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Literal, Union
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator, model_validator
+from dataclasses import dataclass
+from typing import Annotated, List, Dict, NamedTuple, Optional, Literal, Tuple, Union
+import os
+import sys
+import threading
+
+import numpy as np
+import orjson
+
+# Slots need Python 3.10+; on 3.9 the component dataclasses keep a __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 # --- CORE COMPONENTS ---
+# Transform and AudioProperties are plain slotted dataclasses: every clip
+# carries one of each. Pydantic still validates them when they arrive
+# inside a Track / TimelineProject.
 
-class Transform(BaseModel):
+@dataclass(frozen=True, **_SLOTS)
+class Transform:
     """Visual transformation properties for video/image clips."""
     scale: float = 1.0
     position_x: float = 0.0  # Normalized -1.0 to 1.0 or pixels
@@ -11,16 +26,42 @@ class Transform(BaseModel):
     rotation: float = 0.0    # Degrees
     opacity: float = 1.0
 
-class AudioProperties(BaseModel):
+@dataclass(frozen=True, **_SLOTS)
+class AudioProperties:
     """Audio specific properties."""
     volume: float = 1.0
     fade_in: float = 0.0
     fade_out: float = 0.0
     muted: bool = False
 
+# --- TRANSITIONS ---
+# A tagged union on `kind` (same names as TimelineStateManager.TRANSITION_TYPES):
+# pydantic-core picks the variant by looking the tag up, not by trying each one.
+
+@dataclass(frozen=True, **_SLOTS)
+class CutTransition:
+    """Hard cut; nothing to blend."""
+    kind: Literal['cut'] = 'cut'
+
+@dataclass(frozen=True, **_SLOTS)
+class TimedTransition:
+    """Blend or fade over `duration` seconds."""
+    kind: Literal['cross-dissolve', 'fade-in', 'fade-out', 'fade-in-out']
+    duration: float = 1.0
+
+Transition = Annotated[Union[CutTransition, TimedTransition], Field(discriminator='kind')]
+
+# Frozen, so every clip without its own transform/audio shares one instance
+# (change them with dataclasses.replace)
+DEFAULT_TRANSFORM = Transform()
+DEFAULT_AUDIO = AudioProperties()
+
 # --- CLIP DEFINITION ---
+# Also a slotted dataclass: projects hold thousands of clips, so this is where
+# the per-instance __dict__ and pydantic bookkeeping cost the most.
 
-class TimelineClip(BaseModel):
+@dataclass(**_SLOTS)
+class TimelineClip:
     """
     A single clip on the timeline.
     
@@ -29,7 +70,6 @@ class TimelineClip(BaseModel):
     """
     id: str
     asset_id: str  # Reference to the source media
-    label: str = "Clip"
     
     # Timing (Seconds)
     timeline_in: float   # Where it starts on the timeline
@@ -37,20 +77,24 @@ class TimelineClip(BaseModel):
     source_in: float     # Start point in the source file
     source_out: float    # End point in the source file
     
+    label: str = "Clip"
     speed: float = 1.0
     
     # Properties
-    transform: Transform = Field(default_factory=Transform)
-    audio: AudioProperties = Field(default_factory=AudioProperties)
-    
-    # Transitions (Optional linkage)
-    transition_in: Optional[Dict] = None
-    transition_out: Optional[Dict] = None
+    transform: Transform = DEFAULT_TRANSFORM
+    audio: AudioProperties = DEFAULT_AUDIO
+
+    def __post_init__(self):
+        # Many clips share an asset; one interned string keys the asset lookup
+        self.asset_id = sys.intern(self.asset_id)
 
 # --- TRACK DEFINITION ---
 
 class Track(BaseModel):
     """A single timeline track (layer)."""
+    # Core schema is built on first use (or by warm_up), not at import time
+    model_config = ConfigDict(defer_build=True)
+
     id: str
     type: Literal['video', 'audio', 'text', 'overlay']
     label: str = ""
@@ -62,9 +106,75 @@ class Track(BaseModel):
     muted: bool = False
     z_index: int = 0  # Layer order (0 = bottom)
 
+    # Transitions by clip id. Most clips have none, so they live here rather
+    # than as two always-validated fields on every clip.
+    transitions_in: Dict[str, Transition] = {}
+    transitions_out: Dict[str, Transition] = {}
+
+    @model_validator(mode="before")
+    @classmethod
+    def _lift_transitions(cls, data):
+        """Accept older dumps that stored transitions on the clips themselves."""
+        return _lift_clip_transitions(data) if isinstance(data, dict) else data
+
+    @field_validator("id", "type")
+    @classmethod
+    def _intern(cls, value: str) -> str:
+        """Track ids and types are compared and hashed constantly; share one string each."""
+        return sys.intern(value)
+
+    # Numeric clip fields as parallel arrays and the latest clip end; call
+    # invalidate() after edits
+    _columns: Optional["ClipColumns"] = PrivateAttr(default=None)
+    _max_out: Optional[float] = PrivateAttr(default=None)
+
+    def invalidate(self) -> None:
+        """Drop the cached clip columns after changing clips in place."""
+        self._columns = None
+        self._max_out = None
+
+    def max_out(self) -> float:
+        """Latest timeline_out on this track (0.0 when empty), cached until the next edit."""
+        end = self._max_out
+        if end is None:
+            end = self._max_out = float(self.columns().timeline_out.max(initial=0.0))
+        return end
+
+    def columns(self) -> "ClipColumns":
+        """Clip timing fields as float64 arrays (struct-of-arrays), built once per edit."""
+        cols = self._columns
+        if cols is None:
+            cols = self._columns = ClipColumns.from_clips(self.clips)
+        return cols
+
+    def clips_at(self, time: float) -> List[TimelineClip]:
+        """Clips under the playhead (timeline_in <= time < timeline_out), in list order."""
+        cols = self.columns()
+        hits = np.flatnonzero((cols.timeline_in <= time) & (time < cols.timeline_out))
+        return [self.clips[i] for i in hits]
+
+class ClipColumns(NamedTuple):
+    """Struct-of-arrays view of a track's clips, index-aligned with Track.clips."""
+    timeline_in: np.ndarray
+    timeline_out: np.ndarray
+    source_in: np.ndarray
+    source_out: np.ndarray
+    speed: np.ndarray
+
+    @classmethod
+    def from_clips(cls, clips: List[TimelineClip]) -> "ClipColumns":
+        n = len(clips)
+        return cls(*(
+            np.fromiter((getattr(c, name) for c in clips), dtype=np.float64, count=n)
+            for name in cls._fields
+        ))
+
 # --- SEQUENCE & PROJECT ---
+# Settings and asset records are internal value objects as well; only Track
+# and TimelineProject stay pydantic models.
 
-class SequenceSettings(BaseModel):
+@dataclass(frozen=True, **_SLOTS)
+class SequenceSettings:
     """Global settings for the timeline sequence."""
     width: int = 1920
     height: int = 1080
@@ -72,7 +182,8 @@ class SequenceSettings(BaseModel):
     aspect_ratio: str = "16:9"
     timecode_start: str = "00:00:00:00"
 
-class AssetMetadata(BaseModel):
+@dataclass(**_SLOTS)
+class AssetMetadata:
     """Metadata for a source file."""
     id: str
     path: str
@@ -82,26 +193,256 @@ class AssetMetadata(BaseModel):
     width: Optional[int] = None
     height: Optional[int] = None
 
+    def __post_init__(self):
+        self.id = sys.intern(self.id)
+        self.type = sys.intern(self.type)
+
+DEFAULT_SEQUENCE = SequenceSettings()
+
 class TimelineProject(BaseModel):
     """
     Root object for the CapCut-like Timeline Engine.
     """
+    model_config = ConfigDict(defer_build=True)
+
     version: str = "2.0"
     project_id: str
     created_at: str
     updated_at: str
     
-    sequence: SequenceSettings = Field(default_factory=SequenceSettings)
+    sequence: SequenceSettings = DEFAULT_SEQUENCE
     tracks: List[Track] = []
     
     # Asset Library (Map asset_id -> AssetMetadata)
     assets: Dict[str, AssetMetadata] = {}
 
-    def get_duration(self) -> float:
-        """Calculate total timeline duration based on the last clip end."""
-        max_end = 0.0
+
+    # assets as a list plus asset_id -> row, for index-based lookups in render loops
+    _asset_list: Optional[List[AssetMetadata]] = PrivateAttr(default=None)
+    _asset_rows: Dict[str, int] = PrivateAttr(default_factory=dict)
+
+    def invalidate(self) -> None:
+        """
+        Drop all cached columns after changing tracks, clips or assets in
+        place. An edit confined to one track only needs track.invalidate().
+        """
+        self._asset_list = None
         for track in self.tracks:
-            for clip in track.clips:
-                if clip.timeline_out > max_end:
-                    max_end = clip.timeline_out
-        return max_end
+            track.invalidate()
+
+    def asset_list(self) -> List[AssetMetadata]:
+        """Assets in a fixed row order (see asset_rows), built once per invalidate()."""
+        if self._asset_list is None:
+            self._asset_list = list(self.assets.values())
+            self._asset_rows = {asset_id: i for i, asset_id in enumerate(self.assets)}
+        return self._asset_list
+
+    def asset_rows(self, track: Track) -> np.ndarray:
+        """
+        Row in asset_list() for each clip on `track` (-1 if the asset is
+        missing). Resolve once per pass, then per-frame lookups are plain
+        indexing instead of a dict lookup per clip.
+        """
+        self.asset_list()
+        rows = self._asset_rows
+        return np.fromiter((rows.get(clip.asset_id, -1) for clip in track.clips),
+                           dtype=np.int32, count=len(track.clips))
+
+    def resolve_asset(self, clip: TimelineClip) -> Optional[AssetMetadata]:
+        """The asset a clip plays from, if it is in the library."""
+        return self.assets.get(clip.asset_id)
+
+    def get_duration(self) -> float:
+        """
+        Calculate total timeline duration based on the last clip end.
+        Each track caches its own max, so after a single-track edit this is
+        one reduction over that track plus a max over track count.
+        """
+        return max((track.max_out() for track in self.tracks), default=0.0)
+
+    @classmethod
+    def from_trusted(cls, data: Dict) -> "TimelineProject":
+        """
+        Rebuild a project from a dict our own code produced (model_dump, e.g.
+        a saved project file) without validation. Use model_validate for
+        anything that comes from a client.
+        """
+        values = dict(data)
+        if "sequence" in values:
+            values["sequence"] = _shared(SequenceSettings(**values["sequence"]), DEFAULT_SEQUENCE)
+        values["tracks"] = [_track_from_dict(track) for track in values.get("tracks", ())]
+        values["assets"] = {
+            asset_id: AssetMetadata(**asset)
+            for asset_id, asset in values.get("assets", {}).items()
+        }
+        return cls.model_construct(**values)
+
+def _track_from_dict(data: Dict) -> Track:
+    """Track from its model_dump dict (trusted input, no validation)."""
+    values = _lift_clip_transitions(data)
+    values["clips"] = [_clip_from_dict(c) for c in values.get("clips", ())]
+    for key in ("transitions_in", "transitions_out"):
+        if key in values:
+            values[key] = {clip_id: _transition_from_dict(t) for clip_id, t in values[key].items()}
+    return Track.model_construct(**values)
+
+def _lift_clip_transitions(data: Dict) -> Dict:
+    """
+    Track dict with legacy clip-level transition_in / transition_out moved
+    into the track's transitions_in / transitions_out maps. Entries already on
+    the track win. Returns `data` unchanged when no clip carries them.
+    """
+    clips = data.get("clips") or ()
+    if not any(isinstance(c, dict) and ("transition_in" in c or "transition_out" in c) for c in clips):
+        return dict(data)
+    values = dict(data)
+    lifted = {"transitions_in": {}, "transitions_out": {}}
+    new_clips = []
+    for clip in clips:
+        if isinstance(clip, dict) and ("transition_in" in clip or "transition_out" in clip):
+            clip = dict(clip)
+            for old_key, new_key in (("transition_in", "transitions_in"), ("transition_out", "transitions_out")):
+                transition = clip.pop(old_key, None)
+                if transition is not None:
+                    lifted[new_key][clip["id"]] = transition
+        new_clips.append(clip)
+    values["clips"] = new_clips
+    for key, found in lifted.items():
+        if found:
+            values[key] = {**found, **(values.get(key) or {})}
+    return values
+
+def _clip_from_dict(data: Dict) -> TimelineClip:
+    """TimelineClip from its model_dump dict (trusted input, no validation)."""
+    values = dict(data)
+    if values.get("transform") is not None:
+        values["transform"] = _shared(Transform(**values["transform"]), DEFAULT_TRANSFORM)
+    if values.get("audio") is not None:
+        values["audio"] = _shared(AudioProperties(**values["audio"]), DEFAULT_AUDIO)
+    return TimelineClip(**values)
+
+def _transition_from_dict(data: Dict) -> Transition:
+    """Transition variant for a dumped transition dict, picked by its kind tag."""
+    return CutTransition() if data["kind"] == "cut" else TimedTransition(**data)
+
+def _shared(value, default):
+    """Swap a value equal to the shared default for the default itself."""
+    return default if value == default else value
+
+def dump_project_json(project: TimelineProject) -> bytes:
+    """Project as compact JSON bytes, serialized in pydantic-core (no dict / json.dumps step)."""
+    return project.model_dump_json().encode()
+
+def save_project(project: TimelineProject, path: str) -> None:
+    """Write a project file; a sibling temp file is swapped in so a crash keeps the old one."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(dump_project_json(project))
+    os.replace(tmp_path, path)
+
+def load_project(path: str, assume_trusted: bool = False) -> TimelineProject:
+    """
+    Read a project file as bytes. Files we wrote ourselves can skip
+    validation (orjson parse + from_trusted); anything else is validated
+    straight from the bytes by pydantic-core.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    if assume_trusted:
+        return TimelineProject.from_trusted(orjson.loads(raw))
+    return load_project_json(raw)
+
+def load_project_json(raw: Union[bytes, str]) -> TimelineProject:
+    """
+    Parse and validate project JSON in one pass inside pydantic-core, without
+    a json.loads dict in between. For untrusted input; see from_trusted.
+    """
+    return TimelineProject.model_validate_json(raw)
+
+# --- WORKSPACE TIMELINE ---
+# The editor's workspace timeline (video_utils.timeline_manager) is a gapless
+# list of clips cut from the project's source video. It is stored as a
+# TimelineProject with one video track; a transition from a clip into the
+# next one is kept as that clip's transitions_out entry.
+
+WORKSPACE_TRACK_ID = "video-1"
+
+def project_from_workspace(timeline_data: Dict, asset: AssetMetadata) -> TimelineProject:
+    """TimelineProject for TimelineStateManager.get_timeline_data() (transitions between non-adjacent clips are dropped)."""
+    clips = []
+    position = 0.0
+    for clip in timeline_data["clips"]:
+        speed = clip.get("speed", 1.0)
+        end = position + (clip["end_seconds"] - clip["start_seconds"]) / speed
+        clips.append(TimelineClip(
+            id=clip["clip_id"],
+            asset_id=asset.id,
+            timeline_in=position,
+            timeline_out=end,
+            source_in=clip["start_seconds"],
+            source_out=clip["end_seconds"],
+            label=clip.get("label", "Clip"),
+            speed=speed,
+        ))
+        position = end
+
+    next_clip = {a.id: b.id for a, b in zip(clips, clips[1:])}
+    transitions_out = {
+        t["from_clip_id"]: CutTransition() if t["type"] == "cut" else TimedTransition(t["type"], t["duration"])
+        for t in timeline_data.get("transitions", ())
+        if next_clip.get(t["from_clip_id"]) == t["to_clip_id"]
+    }
+    settings = timeline_data.get("settings", {})
+    return TimelineProject.model_construct(
+        project_id=timeline_data["project_id"],
+        created_at=timeline_data["created_at"],
+        updated_at=timeline_data["updated_at"],
+        sequence=_shared(SequenceSettings(
+            width=settings.get("width", DEFAULT_SEQUENCE.width),
+            height=settings.get("height", DEFAULT_SEQUENCE.height),
+            fps=settings.get("fps", DEFAULT_SEQUENCE.fps),
+        ), DEFAULT_SEQUENCE),
+        tracks=[Track.model_construct(
+            id=WORKSPACE_TRACK_ID, type="video", label="Video",
+            clips=clips, transitions_out=transitions_out,
+        )],
+        assets={asset.id: asset},
+    )
+
+def workspace_clips(project: TimelineProject) -> Tuple[List[Dict], List[Tuple[int, Transition]]]:
+    """
+    Inverse of project_from_workspace: clip dicts for TimelineStateManager.add_clips
+    (first video track, in order) and (index, transition) pairs for transitions
+    from clip `index` into the next clip.
+    """
+    track = next((t for t in project.tracks if t.type == "video"), None)
+    if track is None:
+        return [], []
+    clips = []
+    for clip in track.clips:
+        asset = project.resolve_asset(clip)
+        clips.append({
+            "source_video": clip.asset_id,
+            "source_filename": asset.filename if asset is not None else "",
+            "start_seconds": clip.source_in,
+            "end_seconds": clip.source_out,
+            "speed": clip.speed,
+            "label": clip.label,
+        })
+    transitions = [
+        (i, track.transitions_out[clip.id])
+        for i, clip in enumerate(track.clips[:-1])
+        if clip.id in track.transitions_out
+    ]
+    return clips, transitions
+
+def warm_up() -> None:
+    """Build the deferred validators/serializers now instead of on the first project load."""
+    Track.model_rebuild(force=True)
+    TimelineProject.model_rebuild(force=True)
+
+def warm_up_in_background() -> threading.Thread:
+    """Run warm_up() on a daemon thread, e.g. from an app startup hook."""
+    thread = threading.Thread(target=warm_up, name="schema-warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,30 @@
+import os
+from typing import Dict, Optional
+
+# Uploaded files are named "<video_id><ext>", so index them by id per storage
+# directory. An index is rebuilt from a single directory scan only when an id
+# is missing, so range requests don't rescan storage on every chunk.
+_video_path_index: Dict[str, Dict[str, str]] = {}
+
+def find_video_path(video_id: str, video_dir: str) -> Optional[str]:
+    """Find the stored video file for a project/video id in video_dir."""
+    index = _video_path_index.setdefault(video_dir, {})
+    path = index.get(video_id)
+    if path and os.path.exists(path):
+        return path
+
+    if not os.path.exists(video_dir):
+        return None
+
+    index.clear()
+    for f in os.listdir(video_dir):
+        index.setdefault(os.path.splitext(f)[0], os.path.join(video_dir, f))
+
+    path = index.get(video_id)
+    if path:
+        return path
+    # Legacy ids that are only a prefix of the stored filename
+    for stem, candidate in index.items():
+        if stem.startswith(video_id):
+            return candidate
+    return None
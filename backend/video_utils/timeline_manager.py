@@ -3,31 +3,102 @@ Timeline State Manager for CUTLAB AI Workspace
 Manages timeline data for manual video editing.
 """
 
-import json
 import os
+import queue
+import sys
+import threading
+from contextlib import contextmanager
+from functools import wraps
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+import numpy as np
+import orjson
+
+# Optional: msgpack snapshots (opt in with TIMELINE_FORMAT=msgpack)
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# Edit-log records written between full snapshots
+SNAPSHOT_EVERY = 50
+
+# On-disk snapshot format: "json" (default) or "msgpack"; the edit log is always JSON lines
+TIMELINE_FORMAT = os.getenv("TIMELINE_FORMAT", "json").lower()
+USE_MSGPACK = TIMELINE_FORMAT == "msgpack" and MSGPACK_AVAILABLE
+
+# Compact output, one record per line; numpy scalars are accepted like plain floats
+ORJSON_OPTS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY
+
+# Clip fields derived from start/end seconds; added to clips on read, never stored
+DERIVED_CLIP_FIELDS = ("start_formatted", "end_formatted", "duration_seconds", "duration_formatted")
+
+
+def _new_id(prefix: str) -> str:
+    """prefix_ + 12 random hex chars straight from os.urandom (no UUID object to build and format)."""
+    return f"{prefix}_{os.urandom(6).hex()}"
+
+
+def _locked(method):
+    """Run a mutator under the manager's lock so the writer never sees a half-applied edit."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class TimelineStateManager:
     """
     Manages timeline state for the workspace.
     Stores timeline clips and their properties.
+    
+    Edits are appended to a small log (<timeline>.json.wal, one JSON record
+    per line) instead of rewriting the whole file; the full snapshot is
+    rewritten every SNAPSHOT_EVERY records or on an explicit save().
+    Disk writes happen on a background thread; call flush() to wait for them.
     """
     
+    # Valid transition types (ordered for display; the frozenset is for membership checks)
+    TRANSITION_TYPE_NAMES = ("cut", "cross-dissolve", "fade-in", "fade-out", "fade-in-out")
+    TRANSITION_TYPES = frozenset(TRANSITION_TYPE_NAMES)
+    
     def __init__(self, project_id: str, storage_dir: str = "storage/timelines"):
         self.project_id = project_id
         self.storage_dir = storage_dir
-        self.timeline_file = os.path.join(storage_dir, f"{project_id}_timeline.json")
+        base = os.path.join(storage_dir, f"{project_id}_timeline")
+        self.timeline_file = base + (".msgpack" if USE_MSGPACK else ".json")
+        # The other format's snapshot, read if it is the newer one (format switched)
+        self._alt_timeline_file = base + (".json" if USE_MSGPACK else ".msgpack")
+        self.wal_file = base + ".json.wal"
+        self._wal_seq = 0       # Sequence number of the last applied record
+        self._wal_pending = 0   # Records in the log since the last snapshot
+        self._log_buffer: List[bytes] = []  # Encoded records not yet written
+        self._snapshot_due = False
+        self._snapshot_hash: Optional[int] = None  # hash() of the snapshot bytes on disk
+        self._batch_depth = 0
+        self._lock = threading.RLock()       # Guards timeline_data and the buffer
+        self._io_lock = threading.Lock()     # Serializes writes to the files
+        
+        # Lookup indexes mirroring timeline_data["clips"] / ["transitions"]
+        self._clip_index: Dict[str, Dict] = {}
+        self._transition_index: Dict[tuple, Dict] = {}
+        self._transitions_from: Dict[str, List[Dict]] = {}
+        
+        # Set by edits that change clip timing or membership
+        self._duration_dirty = True
         
         # Ensure storage directory exists
         os.makedirs(storage_dir, exist_ok=True)
         
         # Timeline data structure
+        now_iso = datetime.now().isoformat()
         self.timeline_data = {
             "project_id": project_id,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
+            "created_at": now_iso,
+            "updated_at": now_iso,
             "clips": [],  # List of clips on timeline
             "transitions": [],  # List of transitions between clips
             "duration": 0.0,  # Total timeline duration
@@ -38,43 +109,401 @@ class TimelineStateManager:
             }
         }
         
-        # Valid transition types
-        self.TRANSITION_TYPES = ["cut", "cross-dissolve", "fade-in", "fade-out", "fade-in-out"]
-        
         # Load existing data if available
         self.load()
     
     def load(self) -> bool:
-        """Load timeline state from file."""
+        """Load timeline state from the snapshot file, then replay the edit log."""
+        loaded = False
         try:
-            if os.path.exists(self.timeline_file):
-                with open(self.timeline_file, 'r') as f:
-                    self.timeline_data = json.load(f)
-                return True
+            existing = [p for p in (self.timeline_file, self._alt_timeline_file) if os.path.exists(p)]
+            if existing:
+                path = max(existing, key=os.path.getmtime)
+                with open(path, 'rb') as f:
+                    raw = f.read()
+                self.timeline_data = self._unpack_sources(self._decode_snapshot(path, raw))
+                if path == self.timeline_file:
+                    self._snapshot_hash = hash(raw)
+                # Older files stored the derived fields on every clip
+                clips = self.timeline_data["clips"]
+                for clip in clips:
+                    for key in DERIVED_CLIP_FIELDS:
+                        clip.pop(key, None)
+                # Edits keep the list in position order; make sure older files start that way
+                if any(a.get("position", 0) > b.get("position", 0) for a, b in zip(clips, clips[1:])):
+                    clips.sort(key=lambda x: x.get("position", 0))
+                loaded = True
         except Exception as e:
             print(f"Failed to load timeline: {e}")
-        return False
+        
+        # Records up to this sequence number are already in the snapshot
+        self._wal_seq = self.timeline_data.pop("wal_seq", 0)
+        self._rebuild_index()
+        self._duration_dirty = True
+        return self._replay_wal() or loaded
+    
+    @staticmethod
+    def _encode_snapshot(data: Dict) -> bytes:
+        if USE_MSGPACK:
+            # numpy scalars are written as plain numbers, as with orjson
+            return msgpack.packb(data, use_bin_type=True, default=lambda o: o.item())
+        return orjson.dumps(data, option=ORJSON_OPTS)
+    
+    @staticmethod
+    def _decode_snapshot(path: str, raw: bytes) -> Dict:
+        if path.endswith(".msgpack"):
+            return msgpack.unpackb(raw, raw=False)
+        return orjson.loads(raw)
+    
+    @staticmethod
+    def _pack_sources(data: Dict) -> Dict:
+        """
+        Snapshot layout: each distinct (source_video, source_filename) pair is
+        stored once in a "sources" table and clips refer to it by index.
+        """
+        sources = []
+        lookup = {}
+        clips = []
+        for clip in data["clips"]:
+            key = (clip.get("source_video", ""), clip.get("source_filename", ""))
+            idx = lookup.get(key)
+            if idx is None:
+                idx = lookup[key] = len(sources)
+                sources.append(key)
+            packed = {k: v for k, v in clip.items() if k not in ("source_video", "source_filename")}
+            packed["src"] = idx
+            clips.append(packed)
+        return {**data, "clips": clips, "sources": sources}
+    
+    @staticmethod
+    def _unpack_sources(data: Dict) -> Dict:
+        """Inverse of _pack_sources; older snapshots without a table are interned in place."""
+        sources = data.pop("sources", None)
+        if sources is None:
+            for clip in data["clips"]:
+                clip["source_video"] = sys.intern(clip.get("source_video", ""))
+                clip["source_filename"] = sys.intern(clip.get("source_filename", ""))
+            return data
+        
+        table = [(sys.intern(video), sys.intern(filename)) for video, filename in sources]
+        clips = []
+        for clip in data["clips"]:
+            video, filename = table[clip.pop("src")]
+            clips.append({
+                "clip_id": clip.pop("clip_id"),
+                "source_video": video,
+                "source_filename": filename,
+                **clip,
+            })
+        data["clips"] = clips
+        return data
     
-    def save(self) -> bool:
-        """Save timeline state to file."""
+    def _rebuild_index(self):
+        """Rebuild the clip and transition lookup dicts from timeline_data."""
+        # Iterate in reverse so the first entry wins on duplicate ids, like a scan would
+        self._clip_index = {c["clip_id"]: c for c in reversed(self.timeline_data["clips"])}
+        transitions = self.timeline_data.get("transitions", [])
+        self._transition_index = {
+            (t["from_clip_id"], t["to_clip_id"]): t for t in reversed(transitions)
+        }
+        self._transitions_from = {}
+        for t in transitions:
+            self._transitions_from.setdefault(t["from_clip_id"], []).append(t)
+    
+    def _clip_list_index(self, clip: Dict) -> int:
+        """Index of a clip dict in the clips list (positions normally match)."""
+        clips = self.timeline_data["clips"]
+        i = clip.get("position", -1)
+        if 0 <= i < len(clips) and clips[i] is clip:
+            return i
+        return next(j for j, c in enumerate(clips) if c is clip)
+    
+    def save(self, op: Optional[str] = None, payload: Any = None,
+             now_iso: Optional[str] = None) -> bool:
+        """
+        Persist timeline state.
+        With an op, log one edit record; without one (or once SNAPSHOT_EVERY
+        records have piled up) rewrite the full snapshot and empty the log.
+        Mutators pass the timestamp they already computed. The write itself
+        is queued for the background writer.
+        """
         try:
-            self.timeline_data["updated_at"] = datetime.now().isoformat()
-            self._recalculate_duration()
-            with open(self.timeline_file, 'w') as f:
-                json.dump(self.timeline_data, f, indent=2)
+            with self._lock:
+                if op is None:
+                    # A checkpoint isn't an edit, so updated_at stays put
+                    self._snapshot_due = True
+                else:
+                    now = now_iso or datetime.now().isoformat()
+                    self.timeline_data["updated_at"] = now
+                    self._wal_seq += 1
+                    record = {"seq": self._wal_seq, "op": op, "p": payload, "t": now}
+                    self._log_buffer.append(orjson.dumps(record, option=ORJSON_OPTS))
+                if self._batch_depth:
+                    return True  # Queued when the outermost batch exits
+                self._recalculate_duration()
+            _schedule_write(self)
+            return True
+        except Exception as e:
+            print(f"Failed to save timeline: {e}")
+            return False
+    
+    def flush(self) -> bool:
+        """Write any pending edits now, on the calling thread."""
+        try:
+            self._write_pending()
             return True
         except Exception as e:
             print(f"Failed to save timeline: {e}")
             return False
     
+    def _write_pending(self):
+        """Write buffered log records, or a full snapshot when one is due."""
+        with self._io_lock:
+            # Take the buffer and encode the snapshot under the lock, so the
+            # snapshot's wal_seq matches exactly the edits it contains
+            with self._lock:
+                records, self._log_buffer = self._log_buffer, []
+                pending = self._wal_pending + len(records)
+                # A fresh project needs a base snapshot before records can apply
+                snapshot = (self._snapshot_due or pending > SNAPSHOT_EVERY
+                            or not os.path.exists(self.timeline_file))
+                if snapshot:
+                    data = self._encode_snapshot(self._pack_sources({**self.timeline_data, "wal_seq": self._wal_seq}))
+                    self._snapshot_due = False
+            
+            try:
+                if snapshot:
+                    data_hash = hash(data)
+                    if data_hash == self._snapshot_hash and pending == 0:
+                        return  # Identical to what's on disk and nothing logged since
+                    # Write a sibling file and swap it in, so a crash mid-write
+                    # leaves the previous snapshot intact
+                    tmp_file = self.timeline_file + ".tmp"
+                    with open(tmp_file, 'wb') as f:
+                        f.write(data)
+                    os.replace(tmp_file, self.timeline_file)
+                    self._snapshot_hash = data_hash
+                    # The snapshot covers every logged record; a crash before this
+                    # truncate is harmless since replay skips seq <= wal_seq.
+                    if pending:
+                        open(self.wal_file, 'w').close()
+                    self._wal_pending = 0
+                elif records:
+                    with open(self.wal_file, 'ab') as f:
+                        f.write(b"".join(records))
+                    self._wal_pending = pending
+            except Exception:
+                # Records may be lost or half-written; the next write rewrites everything
+                with self._lock:
+                    self._snapshot_due = True
+                raise
+    
+    @contextmanager
+    def batch(self):
+        """
+        Group several edits into one write.
+        
+            with manager.batch():
+                manager.add_clip(...)
+                manager.set_speed(...)
+        
+        Edits inside the block still log their records, but nothing is
+        queued for writing until the outermost block exits.
+        """
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth and (self._log_buffer or self._snapshot_due):
+                    self._recalculate_duration()
+                    _schedule_write(self)
+    
+    def _replay_wal(self) -> bool:
+        """Apply logged edits newer than the snapshot. Returns True if any were applied."""
+        if not os.path.exists(self.wal_file):
+            return False
+        
+        replayed = 0
+        torn = False
+        try:
+            with open(self.wal_file, 'rb') as f:
+                for line in f:
+                    try:
+                        record = orjson.loads(line)
+                    except ValueError:
+                        torn = True  # Partial write from a crash; nothing valid follows
+                        break
+                    self._wal_pending += 1
+                    if record["seq"] <= self._wal_seq:
+                        continue
+                    self._WAL_HANDLERS[record["op"]](self, record["p"])
+                    self._wal_seq = record["seq"]
+                    self.timeline_data["updated_at"] = record["t"]
+                    replayed += 1
+        except Exception as e:
+            print(f"Failed to replay timeline log: {e}")
+        
+        if replayed:
+            self._recalculate_duration()
+        if torn:
+            # Compact now so later appends don't land after the torn line
+            self.save()
+        return replayed > 0
+    
+    # --- Edit-log handlers (also used by the mutators below) ---
+    
+    def _apply_add_clip(self, clip: Dict):
+        self.timeline_data["clips"].append(clip)
+        self._duration_dirty = True
+        self._clip_index.setdefault(clip["clip_id"], clip)
+    
+    def _apply_put_clip(self, clip: Dict):
+        current = self._clip_index.get(clip["clip_id"])
+        if current is None or current is clip:
+            return
+        self.timeline_data["clips"][self._clip_list_index(current)] = clip
+        self._clip_index[clip["clip_id"]] = clip
+        self._duration_dirty = True
+    
+    def _make_clip(self, clip_id: str, source_video: str, source_filename: str,
+                   start_seconds: float, end_seconds: float, speed: float,
+                   label: str, position: int, added_at: str) -> Dict:
+        """Build a stored clip dict."""
+        return {
+            "clip_id": clip_id,
+            "source_video": source_video,
+            "source_filename": source_filename,
+            "start_seconds": start_seconds,
+            "end_seconds": end_seconds,
+            "speed": speed,
+            "label": label,
+            "position": position,  # Position in timeline
+            "added_at": added_at
+        }
+    
+    def _apply_remove_clip(self, clip_id: str):
+        removed = self._clip_index.pop(clip_id, None)
+        if removed is None:
+            return
+        
+        # Drop the clip in place; only the clips after it change position
+        clips = self.timeline_data["clips"]
+        i = self._clip_list_index(removed)
+        del clips[i]
+        for j in range(i, len(clips)):
+            clips[j]["position"] = j
+        self._duration_dirty = True
+    
+    def _apply_remove_clips(self, clip_ids: List[str]):
+        popped = [self._clip_index.pop(clip_id, None) for clip_id in clip_ids]
+        removed = {c["clip_id"] for c in popped if c is not None}
+        if not removed:
+            return
+        
+        kept = []
+        for clip in self.timeline_data["clips"]:
+            if clip["clip_id"] not in removed:
+                clip["position"] = len(kept)
+                kept.append(clip)
+        self.timeline_data["clips"] = kept
+        self._duration_dirty = True
+    
+    def _apply_split_clip(self, payload: Dict):
+        original = self._clip_index.pop(payload["clip_id"], None)
+        if original is None:
+            return
+        clips = self.timeline_data["clips"]
+        i = self._clip_list_index(original)
+        clips[i:i + 1] = payload["clips"]
+        for clip in payload["clips"]:
+            self._clip_index.setdefault(clip["clip_id"], clip)
+        
+        # Reorder positions
+        for j in range(i, len(clips)):
+            clips[j]["position"] = j
+        self._duration_dirty = True
+    
+    def _apply_reorder_clips(self, clip_order: List[str]):
+        # Rewrite the list in place; unknown ids are skipped and clips
+        # missing from clip_order drop off the end
+        clip_map = self._clip_index
+        clips = self.timeline_data["clips"]
+        original_len = len(clips)
+        n = 0
+        for clip_id in clip_order:
+            clip = clip_map.get(clip_id)
+            if clip is not None:
+                clip["position"] = n
+                if n < original_len:
+                    clips[n] = clip
+                else:
+                    clips.append(clip)
+                n += 1
+        
+        if n != original_len:
+            del clips[n:]
+            self._rebuild_index()
+            self._duration_dirty = True
+    
+    def _apply_clear_timeline(self, _payload=None):
+        self.timeline_data["clips"] = []
+        self.timeline_data["transitions"] = []
+        self.timeline_data["duration"] = 0.0
+        self._rebuild_index()
+        self._duration_dirty = True
+    
+    def _apply_set_transition(self, transition: Dict):
+        transitions = self.timeline_data.setdefault("transitions", [])
+        key = (transition["from_clip_id"], transition["to_clip_id"])
+        current = self._transition_index.get(key)
+        if current is transition:
+            return
+        if current is None:
+            transitions.append(transition)
+            self._transitions_from.setdefault(key[0], []).append(transition)
+        else:
+            transitions[next(i for i, t in enumerate(transitions) if t is current)] = transition
+            siblings = self._transitions_from[key[0]]
+            siblings[next(i for i, t in enumerate(siblings) if t is current)] = transition
+        self._transition_index[key] = transition
+    
+    def _apply_remove_transition(self, payload: Dict):
+        key = (payload["from_clip_id"], payload["to_clip_id"])
+        removed = self._transition_index.pop(key, None)
+        if removed is None:
+            return
+        transitions = self.timeline_data["transitions"]
+        transitions.pop(next(i for i, t in enumerate(transitions) if t is removed))
+        siblings = self._transitions_from[key[0]]
+        siblings.pop(next(i for i, t in enumerate(siblings) if t is removed))
+        if not siblings:
+            del self._transitions_from[key[0]]
+    
+    _WAL_HANDLERS = {
+        "add_clip": _apply_add_clip,
+        "put_clip": _apply_put_clip,
+        "remove_clip": _apply_remove_clip,
+        "remove_clips": _apply_remove_clips,
+        "split_clip": _apply_split_clip,
+        "reorder_clips": _apply_reorder_clips,
+        "clear_timeline": _apply_clear_timeline,
+        "set_transition": _apply_set_transition,
+        "remove_transition": _apply_remove_transition,
+    }
+    
     def _recalculate_duration(self):
-        """Recalculate total timeline duration."""
+        """Recalculate total timeline duration, if an edit since the last call affected it."""
+        if not self._duration_dirty:
+            return
         total = 0.0
         for clip in self.timeline_data["clips"]:
-            clip_duration = (clip["end_seconds"] - clip["start_seconds"]) / clip.get("speed", 1.0)
-            total += clip_duration
+            total += (clip["end_seconds"] - clip["start_seconds"]) / clip.get("speed", 1.0)
         self.timeline_data["duration"] = total
+        self._duration_dirty = False
     
+    @_locked
     def add_clip(self, clip_data: Dict) -> Dict:
         """
         Add a clip to the timeline.
@@ -86,71 +515,86 @@ class TimelineStateManager:
         - speed: playback speed (default 1.0)
         - label: optional label for the clip
         """
-        clip_id = f"clip_{len(self.timeline_data['clips']) + 1}_{int(datetime.now().timestamp())}"
-        
-        clip = {
-            "clip_id": clip_id,
-            "source_video": clip_data.get("source_video", ""),
-            "source_filename": clip_data.get("source_filename", ""),
-            "start_seconds": clip_data.get("start_seconds", 0.0),
-            "end_seconds": clip_data.get("end_seconds", 0.0),
-            "speed": clip_data.get("speed", 1.0),
-            "label": clip_data.get("label", f"Clip {len(self.timeline_data['clips']) + 1}"),
-            "position": len(self.timeline_data["clips"]),  # Position in timeline
-            "added_at": datetime.now().isoformat()
-        }
-        
-        # Calculate formatted times
-        clip["start_formatted"] = self._format_time(clip["start_seconds"])
-        clip["end_formatted"] = self._format_time(clip["end_seconds"])
-        clip["duration_seconds"] = clip["end_seconds"] - clip["start_seconds"]
-        clip["duration_formatted"] = self._format_time(clip["duration_seconds"])
-        
-        self.timeline_data["clips"].append(clip)
-        self.save()
-        
-        return clip
+        now_iso = datetime.now().isoformat()
+        clip_id = _new_id("clip")
+        
+        clip = self._make_clip(
+            clip_id,
+            sys.intern(clip_data.get("source_video", "")),
+            sys.intern(clip_data.get("source_filename", "")),
+            clip_data.get("start_seconds", 0.0),
+            clip_data.get("end_seconds", 0.0),
+            clip_data.get("speed", 1.0),
+            clip_data.get("label", f"Clip {len(self.timeline_data['clips']) + 1}"),
+            len(self.timeline_data["clips"]),
+            now_iso
+        )
+        
+        self._apply_add_clip(clip)
+        self.save("add_clip", clip, now_iso)
+        
+        return self._clip_view(clip)
     
+    @_locked
     def remove_clip(self, clip_id: str) -> bool:
         """Remove a clip from the timeline."""
-        original_len = len(self.timeline_data["clips"])
-        self.timeline_data["clips"] = [
-            c for c in self.timeline_data["clips"] if c["clip_id"] != clip_id
-        ]
-        
-        # Reorder positions
-        for i, clip in enumerate(self.timeline_data["clips"]):
-            clip["position"] = i
+        if clip_id not in self._clip_index:
+            return False
         
-        if len(self.timeline_data["clips"]) < original_len:
-            self.save()
-            return True
-        return False
+        self._apply_remove_clip(clip_id)
+        self.save("remove_clip", clip_id)
+        return True
+    
+    def add_clips(self, clip_data_list: List[Dict]) -> List[Dict]:
+        """Add several clips with a single write. Returns the new clips in order."""
+        with self.batch():
+            return [self.add_clip(clip_data) for clip_data in clip_data_list]
+    
+    @_locked
+    def remove_clips(self, clip_ids: List[str]) -> int:
+        """Remove several clips in one pass. Returns how many were removed."""
+        present = [clip_id for clip_id in dict.fromkeys(clip_ids) if clip_id in self._clip_index]
+        if not present:
+            return 0
+        
+        self._apply_remove_clips(present)
+        self.save("remove_clips", present)
+        return len(present)
+    
+    def update_clips(self, updates: List[Dict]) -> List[Optional[Dict]]:
+        """
+        Update several clips with a single write.
+        Each entry holds a clip_id plus the fields accepted by update_clip.
+        """
+        with self.batch():
+            return [self.update_clip(u["clip_id"], u) for u in updates]
     
+    @_locked
     def update_clip(self, clip_id: str, updates: Dict) -> Optional[Dict]:
         """Update a clip's properties."""
-        for clip in self.timeline_data["clips"]:
-            if clip["clip_id"] == clip_id:
-                # Update allowed fields
-                if "start_seconds" in updates:
-                    clip["start_seconds"] = updates["start_seconds"]
-                    clip["start_formatted"] = self._format_time(updates["start_seconds"])
-                if "end_seconds" in updates:
-                    clip["end_seconds"] = updates["end_seconds"]
-                    clip["end_formatted"] = self._format_time(updates["end_seconds"])
-                if "speed" in updates:
-                    clip["speed"] = max(0.1, min(4.0, updates["speed"]))
-                if "label" in updates:
-                    clip["label"] = updates["label"]
-                
-                # Recalculate duration
-                clip["duration_seconds"] = clip["end_seconds"] - clip["start_seconds"]
-                clip["duration_formatted"] = self._format_time(clip["duration_seconds"])
-                
-                self.save()
-                return clip
-        return None
+        clip = self._clip_index.get(clip_id)
+        if clip is None:
+            return None
+        
+        before = (clip["start_seconds"], clip["end_seconds"], clip["speed"], clip["label"])
+        
+        # Update allowed fields
+        if "start_seconds" in updates:
+            clip["start_seconds"] = updates["start_seconds"]
+        if "end_seconds" in updates:
+            clip["end_seconds"] = updates["end_seconds"]
+        if "speed" in updates:
+            clip["speed"] = max(0.1, min(4.0, updates["speed"]))
+        if "label" in updates:
+            clip["label"] = updates["label"]
+        
+        if (clip["start_seconds"], clip["end_seconds"], clip["speed"]) != before[:3]:
+            self._duration_dirty = True
+        if (clip["start_seconds"], clip["end_seconds"], clip["speed"], clip["label"]) != before:
+            self.save("put_clip", clip)
+        return self._clip_view(clip)
     
+    @_locked
     def split_clip(self, clip_id: str, split_position: float) -> Optional[List[Dict]]:
         """
         Split a clip at the given position.
@@ -162,15 +606,7 @@ class TimelineStateManager:
         Returns:
             List of two new clips, or None if split failed
         """
-        clip_idx = None
-        original_clip = None
-        
-        for i, clip in enumerate(self.timeline_data["clips"]):
-            if clip["clip_id"] == clip_id:
-                clip_idx = i
-                original_clip = clip.copy()
-                break
-        
+        original_clip = self._clip_index.get(clip_id)
         if original_clip is None:
             return None
         
@@ -178,54 +614,44 @@ class TimelineStateManager:
         if split_position <= original_clip["start_seconds"] or split_position >= original_clip["end_seconds"]:
             return None  # Split position must be within clip bounds
         
+        now_iso = datetime.now().isoformat()
+        
         # Create first clip (before split)
-        clip1_id = f"clip_{len(self.timeline_data['clips']) + 1}_{int(datetime.now().timestamp())}"
-        clip1 = {
-            "clip_id": clip1_id,
-            "source_video": original_clip["source_video"],
-            "source_filename": original_clip["source_filename"],
-            "start_seconds": original_clip["start_seconds"],
-            "end_seconds": split_position,
-            "speed": original_clip["speed"],
-            "label": f"{original_clip['label']} (1)",
-            "position": original_clip["position"],
-            "added_at": datetime.now().isoformat()
-        }
-        clip1["start_formatted"] = self._format_time(clip1["start_seconds"])
-        clip1["end_formatted"] = self._format_time(clip1["end_seconds"])
-        clip1["duration_seconds"] = clip1["end_seconds"] - clip1["start_seconds"]
-        clip1["duration_formatted"] = self._format_time(clip1["duration_seconds"])
+        clip1_id = _new_id("clip")
+        clip1 = self._make_clip(
+            clip1_id,
+            original_clip["source_video"],
+            original_clip["source_filename"],
+            original_clip["start_seconds"],
+            split_position,
+            original_clip["speed"],
+            f"{original_clip['label']} (1)",
+            original_clip["position"],
+            now_iso
+        )
         
         # Create second clip (after split)
-        clip2_id = f"clip_{len(self.timeline_data['clips']) + 2}_{int(datetime.now().timestamp()) + 1}"
-        clip2 = {
-            "clip_id": clip2_id,
-            "source_video": original_clip["source_video"],
-            "source_filename": original_clip["source_filename"],
-            "start_seconds": split_position,
-            "end_seconds": original_clip["end_seconds"],
-            "speed": original_clip["speed"],
-            "label": f"{original_clip['label']} (2)",
-            "position": original_clip["position"] + 1,
-            "added_at": datetime.now().isoformat()
-        }
-        clip2["start_formatted"] = self._format_time(clip2["start_seconds"])
-        clip2["end_formatted"] = self._format_time(clip2["end_seconds"])
-        clip2["duration_seconds"] = clip2["end_seconds"] - clip2["start_seconds"]
-        clip2["duration_formatted"] = self._format_time(clip2["duration_seconds"])
+        clip2_id = _new_id("clip")
+        clip2 = self._make_clip(
+            clip2_id,
+            original_clip["source_video"],
+            original_clip["source_filename"],
+            split_position,
+            original_clip["end_seconds"],
+            original_clip["speed"],
+            f"{original_clip['label']} (2)",
+            original_clip["position"] + 1,
+            now_iso
+        )
         
         # Remove original clip and insert new clips
-        self.timeline_data["clips"].pop(clip_idx)
-        self.timeline_data["clips"].insert(clip_idx, clip1)
-        self.timeline_data["clips"].insert(clip_idx + 1, clip2)
-        
-        # Reorder positions
-        for i, clip in enumerate(self.timeline_data["clips"]):
-            clip["position"] = i
+        payload = {"clip_id": clip_id, "clips": [clip1, clip2]}
+        self._apply_split_clip(payload)
         
-        self.save()
-        return [clip1, clip2]
+        self.save("split_clip", payload, now_iso)
+        return self._clip_views([clip1, clip2])
     
+    @_locked
     def trim_in(self, clip_id: str, new_start: float) -> Optional[Dict]:
         """
         Trim the in-point (start) of a clip.
@@ -237,23 +663,23 @@ class TimelineStateManager:
         Returns:
             Updated clip or None
         """
-        for clip in self.timeline_data["clips"]:
-            if clip["clip_id"] == clip_id:
-                # Validate: new start must be before current end
-                if new_start >= clip["end_seconds"]:
-                    return None
-                if new_start < 0:
-                    new_start = 0
-                
-                clip["start_seconds"] = new_start
-                clip["start_formatted"] = self._format_time(new_start)
-                clip["duration_seconds"] = clip["end_seconds"] - clip["start_seconds"]
-                clip["duration_formatted"] = self._format_time(clip["duration_seconds"])
-                
-                self.save()
-                return clip
-        return None
+        clip = self._clip_index.get(clip_id)
+        if clip is None:
+            return None
+        
+        # Validate: new start must be before current end
+        if new_start >= clip["end_seconds"]:
+            return None
+        if new_start < 0:
+            new_start = 0
+        
+        if new_start != clip["start_seconds"]:
+            clip["start_seconds"] = new_start
+            self._duration_dirty = True
+            self.save("put_clip", clip)
+        return self._clip_view(clip)
     
+    @_locked
     def trim_out(self, clip_id: str, new_end: float) -> Optional[Dict]:
         """
         Trim the out-point (end) of a clip.
@@ -265,21 +691,21 @@ class TimelineStateManager:
         Returns:
             Updated clip or None
         """
-        for clip in self.timeline_data["clips"]:
-            if clip["clip_id"] == clip_id:
-                # Validate: new end must be after current start
-                if new_end <= clip["start_seconds"]:
-                    return None
-                
-                clip["end_seconds"] = new_end
-                clip["end_formatted"] = self._format_time(new_end)
-                clip["duration_seconds"] = clip["end_seconds"] - clip["start_seconds"]
-                clip["duration_formatted"] = self._format_time(clip["duration_seconds"])
-                
-                self.save()
-                return clip
-        return None
+        clip = self._clip_index.get(clip_id)
+        if clip is None:
+            return None
+        
+        # Validate: new end must be after current start
+        if new_end <= clip["start_seconds"]:
+            return None
+        
+        if new_end != clip["end_seconds"]:
+            clip["end_seconds"] = new_end
+            self._duration_dirty = True
+            self.save("put_clip", clip)
+        return self._clip_view(clip)
     
+    @_locked
     def set_speed(self, clip_id: str, speed: float) -> Optional[Dict]:
         """
         Set the playback speed of a clip.
@@ -294,59 +720,81 @@ class TimelineStateManager:
         # Clamp speed to valid range
         speed = max(0.25, min(4.0, speed))
         
-        for clip in self.timeline_data["clips"]:
-            if clip["clip_id"] == clip_id:
-                clip["speed"] = speed
-                self.save()
-                return clip
-        return None
+        clip = self._clip_index.get(clip_id)
+        if clip is None:
+            return None
+        
+        if speed != clip["speed"]:
+            clip["speed"] = speed
+            self._duration_dirty = True
+            self.save("put_clip", clip)
+        return self._clip_view(clip)
     
     def get_clip(self, clip_id: str) -> Optional[Dict]:
         """Get a single clip by ID."""
-        for clip in self.timeline_data["clips"]:
-            if clip["clip_id"] == clip_id:
-                return clip
-        return None
+        clip = self._clip_index.get(clip_id)
+        return self._clip_view(clip) if clip is not None else None
 
+    @_locked
     def reorder_clips(self, clip_order: List[str]) -> bool:
         """Reorder clips based on list of clip_ids."""
-        try:
-            clip_map = {c["clip_id"]: c for c in self.timeline_data["clips"]}
-            new_clips = []
-            for i, clip_id in enumerate(clip_order):
-                if clip_id in clip_map:
-                    clip = clip_map[clip_id]
-                    clip["position"] = i
-                    new_clips.append(clip)
-            
-            self.timeline_data["clips"] = new_clips
-            self.save()
-            return True
-        except:
-            return False
+        # A repeated id would otherwise place the same clip twice
+        clip_order = list(dict.fromkeys(clip_order))
+        self._apply_reorder_clips(clip_order)
+        return self.save("reorder_clips", clip_order)
     
     def get_clips(self) -> List[Dict]:
         """Get all clips in timeline order."""
-        return sorted(self.timeline_data["clips"], key=lambda x: x["position"])
+        # Every edit keeps the list in position order, so no sort is needed
+        return self._clip_views(self.timeline_data["clips"])
     
     def get_timeline_data(self) -> Dict:
         """Get full timeline data."""
         # Ensure transitions array exists
         if "transitions" not in self.timeline_data:
             self.timeline_data["transitions"] = []
-        return self.timeline_data
+        return {**self.timeline_data, "clips": self._clip_views(self.timeline_data["clips"])}
+    
+    def _clip_view(self, clip: Dict) -> Dict:
+        """Copy of a stored clip with the derived duration and formatted times added."""
+        duration = clip["end_seconds"] - clip["start_seconds"]
+        return {
+            **clip,
+            "start_formatted": self._format_time(clip["start_seconds"]),
+            "end_formatted": self._format_time(clip["end_seconds"]),
+            "duration_seconds": duration,
+            "duration_formatted": self._format_time(duration),
+        }
+    
+    def _clip_views(self, clips: List[Dict]) -> List[Dict]:
+        """_clip_view for a list of clips, formatting all times in one batch."""
+        starts = [c["start_seconds"] for c in clips]
+        ends = [c["end_seconds"] for c in clips]
+        durations = [e - s for s, e in zip(starts, ends)]
+        n = len(clips)
+        formatted = self._format_times(starts + ends + durations)
+        return [
+            {
+                **clip,
+                "start_formatted": formatted[i],
+                "end_formatted": formatted[n + i],
+                "duration_seconds": durations[i],
+                "duration_formatted": formatted[2 * n + i],
+            }
+            for i, clip in enumerate(clips)
+        ]
     
+    @_locked
     def clear_timeline(self) -> bool:
         """Clear all clips and transitions from timeline."""
-        self.timeline_data["clips"] = []
-        self.timeline_data["transitions"] = []
-        self.timeline_data["duration"] = 0.0
-        return self.save()
+        self._apply_clear_timeline()
+        return self.save("clear_timeline")
     
     # ============================================================
     # TRANSITION MANAGEMENT
     # ============================================================
     
+    @_locked
     def set_transition(self, from_clip_id: str, to_clip_id: str, 
                        transition_type: str, duration: float = 1.0) -> Optional[Dict]:
         """
@@ -366,8 +814,8 @@ class TimelineStateManager:
             return None
         
         # Validate clips exist
-        from_clip = self.get_clip(from_clip_id)
-        to_clip = self.get_clip(to_clip_id)
+        from_clip = self._clip_index.get(from_clip_id)
+        to_clip = self._clip_index.get(to_clip_id)
         
         if not from_clip or not to_clip:
             return None
@@ -379,66 +827,52 @@ class TimelineStateManager:
         if "transitions" not in self.timeline_data:
             self.timeline_data["transitions"] = []
         
+        now_iso = datetime.now().isoformat()
+        
         # Check if transition already exists, update it
-        for t in self.timeline_data["transitions"]:
-            if t["from_clip_id"] == from_clip_id and t["to_clip_id"] == to_clip_id:
-                t["type"] = transition_type
-                t["duration"] = duration
-                t["updated_at"] = datetime.now().isoformat()
-                self.save()
-                return t
+        t = self._transition_index.get((from_clip_id, to_clip_id))
+        if t is not None:
+            t["type"] = transition_type
+            t["duration"] = duration
+            t["updated_at"] = now_iso
+            self.save("set_transition", t, now_iso)
+            return t
         
         # Create new transition
         transition = {
-            "id": f"trans_{from_clip_id}_{to_clip_id}",
+            "id": _new_id("trans"),
             "from_clip_id": from_clip_id,
             "to_clip_id": to_clip_id,
             "from_position": from_clip["position"],
             "to_position": to_clip["position"],
             "type": transition_type,
             "duration": duration,
-            "created_at": datetime.now().isoformat()
+            "created_at": now_iso
         }
         
-        self.timeline_data["transitions"].append(transition)
-        self.save()
+        self._apply_set_transition(transition)
+        self.save("set_transition", transition, now_iso)
         return transition
     
     def get_transition(self, from_clip_id: str, to_clip_id: str) -> Optional[Dict]:
         """Get a transition between two clips."""
-        if "transitions" not in self.timeline_data:
-            return None
-        
-        for t in self.timeline_data["transitions"]:
-            if t["from_clip_id"] == from_clip_id and t["to_clip_id"] == to_clip_id:
-                return t
-        return None
+        return self._transition_index.get((from_clip_id, to_clip_id))
     
     def get_transition_after_clip(self, clip_id: str) -> Optional[Dict]:
         """Get the transition that follows a clip."""
-        if "transitions" not in self.timeline_data:
-            return None
-        
-        for t in self.timeline_data["transitions"]:
-            if t["from_clip_id"] == clip_id:
-                return t
-        return None
+        following = self._transitions_from.get(clip_id)
+        return following[0] if following else None
     
+    @_locked
     def remove_transition(self, from_clip_id: str, to_clip_id: str) -> bool:
         """Remove a transition between two clips."""
-        if "transitions" not in self.timeline_data:
+        if (from_clip_id, to_clip_id) not in self._transition_index:
             return False
         
-        original_len = len(self.timeline_data["transitions"])
-        self.timeline_data["transitions"] = [
-            t for t in self.timeline_data["transitions"]
-            if not (t["from_clip_id"] == from_clip_id and t["to_clip_id"] == to_clip_id)
-        ]
-        
-        if len(self.timeline_data["transitions"]) < original_len:
-            self.save()
-            return True
-        return False
+        payload = {"from_clip_id": from_clip_id, "to_clip_id": to_clip_id}
+        self._apply_remove_transition(payload)
+        self.save("remove_transition", payload)
+        return True
     
     def get_all_transitions(self) -> List[Dict]:
         """Get all transitions in the timeline."""
@@ -459,36 +893,123 @@ class TimelineStateManager:
         if default_type not in self.TRANSITION_TYPES:
             default_type = "cut"
         
-        clips = self.get_clips()
+        clips = list(self.timeline_data["clips"])
         generated = []
         
-        for i in range(len(clips) - 1):
-            from_clip = clips[i]
-            to_clip = clips[i + 1]
-            
-            # Check if transition already exists
-            existing = self.get_transition(from_clip["clip_id"], to_clip["clip_id"])
-            if not existing:
-                trans = self.set_transition(
-                    from_clip["clip_id"],
-                    to_clip["clip_id"],
-                    default_type,
-                    0.5 if default_type != "cut" else 0.0
-                )
-                if trans:
-                    generated.append(trans)
+        with self.batch():
+            for i in range(len(clips) - 1):
+                from_clip = clips[i]
+                to_clip = clips[i + 1]
+                
+                # Check if transition already exists
+                existing = self.get_transition(from_clip["clip_id"], to_clip["clip_id"])
+                if not existing:
+                    trans = self.set_transition(
+                        from_clip["clip_id"],
+                        to_clip["clip_id"],
+                        default_type,
+                        0.5 if default_type != "cut" else 0.0
+                    )
+                    if trans:
+                        generated.append(trans)
         
         return generated
     
-    def _format_time(self, seconds: float) -> str:
-        """Format seconds to HH:MM:SS.mmm"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        ms = int((seconds % 1) * 1000)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}.{ms:03d}"
+    @staticmethod
+    def _format_time(seconds: float) -> str:
+        """Format seconds to HH:MM:SS.mmm (rounded to the nearest millisecond)."""
+        ms_total = int(seconds * 1000 + 0.5)
+        s, ms = divmod(ms_total, 1000)
+        m, s = divmod(s, 60)
+        h, m = divmod(m, 60)
+        return f"{h:02d}:{m:02d}:{s:02d}.{ms:03d}"
+    
+    @staticmethod
+    def _format_times(seconds_list) -> List[str]:
+        """Batch version of _format_time: one numpy pass for a whole list of values."""
+        if len(seconds_list) == 0:
+            return []
+        ms_total = (np.asarray(seconds_list, dtype=np.float64) * 1000 + 0.5).astype(np.int64)
+        s, ms = np.divmod(ms_total, 1000)
+        m, s = np.divmod(s, 60)
+        h, m = np.divmod(m, 60)
+        
+        def pad(values, width):
+            return np.char.zfill(values.astype(str), width)
+        
+        out = pad(h, 2)
+        for sep, part, width in ((":", m, 2), (":", s, 2), (".", ms, 3)):
+            out = np.char.add(np.char.add(out, sep), pad(part, width))
+        return out.tolist()
+
+
+# ============================================================
+# BACKGROUND WRITER
+# ============================================================
+
+_write_queue: "queue.SimpleQueue[Optional[TimelineStateManager]]" = queue.SimpleQueue()
+_writer_thread: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
+
+def _writer_loop():
+    """Drain queued save requests, writing each manager once per wake-up."""
+    while True:
+        manager = _write_queue.get()
+        if manager is None:
+            return
+        
+        # Coalesce everything queued so far
+        pending = {id(manager): manager}
+        stop = False
+        while True:
+            try:
+                manager = _write_queue.get_nowait()
+            except queue.Empty:
+                break
+            if manager is None:
+                stop = True
+                break
+            pending[id(manager)] = manager
+        
+        for manager in pending.values():
+            manager.flush()
+        if stop:
+            return
+
+
+def _schedule_write(manager: TimelineStateManager):
+    """Queue a manager for the writer thread, starting it if needed."""
+    global _writer_thread
+    with _writer_lock:
+        if _writer_thread is None:
+            _writer_thread = threading.Thread(target=_writer_loop, name="timeline-writer", daemon=True)
+            _writer_thread.start()
+    _write_queue.put(manager)
+
+
+def flush_timelines():
+    """Stop the writer thread after it drains the queue, then flush every open timeline."""
+    global _writer_thread
+    with _writer_lock:
+        thread, _writer_thread = _writer_thread, None
+    if thread is not None:
+        _write_queue.put(None)
+        thread.join()
+    for manager in list(_managers.values()):
+        manager.flush()
+
+
+# Managers are shared per project, so an edit still queued for the writer
+# is visible to the next request instead of being re-read from disk
+_managers: Dict[str, TimelineStateManager] = {}
+_managers_lock = threading.Lock()
 
 
 def get_timeline_manager(project_id: str) -> TimelineStateManager:
     """Factory function to get a timeline manager for a project."""
-    return TimelineStateManager(project_id)
+    with _managers_lock:
+        manager = _managers.get(project_id)
+        if manager is None:
+            manager = _managers[project_id] = TimelineStateManager(project_id)
+        return manager
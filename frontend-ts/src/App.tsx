@@ -1,3 +1,4 @@
+import { useMemo } from 'react';
 import {
     Upload, Search, Scissors, Edit, Package, Volume2, Film, Clock, Layers
 } from 'lucide-react';
@@ -24,9 +25,18 @@ const TABS: { id: TabType; label: string; icon: React.ReactNode }[] = [
 ];
 
 function AppContent() {
-    const { state, dispatch, loadProject } = useProject();
+    const { state, dispatch, loadProject, loadProjects } = useProject();
     const { activeTab, projects, projectId, metadata, scenes, suggestions, isLoading } = state;
 
+    // Dropdown labels only change when the project list does
+    const projectOptions = useMemo(() => projects.map((project) => {
+        const id = project.id || project.project_id;
+        return {
+            id,
+            label: `${(project.name || project.filename)?.slice(0, 20) ?? ''}... (${id?.slice(0, 8)})`,
+        };
+    }), [projects]);
+
     const setActiveTab = (tab: TabType) => {
         dispatch({ type: 'SET_ACTIVE_TAB', payload: tab });
     };
@@ -95,15 +105,23 @@ function AppContent() {
                                     onChange={handleProjectChange}
                                 >
                                     <option value="">-- Select Project --</option>
-                                    {projects.map((project) => (
-                                        <option key={project.id || project.project_id} value={project.id || project.project_id}>
-                                            {(project.name || project.filename)?.slice(0, 20) ?? ''}... ({(project.id || project.project_id)?.slice(0, 8)})
+                                    {projectOptions.map(({ id, label }) => (
+                                        <option key={id} value={id}>
+                                            {label}
                                         </option>
                                     ))}
                                 </select>
                             </div>
                         )}
 
+                        <button
+                            className="tab-btn"
+                            onClick={() => loadProjects(true)}
+                            style={{ marginBottom: 'var(--space-md)' }}
+                        >
+                            🔄 Refresh projects
+                        </button>
+
                         {projectId && (
                             <div style={{
                                 padding: 'var(--space-sm) var(--space-md)',
@@ -4,7 +4,7 @@
  * Control panel for video filters.
  */
 
-import React from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import { RotateCcw, Zap, X } from 'lucide-react';
 import type { VideoFilters } from './types';
 import { PRESETS, DEFAULT_FILTERS } from './filterUtils';
@@ -16,19 +16,55 @@ interface FiltersPanelProps {
 }
 
 export const FiltersPanel: React.FC<FiltersPanelProps> = ({ filters, onUpdateFilters }) => {
+    // Slider drags fire several input events per frame and each editor update
+    // re-renders the whole player. Show edits from a local draft right away and
+    // hand the editor at most one combined update per animation frame.
+    const [draft, setDraft] = useState(filters);
+    const pendingRef = useRef<VideoFilters | null>(null);
+    const frameRef = useRef<number | null>(null);
+
+    useEffect(() => {
+        if (pendingRef.current === null) setDraft(filters);
+    }, [filters]);
+
+    const onUpdateRef = useRef(onUpdateFilters);
+    onUpdateRef.current = onUpdateFilters;
+
+    // Flush anything still queued when the panel unmounts
+    useEffect(() => () => {
+        if (frameRef.current !== null) cancelAnimationFrame(frameRef.current);
+        if (pendingRef.current) onUpdateRef.current(pendingRef.current);
+    }, []);
+
+    const commitFilters = (next: VideoFilters) => {
+        if (frameRef.current !== null) {
+            cancelAnimationFrame(frameRef.current);
+            frameRef.current = null;
+        }
+        pendingRef.current = null;
+        setDraft(next);
+        onUpdateFilters(next);
+    };
 
     // Helper to update a single filter
     const updateFilter = (key: keyof VideoFilters, value: number) => {
-        onUpdateFilters({
-            ...filters,
-            [key]: value
-        });
+        const next = { ...(pendingRef.current ?? draft), [key]: value };
+        pendingRef.current = next;
+        setDraft(next);
+        if (frameRef.current === null) {
+            frameRef.current = requestAnimationFrame(() => {
+                frameRef.current = null;
+                const pending = pendingRef.current;
+                pendingRef.current = null;
+                if (pending) onUpdateRef.current(pending);
+            });
+        }
     };
 
     // Helper to apply a preset
     const applyPreset = (presetName: keyof typeof PRESETS) => {
         const presetValues = PRESETS[presetName];
-        onUpdateFilters({
+        commitFilters({
             ...DEFAULT_FILTERS,
             ...presetValues
         });
@@ -36,12 +72,12 @@ export const FiltersPanel: React.FC<FiltersPanelProps> = ({ filters, onUpdateFil
 
     // Reset all filters
     const resetFilters = () => {
-        onUpdateFilters(DEFAULT_FILTERS);
+        commitFilters(DEFAULT_FILTERS);
     };
 
     // Check if a filter is active (different from default)
     const isFilterActive = (key: keyof VideoFilters) => {
-        return filters[key] !== DEFAULT_FILTERS[key];
+        return draft[key] !== DEFAULT_FILTERS[key];
     };
 
     // Render a slider control
@@ -56,14 +92,14 @@ export const FiltersPanel: React.FC<FiltersPanelProps> = ({ filters, onUpdateFil
             <div className="filter-header">
                 <span className="filter-label">{label}</span>
                 <span className="filter-value">
-                    {filters[key].toFixed(0)}{unit}
+                    {draft[key].toFixed(0)}{unit}
                 </span>
             </div>
             <input
                 type="range"
                 min={min}
                 max={max}
-                value={filters[key]}
+                value={draft[key]}
                 onChange={(e) => updateFilter(key, parseFloat(e.target.value))}
                 className="filter-slider"
             />
@@ -92,7 +128,7 @@ export const FiltersPanel: React.FC<FiltersPanelProps> = ({ filters, onUpdateFil
 
                         return (
                             <div key={key} className="active-filter-chip">
-                                <span>{key}: {filters[filterKey]}</span>
+                                <span>{key}: {draft[filterKey]}</span>
                                 <button
                                     onClick={() => updateFilter(filterKey, DEFAULT_FILTERS[filterKey])}
                                     className="remove-filter-btn"
@@ -5,7 +5,7 @@
  * Scales with time using pixels-per-second zoom.
  */
 
-import { useRef, useMemo } from 'react';
+import { memo, useRef, useState, useEffect, useMemo } from 'react';
 import { ZoomIn, ZoomOut, Type } from 'lucide-react';
 import { TimelineClip } from './TimelineClip';
 import type { TimelineClip as TimelineClipType, Caption } from './types';
@@ -28,7 +28,83 @@ function formatTimeMarker(seconds: number): string {
     return `${mins}:${secs.toString().padStart(2, '0')}`;
 }
 
-export function Timeline({
+function markerInterval(zoom: number): number {
+    if (zoom > 100) return 1;
+    if (zoom > 50) return 2;
+    if (zoom < 30) return 10;
+    return 5;
+}
+
+interface Viewport {
+    left: number;
+    width: number;
+}
+
+/**
+ * Time ruler drawn on a single canvas instead of one DOM node per marker.
+ * The canvas only covers the visible part of the timeline (a full-width
+ * canvas would exceed browser size limits on long videos at high zoom).
+ */
+function TimeRuler({ duration, zoom, width, viewport }: {
+    duration: number;
+    zoom: number;
+    width: number;
+    viewport: Viewport;
+}) {
+    const canvasRef = useRef<HTMLCanvasElement>(null);
+
+    useEffect(() => {
+        const canvas = canvasRef.current;
+        const ctx = canvas?.getContext('2d');
+        if (!canvas || !ctx) return;
+
+        const dpr = window.devicePixelRatio || 1;
+        const height = canvas.clientHeight;
+        canvas.width = Math.round(viewport.width * dpr);
+        canvas.height = Math.round(height * dpr);
+        ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+        ctx.clearRect(0, 0, viewport.width, height);
+
+        // Pick up color and font from the .time-ruler styles
+        const style = getComputedStyle(canvas);
+        ctx.strokeStyle = style.color;
+        ctx.fillStyle = style.color;
+        ctx.font = `${style.fontSize} ${style.fontFamily}`;
+        ctx.textBaseline = 'bottom';
+        ctx.lineWidth = 1;
+
+        const interval = markerInterval(zoom);
+        const first = Math.floor(viewport.left / zoom / interval) * interval;
+        const last = Math.min(duration, (viewport.left + viewport.width) / zoom);
+        ctx.beginPath();
+        for (let t = first; t <= last; t += interval) {
+            const x = Math.round(t * zoom - viewport.left) + 0.5;
+            ctx.moveTo(x, 0);
+            ctx.lineTo(x, 8);
+            ctx.fillText(formatTimeMarker(t), x + 3, height - 4);
+        }
+        ctx.stroke();
+    }, [duration, zoom, viewport]);
+
+    return (
+        <div className="time-ruler" style={{ width: `${width}px` }}>
+            <canvas
+                ref={canvasRef}
+                style={{
+                    position: 'absolute',
+                    top: 0,
+                    left: `${viewport.left}px`,
+                    width: `${viewport.width}px`,
+                    height: '100%',
+                }}
+            />
+        </div>
+    );
+}
+
+// Memoized so sidebar edits (filters, captions styling, text) that re-render
+// the editor don't rebuild the timeline when none of its props changed.
+export const Timeline = memo(function Timeline({
     clips,
     captions = [],
     duration,
@@ -40,24 +116,38 @@ export function Timeline({
     onZoomChange,
 }: TimelineProps) {
     const trackRef = useRef<HTMLDivElement>(null);
+    const scrollRef = useRef<HTMLDivElement>(null);
+    const [viewport, setViewport] = useState<Viewport>({ left: 0, width: 0 });
 
     // Calculate timeline width based on zoom
     const timelineWidth = Math.max(duration * zoom, 600);
 
-    // Generate time markers
-    const timeMarkers = useMemo(() => {
-        const markers: number[] = [];
-        // Determine interval based on zoom
-        let interval = 5; // 5 second intervals
-        if (zoom > 100) interval = 1;
-        else if (zoom > 50) interval = 2;
-        else if (zoom < 30) interval = 10;
-
-        for (let t = 0; t <= duration; t += interval) {
-            markers.push(t);
-        }
-        return markers;
-    }, [duration, zoom]);
+    // Track the visible scroll window, at most once per animation frame
+    useEffect(() => {
+        const el = scrollRef.current;
+        if (!el) return;
+        let frame = 0;
+        const update = () => {
+            frame = 0;
+            setViewport(prev => (
+                prev.left === el.scrollLeft && prev.width === el.clientWidth
+                    ? prev
+                    : { left: el.scrollLeft, width: el.clientWidth }
+            ));
+        };
+        const schedule = () => {
+            if (!frame) frame = requestAnimationFrame(update);
+        };
+        update();
+        el.addEventListener('scroll', schedule, { passive: true });
+        const observer = new ResizeObserver(schedule);
+        observer.observe(el);
+        return () => {
+            el.removeEventListener('scroll', schedule);
+            observer.disconnect();
+            if (frame) cancelAnimationFrame(frame);
+        };
+    }, []);
 
     // Handle track click to seek
     const handleTrackClick = (e: React.MouseEvent<HTMLDivElement>) => {
@@ -74,6 +164,26 @@ export function Timeline({
         }
     };
 
+    // Only mount clips and captions near the visible window. The window is
+    // snapped to viewport-sized bands (one band of overscan on each side) so
+    // ordinary scrolling doesn't change the rendered set on every frame.
+    const band = Math.max(viewport.width, 600);
+    const bandIndex = Math.floor(viewport.left / band);
+    const visibleFrom = ((bandIndex - 1) * band) / zoom;
+    const visibleTo = ((bandIndex + 2) * band) / zoom;
+
+    const visibleClips = useMemo(
+        () => clips.filter(clip => clip.end >= visibleFrom && clip.start <= visibleTo),
+        [clips, visibleFrom, visibleTo]
+    );
+
+    const visibleCaptions = useMemo(
+        () => captions
+            .map((caption, idx) => ({ caption, idx }))
+            .filter(({ caption }) => caption.end >= visibleFrom && caption.start <= visibleTo),
+        [captions, visibleFrom, visibleTo]
+    );
+
     // Playhead position
     const playheadPosition = currentTime * zoom;
 
@@ -109,20 +219,14 @@ export function Timeline({
             </div>
 
             {/* Timeline Content */}
-            <div className="timeline-content">
+            <div className="timeline-content" ref={scrollRef}>
                 {/* Time Ruler */}
-                <div className="time-ruler" style={{ width: `${timelineWidth}px` }}>
-                    {timeMarkers.map(time => (
-                        <div
-                            key={time}
-                            className="time-marker"
-                            style={{ left: `${time * zoom}px` }}
-                        >
-                            <div className="marker-line" />
-                            <span className="marker-label">{formatTimeMarker(time)}</span>
-                        </div>
-                    ))}
-                </div>
+                <TimeRuler
+                    duration={duration}
+                    zoom={zoom}
+                    width={timelineWidth}
+                    viewport={viewport}
+                />
 
                 {/* Tracks Container */}
                 <div
@@ -135,13 +239,13 @@ export function Timeline({
                     <div className="timeline-track video-track">
                         <div className="track-label">Video</div>
                         <div className="timeline-track-bg" />
-                        {clips.map(clip => (
+                        {visibleClips.map(clip => (
                             <TimelineClip
                                 key={clip.clip_id}
                                 clip={clip}
                                 pixelsPerSecond={zoom}
                                 isSelected={clip.clip_id === selectedClipId}
-                                onClick={() => onClipClick(clip.clip_id)}
+                                onClick={onClipClick}
                             />
                         ))}
                     </div>
@@ -151,7 +255,7 @@ export function Timeline({
                         <div className="timeline-track caption-track">
                             <div className="track-label"><Type size={12} /> Text</div>
                             <div className="timeline-track-bg" />
-                            {captions.map((caption, idx) => (
+                            {visibleCaptions.map(({ caption, idx }) => (
                                 <div
                                     key={idx}
                                     className="timeline-caption-clip"
@@ -187,4 +291,4 @@ export function Timeline({
             </div>
         </div>
     );
-}
+});
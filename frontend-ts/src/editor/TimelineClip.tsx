@@ -4,13 +4,14 @@
  * Individual clip block on the timeline.
  */
 
+import { memo, useMemo } from 'react';
 import type { TimelineClip as TimelineClipType } from './types';
 
 interface TimelineClipProps {
     clip: TimelineClipType;
     pixelsPerSecond: number;
     isSelected: boolean;
-    onClick: () => void;
+    onClick: (clipId: string) => void;
 }
 
 function formatDuration(seconds: number): string {
@@ -22,11 +23,19 @@ function formatDuration(seconds: number): string {
     return `${mins}:${secs.toString().padStart(2, '0')}`;
 }
 
-export function TimelineClip({ clip, pixelsPerSecond, isSelected, onClick }: TimelineClipProps) {
+// Memoized: the timeline re-renders on every playhead tick, but a clip only
+// needs to when its own data, the zoom or its selection changes.
+export const TimelineClip = memo(function TimelineClip({ clip, pixelsPerSecond, isSelected, onClick }: TimelineClipProps) {
     const duration = clip.end - clip.start;
     const width = duration * pixelsPerSecond;
     const left = clip.start * pixelsPerSecond;
 
+    // Labels depend only on the clip, not the zoom, so keep them across zoom re-renders
+    const { title, durationLabel } = useMemo(() => ({
+        title: `${clip.name}\n${formatDuration(clip.start)} - ${formatDuration(clip.end)}`,
+        durationLabel: formatDuration(clip.end - clip.start),
+    }), [clip.name, clip.start, clip.end]);
+
     return (
         <div
             className={`timeline-clip ${isSelected ? 'selected' : ''}`}
@@ -35,8 +44,8 @@ export function TimelineClip({ clip, pixelsPerSecond, isSelected, onClick }: Tim
                 width: `${width}px`,
                 backgroundColor: clip.color,
             }}
-            onClick={onClick}
-            title={`${clip.name}\n${formatDuration(clip.start)} - ${formatDuration(clip.end)}`}
+            onClick={() => onClick(clip.clip_id)}
+            title={title}
         >
             {/* Clip Label */}
             <div className="clip-label">
@@ -46,7 +55,7 @@ export function TimelineClip({ clip, pixelsPerSecond, isSelected, onClick }: Tim
             {/* Duration Badge */}
             {width > 40 && (
                 <div className="clip-duration">
-                    {formatDuration(duration)}
+                    {durationLabel}
                 </div>
             )}
 
@@ -55,4 +64,4 @@ export function TimelineClip({ clip, pixelsPerSecond, isSelected, onClick }: Tim
             <div className="clip-handle right" />
         </div>
     );
-}
+});
@@ -97,7 +97,7 @@ export function VideoEditor({ projectId: propProjectId }: VideoEditorProps) {
                         }
                     }
                 });
-                localStorage.setItem('cutlab_active_project', newVideo.video_id);
+                api.setSavedProjectId(newVideo.video_id);
                 // Load timeline for the newly created project (empty at first)
                 try {
                     const timelineData = await api.getTimeline(newVideo.video_id);
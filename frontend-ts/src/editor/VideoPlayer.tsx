@@ -178,9 +178,19 @@ export function VideoPlayer({
     }, [filters]);
 
     // Active Caption Logic
+    // During playback the active caption is almost always the previous one or
+    // the one after it, so check those before scanning the whole list.
+    const lastCaptionIndexRef = useRef(-1);
     const activeCaptionIndex = useMemo(() => {
         if (!showCaptions) return -1;
-        return captions.findIndex(c => currentTime >= c.start && currentTime <= c.end);
+        const isActive = (i: number) =>
+            i >= 0 && i < captions.length && currentTime >= captions[i].start && currentTime <= captions[i].end;
+        const last = lastCaptionIndexRef.current;
+        const index = isActive(last) ? last
+            : isActive(last + 1) ? last + 1
+                : captions.findIndex(c => currentTime >= c.start && currentTime <= c.end);
+        lastCaptionIndexRef.current = index;
+        return index;
     }, [captions, showCaptions, currentTime]);
 
     const activeTextOverlays = useMemo(() => {
@@ -5,6 +5,8 @@
  * and the main CUTLAB backend (8000) for dashboard integration.
  */
 
+import { getActiveProjectId, setActiveProjectId } from '../services/api';
+
 // Editor API (new simplified backend)
 const EDITOR_API = import.meta.env.VITE_API_URL || 'http://127.0.0.1:8000';
 
@@ -72,6 +74,19 @@ export interface DashboardProjectResponse {
     suggestions: unknown[] | null;
 }
 
+/**
+ * Fetch JSON from the backend, turning non-2xx responses into an Error that
+ * carries the backend's `detail` message (or the given fallback).
+ */
+async function requestJson<T>(url: string, fallbackError: string, init?: RequestInit): Promise<T> {
+    const response = await fetch(url, init);
+    if (!response.ok) {
+        const error = await response.json().catch(() => ({}));
+        throw new Error(error.detail || fallbackError);
+    }
+    return response.json();
+}
+
 // =========================================================================
 // EDITOR API (port 8001)
 // =========================================================================
@@ -83,18 +98,11 @@ export async function uploadVideo(file: File): Promise<UploadResponse> {
     const formData = new FormData();
     formData.append('file', file);
 
-    const response = await fetch(`${EDITOR_API}/upload-video`, {
+    const data = await requestJson<any>(`${EDITOR_API}/upload-video`, 'Upload failed', {
         method: 'POST',
         body: formData,
     });
 
-    if (!response.ok) {
-        const error = await response.json();
-        throw new Error(error.detail || 'Upload failed');
-    }
-
-    const data = await response.json();
-
     // Adapt main backend response to editor expected format
     return {
         video_id: data.project_id,
@@ -114,20 +122,13 @@ export async function detectScenes(
     preset?: string
 ): Promise<SceneDetectResponse> {
     const url = `${EDITOR_API}/analyze-scenes/${videoId}`;
-    const response = await fetch(url, {
+    const data = await requestJson<any>(url, 'Scene detection failed', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json',
         },
     });
 
-    if (!response.ok) {
-        const error = await response.json();
-        throw new Error(error.detail || 'Scene detection failed');
-    }
-
-    const data = await response.json();
-
     // Adapt backend response to frontend format if necessary
     // Backend returns { status, project_id, scene_count, scenes: [{start_time, end_time, ...}] }
     // Frontend expects { video_id, scene_count, scenes: [{start, end}] }
@@ -151,14 +152,7 @@ export async function detectScenes(
  * Get timeline for a video.
  */
 export async function getTimeline(videoId: string): Promise<TimelineResponse> {
-    const response = await fetch(`${EDITOR_API}/timeline/${videoId}`);
-
-    if (!response.ok) {
-        const error = await response.json();
-        throw new Error(error.detail || 'Failed to get timeline');
-    }
-
-    return response.json();
+    return requestJson<TimelineResponse>(`${EDITOR_API}/timeline/${videoId}`, 'Failed to get timeline');
 }
 
 /**
@@ -179,26 +173,14 @@ export function getVideoUrl(videoId: string): string {
  * Get project from dashboard backend.
  */
 export async function getDashboardProject(projectId: string): Promise<DashboardProjectResponse> {
-    const response = await fetch(`${MAIN_API}/project/${projectId}`);
-
-    if (!response.ok) {
-        throw new Error('Failed to fetch dashboard project');
-    }
-
-    return response.json();
+    return requestJson<DashboardProjectResponse>(`${MAIN_API}/project/${projectId}`, 'Failed to fetch dashboard project');
 }
 
 /**
  * Get list of projects from dashboard.
  */
 export async function getDashboardProjects(): Promise<{ projects: DashboardProject[] }> {
-    const response = await fetch(`${MAIN_API}/projects`);
-
-    if (!response.ok) {
-        throw new Error('Failed to fetch projects');
-    }
-
-    return response.json();
+    return requestJson<{ projects: DashboardProject[] }>(`${MAIN_API}/projects`, 'Failed to fetch projects');
 }
 
 /**
@@ -226,8 +208,14 @@ export async function getDashboardScenes(projectId: string): Promise<{
  * Get saved project ID from localStorage (synced with dashboard).
  */
 export function getSavedProjectId(): string | null {
-    // Dashboard saves to 'cutlab_active_project'
-    return localStorage.getItem('cutlab_active_project');
+    return getActiveProjectId();
+}
+
+/**
+ * Persist the active project ID (visible to the dashboard).
+ */
+export function setSavedProjectId(projectId: string): void {
+    setActiveProjectId(projectId);
 }
 
 /**
@@ -262,16 +250,9 @@ export interface CaptionResponse {
  * Generate captions using OpenAI Whisper (Main Backend)
  */
 export async function generateCaptions(projectId: string): Promise<CaptionResponse> {
-    const response = await fetch(`${MAIN_API}/generate-captions/${projectId}`, {
+    return requestJson<CaptionResponse>(`${MAIN_API}/generate-captions/${projectId}`, 'Caption generation failed', {
         method: 'POST',
     });
-
-    if (!response.ok) {
-        const error = await response.json();
-        throw new Error(error.detail || 'Caption generation failed');
-    }
-
-    return response.json();
 }
 
 /**
@@ -282,18 +263,11 @@ export async function analyzeContent(data: {
     timeline: any[];
     video_duration: number;
 }): Promise<any> {
-    const response = await fetch(`${MAIN_API}/ai/content/analyze`, {
+    return requestJson<any>(`${MAIN_API}/ai/content/analyze`, 'Content analysis failed', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json',
         },
         body: JSON.stringify(data),
     });
-
-    if (!response.ok) {
-        const error = await response.json();
-        throw new Error(error.detail || 'Content analysis failed');
-    }
-
-    return response.json();
 }
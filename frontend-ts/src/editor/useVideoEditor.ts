@@ -342,8 +342,11 @@ export function useVideoEditor(projectId?: string | null) {
 
     // Zoom timeline
     const setZoom = useCallback((zoom: number) => {
-        updateState({ zoom: Math.max(10, Math.min(200, zoom)) });
-    }, [updateState]);
+        const clamped = Math.max(10, Math.min(200, zoom));
+        // Keep the same state object when the clamped zoom doesn't change, so
+        // the editor and timeline don't re-render for a no-op
+        setState(prev => (prev.zoom === clamped ? prev : { ...prev, zoom: clamped }));
+    }, []);
 
     // Clear error
     const clearError = useCallback(() => {
@@ -1,16 +1,43 @@
+import { useMemo } from 'react';
 import { Search, Film, Clock, AlertCircle } from 'lucide-react';
 import { useProject } from '../store/ProjectContext';
 import type { Scene } from '../types';
 
 function formatTime(seconds: number): string {
-    const mins = Math.floor(seconds / 60);
-    const secs = Math.floor(seconds % 60);
-    const ms = Math.floor((seconds % 1) * 1000);
+    // Work in whole milliseconds so 1.001 doesn't render as 00:01.000
+    const totalMs = Math.round(seconds * 1000);
+    const mins = Math.floor(totalMs / 60000);
+    const secs = Math.floor(totalMs / 1000) % 60;
+    const ms = totalMs % 1000;
     return `${mins.toString().padStart(2, '0')}:${secs.toString().padStart(2, '0')}.${ms.toString().padStart(3, '0')}`;
 }
 
-function SceneItem({ scene, maxDuration }: { scene: Scene; maxDuration: number }) {
-    const duration = scene.end_time - scene.start_time;
+interface SceneRow {
+    scene: Scene;
+    duration: number;
+    start: string;
+    end: string;
+    durationLabel: string;
+}
+
+function buildSceneRows(scenes: Scene[]): { rows: SceneRow[]; maxDuration: number } {
+    let maxDuration = 0;
+    const rows = scenes.map((scene) => {
+        const duration = scene.end_time - scene.start_time;
+        if (duration > maxDuration) maxDuration = duration;
+        return {
+            scene,
+            duration,
+            start: formatTime(scene.start_time),
+            end: formatTime(scene.end_time),
+            durationLabel: `${duration?.toFixed(3) || '0.000'}s`,
+        };
+    });
+    return { rows, maxDuration };
+}
+
+function SceneItem({ row, maxDuration }: { row: SceneRow; maxDuration: number }) {
+    const { scene, duration } = row;
     const percentage = (duration / maxDuration) * 100;
 
     return (
@@ -21,7 +48,7 @@ function SceneItem({ scene, maxDuration }: { scene: Scene; maxDuration: number }
             <div className="scene-info">
                 <div className="scene-label">Scene {scene.scene_id}</div>
                 <div className="scene-time">
-                    {formatTime(scene.start_time)} → {formatTime(scene.end_time)}
+                    {row.start} → {row.end}
                 </div>
             </div>
             <div style={{ flex: 1, maxWidth: '200px' }}>
@@ -29,18 +56,15 @@ function SceneItem({ scene, maxDuration }: { scene: Scene; maxDuration: number }
                     <div className="progress-fill" style={{ width: `${percentage}%` }} />
                 </div>
             </div>
-            <div className="scene-duration">{duration?.toFixed(3) || '0.000'}s</div>
+            <div className="scene-duration">{row.durationLabel}</div>
         </div>
     );
 }
 
-function SceneBarChart({ scenes }: { scenes: Scene[] }) {
-    const maxDuration = Math.max(...scenes.map(s => s.end_time - s.start_time));
-
+function SceneBarChart({ rows, maxDuration }: { rows: SceneRow[]; maxDuration: number }) {
     return (
         <div className="bar-chart">
-            {scenes.map((scene) => {
-                const duration = scene.end_time - scene.start_time;
+            {rows.map(({ scene, duration }) => {
                 const height = (duration / maxDuration) * 100;
 
                 return (
@@ -60,6 +84,8 @@ function SceneBarChart({ scenes }: { scenes: Scene[] }) {
 
 export function AnalysisPage() {
     const { state, analyzeScenes } = useProject();
+    // Scene rows only change when a new analysis lands, not on every render
+    const { rows, maxDuration } = useMemo(() => buildSceneRows(state.scenes ?? []), [state.scenes]);
 
     const handleAnalyze = async () => {
         try {
@@ -125,7 +151,7 @@ export function AnalysisPage() {
                                 <p className="card-subtitle">{state.scenes.length} scenes detected</p>
                             </div>
                         </div>
-                        <SceneBarChart scenes={state.scenes} />
+                        <SceneBarChart rows={rows} maxDuration={maxDuration} />
                     </div>
 
                     <div className="card slide-up">
@@ -143,11 +169,11 @@ export function AnalysisPage() {
                         </div>
 
                         <div className="scene-list">
-                            {state.scenes.map((scene) => (
+                            {rows.map((row) => (
                                 <SceneItem
-                                    key={scene.scene_id}
-                                    scene={scene}
-                                    maxDuration={Math.max(...state.scenes!.map(s => s.end_time - s.start_time))}
+                                    key={row.scene.scene_id}
+                                    row={row}
+                                    maxDuration={maxDuration}
                                 />
                             ))}
                         </div>
@@ -168,13 +194,13 @@ export function AnalysisPage() {
                                     </tr>
                                 </thead>
                                 <tbody>
-                                    {state.scenes.map((scene) => (
+                                    {rows.map(({ scene, start, end, durationLabel }) => (
                                         <tr key={scene.scene_id}>
                                             <td style={{ fontWeight: 600 }}>Scene {scene.scene_id}</td>
-                                            <td>{formatTime(scene.start_time)}</td>
-                                            <td>{formatTime(scene.end_time)}</td>
+                                            <td>{start}</td>
+                                            <td>{end}</td>
                                             <td style={{ color: 'var(--accent-secondary)' }}>
-                                                {(scene.end_time - scene.start_time)?.toFixed(3) || '0.000'}s
+                                                {durationLabel}
                                             </td>
                                         </tr>
                                     ))}
@@ -1,12 +1,13 @@
 import { useState } from 'react';
 import { Download, FileText, FileCode, Video, Loader2, CheckCircle, AlertCircle } from 'lucide-react';
 import { useProject } from '../store/ProjectContext';
+import { getExportTimelineUrl } from '../services/api';
 
 type ExportMode = 'video' | 'report' | 'data';
 
 export function ExportPage() {
     const { state: projectState } = useProject();
-    const { projectId, metadata } = projectState;
+    const { projectId, metadata, suggestions, acceptedSuggestions } = projectState;
 
     const [activeTab, setActiveTab] = useState<ExportMode>('video');
     const [resolution, setResolution] = useState('720p (HD)');
@@ -215,6 +216,28 @@ export function ExportPage() {
                             <div style={{ padding: '12px', background: 'rgba(0,0,0,0.2)', borderRadius: '6px', fontFamily: 'monospace', fontSize: '11px', color: '#888' }}>
                                 {'{ "version": "1.0.0", "project_id": "' + projectId + '", ... }'}
                             </div>
+                            {suggestions && suggestions.length > 0 && (
+                                <div style={{ display: 'flex', gap: '10px', marginTop: '16px' }}>
+                                    {/* Plain links so the browser streams the file to disk. With nothing
+                                        selected there's no accepted_ids param, which the backend reads as
+                                        "all accepted", so the links are disabled instead. */}
+                                    {(['json', 'xml'] as const).map(format => (
+                                        <a
+                                            key={format}
+                                            href={acceptedSuggestions.size > 0
+                                                ? getExportTimelineUrl(projectId, format, [...acceptedSuggestions])
+                                                : undefined}
+                                            aria-disabled={acceptedSuggestions.size === 0}
+                                            title={acceptedSuggestions.size === 0 ? 'Accept at least one suggestion to export a cut timeline' : undefined}
+                                            className="btn btn-secondary"
+                                            style={{ flex: 1, textDecoration: 'none', display: 'flex', alignItems: 'center', justifyContent: 'center', gap: '8px', fontSize: '12px', opacity: acceptedSuggestions.size > 0 ? 1 : 0.5, pointerEvents: acceptedSuggestions.size > 0 ? 'auto' : 'none' }}
+                                            download
+                                        >
+                                            <Download size={16} /> CUT TIMELINE ({format.toUpperCase()})
+                                        </a>
+                                    ))}
+                                </div>
+                            )}
                         </div>
                     )}
                 </div>
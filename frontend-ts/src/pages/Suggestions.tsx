@@ -20,7 +20,7 @@ const SuggestionCard = memo(function SuggestionCard({
 }: {
     suggestion: CutSuggestion;
     isAccepted: boolean;
-    onToggle: () => void;
+    onToggle: (sceneId: number) => void;
 }) {
     const { metrics } = suggestion;
 
@@ -33,7 +33,7 @@ const SuggestionCard = memo(function SuggestionCard({
                         {suggestion.suggestion_type === 'CUT' ? <Scissors size={12} /> : <CheckCircle size={12} />}
                         {suggestion.suggestion_type}
                     </span>
-                    <span className="suggestion-badge" style={{ background: 'rgba(0, 180, 216, 0.2)', color: 'var(--accent-info)' }}>
+                    <span className="suggestion-badge badge-audio">
                         {getAudioEmoji(suggestion.audio_label)} {suggestion.audio_label}
                     </span>
                 </div>
@@ -42,7 +42,7 @@ const SuggestionCard = memo(function SuggestionCard({
                 </span>
             </div>
 
-            <div style={{ display: 'grid', gridTemplateColumns: 'repeat(3, 1fr)', gap: 'var(--space-md)', marginBottom: 'var(--space-md)' }}>
+            <div className="suggestion-stats">
                 <div className="stat-item">
                     <span className="stat-label">Start</span>
                     <span className="stat-value">{suggestion.cut_start}</span>
@@ -57,8 +57,8 @@ const SuggestionCard = memo(function SuggestionCard({
                 </div>
             </div>
 
-            <div style={{ marginBottom: 'var(--space-md)' }}>
-                <h4 style={{ fontSize: '0.8rem', color: 'var(--text-muted)', marginBottom: 'var(--space-sm)', textTransform: 'uppercase', letterSpacing: '0.5px' }}>
+            <div className="suggestion-section">
+                <h4 className="suggestion-section-title">
                     📊 Analysis Metrics
                 </h4>
                 <div className="suggestion-metrics">
@@ -93,14 +93,7 @@ const SuggestionCard = memo(function SuggestionCard({
             </div>
 
             {metrics.has_audio_peaks && (
-                <div style={{
-                    padding: 'var(--space-sm) var(--space-md)',
-                    background: 'rgba(0, 180, 216, 0.1)',
-                    borderRadius: 'var(--radius-sm)',
-                    marginBottom: 'var(--space-md)',
-                    fontSize: '0.875rem',
-                    color: 'var(--accent-info)'
-                }}>
+                <div className="suggestion-peaks">
                     🎵 {metrics.peak_count} audio peak(s) detected
                 </div>
             )}
@@ -114,7 +107,7 @@ const SuggestionCard = memo(function SuggestionCard({
                     <input
                         type="checkbox"
                         checked={isAccepted}
-                        onChange={onToggle}
+                        onChange={() => onToggle(suggestion.scene_id)}
                     />
                     <span style={{ fontSize: '0.875rem', color: isAccepted ? 'var(--accent-success)' : 'var(--text-muted)' }}>
                         {isAccepted ? '✅ Accepted' : '❌ Rejected'}
@@ -155,11 +148,17 @@ export function SuggestionsPage() {
             return { accepted: 0, total: 0, cutTime: 0, avgConfidence: 0 };
         }
 
-        const acceptedList = suggestions.filter(s => acceptedSuggestions.has(s.scene_id));
-        const cutTime = acceptedList.reduce((sum, s) => sum + s.metrics.duration, 0);
-        const avgConfidence = acceptedList.length > 0
-            ? acceptedList.reduce((sum, s) => sum + s.confidence, 0) / acceptedList.length * 100
-            : 0;
+        // Single pass over the accepted suggestions for both totals
+        let acceptedCount = 0;
+        let cutTime = 0;
+        let confidenceSum = 0;
+        for (const s of suggestions) {
+            if (!acceptedSuggestions.has(s.scene_id)) continue;
+            acceptedCount += 1;
+            cutTime += s.metrics.duration;
+            confidenceSum += s.confidence;
+        }
+        const avgConfidence = acceptedCount > 0 ? confidenceSum / acceptedCount * 100 : 0;
 
         return {
             accepted: acceptedSuggestions.size,
@@ -258,13 +257,14 @@ export function SuggestionsPage() {
                         </div>
                     </div>
 
-                    {/* Suggestion Cards - memoized */}
+                    {/* Suggestion Cards - memoized; pass the stable callback so
+                        toggling one card doesn't re-render the others */}
                     {suggestions.map((suggestion) => (
                         <SuggestionCard
                             key={suggestion.scene_id}
                             suggestion={suggestion}
                             isAccepted={acceptedSuggestions.has(suggestion.scene_id)}
-                            onToggle={() => toggleSuggestion(suggestion.scene_id)}
+                            onToggle={toggleSuggestion}
                         />
                     ))}
 
@@ -2,6 +2,7 @@ import axios from 'axios';
 import type {
     ProjectsResponse,
     ProjectResponse,
+    AutosaveResponse,
     UploadResponse,
     ScenesResponse,
     SuggestionsResponse,
@@ -11,21 +12,40 @@ import type {
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://127.0.0.1:8000';
 
+// Shared client for all backend calls. Long-running jobs (upload, analysis,
+// export) pass `timeout: 0` to opt out of the default.
+const DEFAULT_TIMEOUT_MS = 10000;
+
 const api = axios.create({
     baseURL: API_BASE_URL,
+    timeout: DEFAULT_TIMEOUT_MS,
     headers: {
         'Content-Type': 'application/json',
     },
 });
 
 // Project APIs
-export const getProjects = async (): Promise<ProjectsResponse> => {
+// The project list is re-read on mount and after every upload; reuse the last
+// response for a short while and drop it whenever we create a project.
+const PROJECTS_TTL_MS = 15000;
+let projectsCache: { data: ProjectsResponse; fetchedAt: number } | null = null;
+
+export const invalidateProjectsCache = () => {
+    projectsCache = null;
+};
+
+export const getProjects = async (force = false): Promise<ProjectsResponse> => {
+    if (!force && projectsCache && Date.now() - projectsCache.fetchedAt < PROJECTS_TTL_MS) {
+        return projectsCache.data;
+    }
     // Current main.py returns { status: "success", count: X, projects: [...] }
     const response = await api.get<any>('/projects');
-    return {
+    const data = {
         status: response.data.status,
         projects: response.data.projects || []
     } as ProjectsResponse;
+    projectsCache = { data, fetchedAt: Date.now() };
+    return data;
 };
 
 export const getProject = async (projectId: string): Promise<ProjectResponse> => {
@@ -36,11 +56,12 @@ export const getProject = async (projectId: string): Promise<ProjectResponse> =>
 
 export const createProject = async (name: string, videoId?: string): Promise<ProjectResponse> => {
     const response = await api.post<ProjectResponse>('/projects', { name, video_id: videoId });
+    invalidateProjectsCache();
     return response.data;
 };
 
-export const updateProjectState = async (projectId: string, state: any): Promise<ProjectResponse> => {
-    const response = await api.put<ProjectResponse>(`/projects/${projectId}`, {
+export const updateProjectState = async (projectId: string, state: any): Promise<AutosaveResponse> => {
+    const response = await api.put<AutosaveResponse>(`/projects/${projectId}`, {
         editor_state: state
     });
     return response.data;
@@ -50,22 +71,26 @@ export const uploadVideo = async (file: File): Promise<UploadResponse> => {
     const formData = new FormData();
     formData.append('file', file);
 
+    // The File body is streamed from disk by the browser; leave Content-Type
+    // unset so it can add the multipart boundary itself.
     const response = await api.post<UploadResponse>('/upload-video', formData, {
         headers: {
-            'Content-Type': 'multipart/form-data',
+            'Content-Type': undefined,
         },
+        timeout: 0,
     });
+    invalidateProjectsCache();
     return response.data;
 };
 
 // Analysis APIs
 export const analyzeScenes = async (projectId: string): Promise<ScenesResponse> => {
-    const response = await api.post<ScenesResponse>(`/analyze-scenes/${projectId}`);
+    const response = await api.post<ScenesResponse>(`/analyze-scenes/${projectId}`, null, { timeout: 0 });
     return response.data;
 };
 
 export const suggestCuts = async (projectId: string): Promise<SuggestionsResponse> => {
-    const response = await api.post<SuggestionsResponse>(`/suggest-cuts/${projectId}`);
+    const response = await api.post<SuggestionsResponse>(`/suggest-cuts/${projectId}`, null, { timeout: 0 });
     return response.data;
 };
 
@@ -189,18 +214,37 @@ export const getTransitions = async (projectId: string) => {
 };
 
 // Export APIs
-export const exportTimeline = async (
+const exportTimelinePath = (
     projectId: string,
-    format: 'json' | 'xml' = 'json',
+    format: 'json' | 'xml',
     acceptedIds?: number[]
-): Promise<Blob> => {
+): string => {
     const params = new URLSearchParams({ format });
     if (acceptedIds && acceptedIds.length > 0) {
         params.append('accepted_ids', acceptedIds.join(','));
     }
+    return `/export-timeline/${projectId}?${params.toString()}`;
+};
+
+/**
+ * Direct download URL for a timeline export. Use as the href of an
+ * `<a download>` link so the browser streams the file to disk instead of
+ * buffering the whole payload in a Blob first.
+ */
+export const getExportTimelineUrl = (
+    projectId: string,
+    format: 'json' | 'xml' = 'json',
+    acceptedIds?: number[]
+): string => `${API_BASE_URL}${exportTimelinePath(projectId, format, acceptedIds)}`;
 
-    const response = await api.get(`/export-timeline/${projectId}?${params.toString()}`, {
+export const exportTimeline = async (
+    projectId: string,
+    format: 'json' | 'xml' = 'json',
+    acceptedIds?: number[]
+): Promise<Blob> => {
+    const response = await api.get(exportTimelinePath(projectId, format, acceptedIds), {
         responseType: 'blob',
+        timeout: 0,
     });
     return response.data;
 };
@@ -210,8 +254,25 @@ export const analyzeContent = async (data: {
     timeline: any[];
     video_duration: number;
 }): Promise<any> => {
-    const response = await api.post('/ai/content/analyze', data);
+    const response = await api.post('/ai/content/analyze', data, { timeout: 0 });
     return response.data;
 };
 
+// Active project (shared with the editor via localStorage)
+const ACTIVE_PROJECT_KEY = 'cutlab_active_project';
+let activeProjectId: string | null | undefined;
+
+export const getActiveProjectId = (): string | null => {
+    if (activeProjectId === undefined) {
+        activeProjectId = localStorage.getItem(ACTIVE_PROJECT_KEY);
+    }
+    return activeProjectId;
+};
+
+export const setActiveProjectId = (projectId: string) => {
+    if (projectId === activeProjectId) return;
+    activeProjectId = projectId;
+    localStorage.setItem(ACTIVE_PROJECT_KEY, projectId);
+};
+
 export default api;
@@ -20,6 +20,7 @@ interface ProjectState {
     scenes: Scene[] | null;
     suggestions: CutSuggestion[] | null;
     timeline: Timeline | null;
+    timelineProjectId: string | null;
 
     // Project list
     projects: Project[];
@@ -65,6 +66,7 @@ const initialState: ProjectState = {
     scenes: null,
     suggestions: null,
     timeline: null,
+    timelineProjectId: null,
     projects: [],
     activeTab: 'dashboard',
     isLoading: false,
@@ -77,15 +79,20 @@ const initialState: ProjectState = {
 
 function projectReducer(state: ProjectState, action: ProjectAction): ProjectState {
     switch (action.type) {
-        case 'SET_PROJECT':
+        case 'SET_PROJECT': {
+            // Keep the loaded timeline only if it belongs to this project
+            const sameProject = action.payload.projectId === state.timelineProjectId;
             return {
                 ...state,
                 projectId: action.payload.projectId,
                 metadata: action.payload.metadata,
                 scenes: action.payload.scenes ?? null,
                 suggestions: action.payload.suggestions ?? null,
+                timeline: sameProject ? state.timeline : null,
+                timelineProjectId: sameProject ? state.timelineProjectId : null,
                 error: null,
             };
+        }
         case 'SET_PROJECTS':
             return { ...state, projects: action.payload };
         case 'SET_SCENES':
@@ -97,7 +104,16 @@ function projectReducer(state: ProjectState, action: ProjectAction): ProjectStat
                 acceptedSuggestions: new Set(action.payload.map(s => s.scene_id)),
             };
         case 'SET_TIMELINE':
-            return { ...state, timeline: action.payload };
+            // Same project and same updated_at means nothing changed; keep the
+            // state object so consumers don't re-render or re-trigger autosave
+            if (
+                state.timeline?.updated_at &&
+                state.timelineProjectId === state.projectId &&
+                action.payload.updated_at === state.timeline.updated_at
+            ) {
+                return state;
+            }
+            return { ...state, timeline: action.payload, timelineProjectId: state.projectId };
         case 'SET_ACTIVE_TAB':
             return { ...state, activeTab: action.payload };
         case 'SET_LOADING':
@@ -118,8 +134,13 @@ function projectReducer(state: ProjectState, action: ProjectAction): ProjectStat
             return { ...state, acceptedSuggestions: newSet };
         case 'SET_ALL_SUGGESTIONS':
             if (action.payload && state.suggestions) {
+                // Keep the existing Set when it already holds exactly these ids so memoized
+                // stats don't recompute (it may hold stale ids from a previous project)
+                if (state.acceptedSuggestions.size === state.suggestions.length &&
+                    state.suggestions.every(s => state.acceptedSuggestions.has(s.scene_id))) return state;
                 return { ...state, acceptedSuggestions: new Set(state.suggestions.map(s => s.scene_id)) };
             }
+            if (state.acceptedSuggestions.size === 0) return state;
             return { ...state, acceptedSuggestions: new Set() };
         case 'SET_BATCH_JOBS':
             return { ...state, batchJobs: action.payload };
@@ -151,7 +172,7 @@ interface ProjectContextType {
     state: ProjectState;
     dispatch: React.Dispatch<ProjectAction>;
     // Actions
-    loadProjects: () => Promise<void>;
+    loadProjects: (force?: boolean) => Promise<void>;
     loadProject: (projectId: string) => Promise<void>;
     uploadVideo: (file: File) => Promise<void>;
     analyzeScenes: () => Promise<void>;
@@ -164,6 +185,8 @@ interface ProjectContextType {
 
 const ProjectContext = createContext<ProjectContextType | null>(null);
 
+const AUTOSAVE_DEBOUNCE_MS = 1500;
+
 // Provider
 export function ProjectProvider({ children }: { children: ReactNode }) {
     const [state, dispatch] = useReducer(projectReducer, initialState);
@@ -175,15 +198,15 @@ export function ProjectProvider({ children }: { children: ReactNode }) {
 
     // Load saved project from localStorage
     useEffect(() => {
-        const savedProjectId = localStorage.getItem('cutlab_active_project');
+        const savedProjectId = api.getActiveProjectId();
         if (savedProjectId && !state.projectId) {
             loadProject(savedProjectId);
         }
     }, []);
 
-    const loadProjects = async () => {
+    const loadProjects = async (force = false) => {
         try {
-            const data = await api.getProjects();
+            const data = await api.getProjects(force);
             // Map backend projects to frontend structure if needed
             // The backend /projects endpoint (from main.py list_projects) returns legacy structure.
             // The new routers/projects.py (not yet used for listing?) 
@@ -197,6 +220,10 @@ export function ProjectProvider({ children }: { children: ReactNode }) {
 
     const loadProject = async (projectId: string) => {
         dispatch({ type: 'SET_LOADING', payload: true });
+        // Fetch the timeline alongside the project rather than after it
+        const timelineRequest = state.timelineProjectId !== projectId
+            ? api.getTimeline(projectId).catch(() => null) // Timeline might not exist yet
+            : null;
         try {
             const data = await api.getProject(projectId);
 
@@ -216,14 +243,12 @@ export function ProjectProvider({ children }: { children: ReactNode }) {
                     suggestions: data.suggestions || null,
                 },
             });
-            localStorage.setItem('cutlab_active_project', newProjectId);
+            api.setActiveProjectId(newProjectId);
 
-            // Load timeline
-            try {
-                const timelineData = await api.getTimeline(newProjectId);
+            // Load timeline, once per project
+            const timelineData = await timelineRequest;
+            if (timelineData) {
                 dispatch({ type: 'SET_TIMELINE', payload: timelineData.timeline });
-            } catch {
-                // Timeline might not exist yet
             }
         } catch {
             dispatch({ type: 'SET_ERROR', payload: 'Failed to load project' });
@@ -243,7 +268,7 @@ export function ProjectProvider({ children }: { children: ReactNode }) {
                     metadata: data.metadata!,
                 },
             });
-            localStorage.setItem('cutlab_active_project', data.project_id!);
+            api.setActiveProjectId(data.project_id!);
             await loadProjects();
         } catch (error) {
             dispatch({ type: 'SET_ERROR', payload: 'Failed to upload video' });
@@ -306,11 +331,11 @@ export function ProjectProvider({ children }: { children: ReactNode }) {
             }
         };
 
-        // Debounce or Interval? Interval is safer for "continuous" saves.
-        // Let's use a 5-second interval that only saves if initialized.
-        const intervalId = setInterval(saveState, 5000);
+        // Debounced: save once the state has been stable for a moment, instead
+        // of re-sending an unchanged state on a fixed interval.
+        const timeoutId = setTimeout(saveState, AUTOSAVE_DEBOUNCE_MS);
 
-        return () => clearInterval(intervalId);
+        return () => clearTimeout(timeoutId);
     }, [state.projectId, state.timeline, state.scenes, state.suggestions, state.metadata]);
 
     const loadTimeline = async () => {
@@ -93,6 +93,7 @@ export interface Timeline {
     clips: TimelineClip[];
     duration: number;
     transitions: Transition[];
+    updated_at?: string; // Bumped by the backend on every real edit
 }
 
 // API Response Types
@@ -109,6 +110,12 @@ export interface ProjectResponse extends Project {
     suggestions?: CutSuggestion[] | null;
 }
 
+// PUT /projects/{id} queues the autosave and answers 202 right away
+export interface AutosaveResponse {
+    status: string;
+    project_id: string;
+}
+
 export interface UploadResponse {
     status: string;
     project_id: string;